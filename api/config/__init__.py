@@ -1,7 +1,16 @@
 # api/config/__init__.py
 
+from .cache_settings import cache_settings  # noqa: F401
 from .ckan_settings import ckan_settings  # noqa: F401
+from .coalescing_settings import coalescing_settings  # noqa: F401
 from .dxspaces_settings import dxspaces_settings  # noqa: F401
+from .health_settings import health_settings  # noqa: F401
+from .idempotency_settings import idempotency_settings  # noqa: F401
+from .job_settings import job_settings  # noqa: F401
 from .kafka_settings import kafka_settings  # noqa: F401
 from .keycloak_settings import keycloak_settings  # noqa: F401
+from .logging_settings import logging_settings  # noqa: F401
+from .metrics_settings import metrics_settings  # noqa: F401
+from .profiler_settings import profiler_settings  # noqa: F401
 from .swagger_settings import swagger_settings  # noqa: F401
+from .upstream_settings import upstream_settings  # noqa: F401
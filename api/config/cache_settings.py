@@ -0,0 +1,37 @@
+# api/config/cache_settings.py
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    Configuration for the local caches kept in front of CKAN.
+
+    All settings can be overridden using environment variables.
+    """
+
+    # Seconds a dataset read from CKAN is reused by update services and
+    # trusted for If-Match writes. Set to 0 to always ask CKAN.
+    dataset_cache_ttl_seconds: int = 10
+    # Seconds a "dataset not found" answer is reused
+    dataset_cache_negative_ttl_seconds: int = 5
+    dataset_cache_max_entries: int = 10000
+
+    # Index of existing dataset names used for fast duplicate checks
+    dataset_name_index_enabled: bool = True
+    dataset_name_refresh_seconds: int = 300
+    dataset_name_bloom_error_rate: float = 0.01
+
+    # Reverse indexes from resource URL, Kafka topic and S3 prefix to dataset
+    resource_index_enabled: bool = True
+    resource_index_refresh_seconds: int = 300
+    # Seconds between re-reads of datasets changed by resource writes
+    resource_index_stale_seconds: int = 5
+
+    model_config = {
+        "env_file": ".env",
+        "extra": "allow",
+    }
+
+
+cache_settings = Settings()
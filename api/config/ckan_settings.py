@@ -1,9 +1,21 @@
 # api/config/ckan_settings.py
 
-from ckanapi import RemoteCKAN
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
+def _client(url: str, server: str, apikey: Optional[str] = None):
+    # Imported on use: the telemetry services read api.config themselves,
+    # so a module-level import would make config and services import
+    # each other
+    from api.services.telemetry_services.upstream_calls import (
+        InstrumentedRemoteCKAN,
+    )
+
+    return InstrumentedRemoteCKAN(url, server=server, apikey=apikey)
+
+
 class Settings(BaseSettings):
     ckan_local_enabled: bool = False
     ckan_url: str = "http://localhost:5000"
@@ -15,15 +27,15 @@ class Settings(BaseSettings):
 
     @property
     def ckan(self):
-        return RemoteCKAN(self.ckan_url, apikey=self.ckan_api_key)
+        return _client(self.ckan_url, "local", apikey=self.ckan_api_key)
 
     @property
     def ckan_no_api_key(self):
-        return RemoteCKAN(self.ckan_url)
+        return _client(self.ckan_url, "local")
 
     @property
     def ckan_global(self):
-        return RemoteCKAN(self.ckan_global_url)
+        return _client(self.ckan_global_url, "global")
 
     @property
     def pre_ckan(self):
@@ -34,9 +46,9 @@ class Settings(BaseSettings):
             or self.pre_ckan_url.startswith("https://")
         ):
             valid_url = f"http://{self.pre_ckan_url}"
-            return RemoteCKAN(valid_url, apikey=self.pre_ckan_api_key)
+            return _client(valid_url, "pre_ckan", apikey=self.pre_ckan_api_key)
 
-        return RemoteCKAN(self.pre_ckan_url, apikey=self.pre_ckan_api_key)
+        return _client(self.pre_ckan_url, "pre_ckan", apikey=self.pre_ckan_api_key)
 
     @property
     def pre_ckan_no_api_key(self):
@@ -45,8 +57,8 @@ class Settings(BaseSettings):
             or self.pre_ckan_url.startswith("https://")
         ):
             valid_url = f"http://{self.pre_ckan_url}"
-            return RemoteCKAN(valid_url)
-        return RemoteCKAN(self.pre_ckan_url)
+            return _client(valid_url, "pre_ckan")
+        return _client(self.pre_ckan_url, "pre_ckan")
 
     model_config = {
         "env_file": ".env",
@@ -0,0 +1,23 @@
+# api/config/coalescing_settings.py
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    Configuration for coalescing bursts of writes to the same dataset.
+
+    All settings can be overridden using environment variables.
+    """
+
+    write_coalescing_enabled: bool = False
+    write_coalescing_window_ms: int = 200
+    write_coalescing_max_batch: int = 100
+
+    model_config = {
+        "env_file": ".env",
+        "extra": "allow",
+    }
+
+
+coalescing_settings = Settings()
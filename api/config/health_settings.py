@@ -0,0 +1,39 @@
+# api/config/health_settings.py
+
+from typing import List
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    Configuration for the background health checks of CKAN, Keycloak and
+    registered services.
+
+    All settings can be overridden using environment variables.
+    """
+
+    # Seconds between two rounds of health checks
+    health_check_interval_seconds: float = 30
+    # Seconds a single check may take before it is reported as failed
+    health_check_timeout_seconds: float = 5
+
+    # Probing of the health_check_url of services registered in the
+    # 'services' organization
+    service_health_enabled: bool = True
+    service_health_interval_seconds: float = 60
+    service_health_timeout_seconds: float = 5
+    # Services probed at the same time
+    service_health_concurrency: int = 16
+    # Catalogs whose services may be probed on loopback, link-local and
+    # private addresses; services of any other catalog must resolve to
+    # public addresses
+    service_health_private_servers: List[str] = ["local"]
+
+    model_config = {
+        "env_file": ".env",
+        "extra": "allow",
+    }
+
+
+health_settings = Settings()
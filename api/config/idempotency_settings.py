@@ -0,0 +1,23 @@
+# api/config/idempotency_settings.py
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    Configuration for Idempotency-Key handling on registration routes.
+
+    All settings can be overridden using environment variables.
+    """
+
+    idempotency_enabled: bool = True
+    idempotency_max_entries: int = 10000
+    idempotency_ttl_seconds: int = 86400
+
+    model_config = {
+        "env_file": ".env",
+        "extra": "allow",
+    }
+
+
+idempotency_settings = Settings()
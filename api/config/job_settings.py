@@ -0,0 +1,28 @@
+# api/config/job_settings.py
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    Configuration for the background job subsystem.
+
+    All settings can be overridden using environment variables.
+    """
+
+    job_workers: int = 4
+    job_store_dir: str = "jobs"
+    job_retention_hours: int = 168
+    job_page_size: int = 500
+    job_item_workers: int = 8
+    # Seconds a worker's claim on a job lasts without being renewed; a job
+    # whose worker died is resumed by another worker after this long
+    job_lease_seconds: int = 60
+
+    model_config = {
+        "env_file": ".env",
+        "extra": "allow",
+    }
+
+
+job_settings = Settings()
@@ -0,0 +1,35 @@
+# api/config/logging_settings.py
+
+from typing import Dict, Literal
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    Configuration for application logging.
+
+    All settings can be overridden using environment variables.
+    """
+
+    log_level: str = "INFO"
+    # 'text' for human-readable lines, 'json' for one JSON object per line
+    log_format: Literal["text", "json"] = "text"
+    log_file: str = "logs/metrics.log"
+    log_file_max_bytes: int = 5 * 1024 * 1024
+    log_file_backup_count: int = 3
+    # Dedicated JSON log of slow requests, rotated like the main log file
+    slow_request_log_file: str = "logs/slow_requests.log"
+    # Records waiting for the writer thread; beyond this they are dropped
+    log_queue_size: int = 10000
+    # Fraction of INFO/DEBUG records kept per logger (and its children),
+    # e.g. {"api.services.status_services": 0.1}. Warnings are always kept.
+    log_sampling: Dict[str, float] = {}
+
+    model_config = {
+        "env_file": ".env",
+        "extra": "allow",
+    }
+
+
+logging_settings = Settings()
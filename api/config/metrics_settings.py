@@ -0,0 +1,66 @@
+# api/config/metrics_settings.py
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    Configuration for the system metrics sampler, the federation metrics
+    reports and the public IP lookup.
+
+    All settings can be overridden using environment variables.
+    """
+
+    # Seconds between two samples of CPU, memory, disk, network and process
+    metrics_sample_interval_seconds: float = 5
+    # Number of samples kept for /status/metrics/history (1 hour at 5 s)
+    metrics_history_size: int = 720
+
+    # Request counters and latency histograms served at /metrics
+    request_metrics_enabled: bool = True
+    # Server-Timing header with the auth, upstream, filter and serialize phases
+    server_timing_enabled: bool = True
+
+    # Slowest CKAN and Keycloak calls kept for /status/upstreams
+    upstream_slow_calls_size: int = 50
+    upstream_slow_calls_window_seconds: int = 900
+
+    # Requests slower than the threshold are written to the slow-request log
+    # and kept for /status/slow-requests with their parameters and upstream
+    # calls. Request bodies larger than the byte limit are not recorded.
+    slow_request_enabled: bool = True
+    slow_request_threshold_seconds: float = 5
+    slow_request_history_size: int = 200
+    slow_request_body_max_bytes: int = 16384
+
+    # Reports posted to the federation METRICS_ENDPOINT. Unsent reports
+    # wait in an on-disk spool and are retried with exponential backoff.
+    metrics_report_interval_seconds: float = 600
+    metrics_publish_timeout_seconds: float = 10
+    metrics_publish_compress: bool = True
+    metrics_spool_dir: str = "metrics_spool"
+    metrics_spool_max_files: int = 1000
+    metrics_retry_initial_seconds: float = 30
+    metrics_retry_max_seconds: float = 3600
+
+    # Event-loop lag sampling (one sample per interval, 10 minutes kept)
+    loop_lag_interval_seconds: float = 0.5
+    loop_lag_history_size: int = 1200
+    # Debug mode: capture the stack of callbacks blocking the loop longer
+    # than the threshold, from a watchdog thread
+    loop_blocking_capture_enabled: bool = False
+    loop_blocking_threshold_seconds: float = 0.1
+    loop_blocking_history_size: int = 50
+
+    # Public IP lookup, resolved at startup and refreshed in the background
+    public_ip_url: str = "https://api.ipify.org?format=json"
+    public_ip_refresh_seconds: int = 3600
+    public_ip_timeout_seconds: float = 5
+
+    model_config = {
+        "env_file": ".env",
+        "extra": "allow",
+    }
+
+
+metrics_settings = Settings()
@@ -0,0 +1,32 @@
+# api/config/profiler_settings.py
+
+from typing import List
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    Configuration for the on-demand profiler at /status/profile.
+
+    All settings can be overridden using environment variables.
+    """
+
+    # The endpoint answers 404 unless enabled
+    profiler_enabled: bool = False
+    # Usernames allowed to run the profiler and to read every user's slow
+    # requests, e.g. ["alice", "bob"]
+    profiler_admin_users: List[str] = []
+    profiler_max_seconds: float = 60
+    # Milliseconds between two stack samples
+    profiler_interval_ms: float = 10
+    # Number of allocation sites returned by the tracemalloc diff
+    profiler_memory_top: int = 25
+
+    model_config = {
+        "env_file": ".env",
+        "extra": "allow",
+    }
+
+
+profiler_settings = Settings()
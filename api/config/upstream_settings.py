@@ -0,0 +1,47 @@
+# api/config/upstream_settings.py
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    Configuration for calls to CKAN and Keycloak: timeouts, retries of
+    reads and the circuit breaker of each upstream server.
+
+    All settings can be overridden using environment variables.
+    """
+
+    # Seconds a single call to CKAN or Keycloak may take before it fails
+    upstream_timeout_seconds: float = 30
+    # Extra attempts of a read (CKAN *_show, *_list, *_search and Keycloak
+    # token introspection) that could not reach the server, after a random
+    # delay of up to backoff * 2^attempt seconds. Timed-out reads and reads
+    # made on the event loop thread are not retried.
+    upstream_read_retries: int = 2
+    upstream_retry_backoff_seconds: float = 0.2
+
+    # A breaker opens when, over the rolling window and at least the
+    # minimum number of calls, the rate of failed calls (connection errors,
+    # timeouts, 5xx) or of calls slower than the slow-call threshold
+    # reaches its limit. It also opens after the given number of failed
+    # calls in a row, whatever the window holds, so a server that hangs
+    # until every call times out is cut off after a few timeouts. While
+    # open, calls fail at once; after the open period, probe calls are let
+    # through and close it again if they succeed.
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_window_seconds: float = 60
+    circuit_breaker_min_calls: int = 10
+    circuit_breaker_consecutive_failures: int = 3
+    circuit_breaker_error_rate: float = 0.5
+    circuit_breaker_slow_call_seconds: float = 10
+    circuit_breaker_slow_call_rate: float = 0.8
+    circuit_breaker_open_seconds: float = 30
+    circuit_breaker_half_open_probes: int = 1
+
+    model_config = {
+        "env_file": ".env",
+        "extra": "allow",
+    }
+
+
+upstream_settings = Settings()
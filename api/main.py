@@ -1,10 +1,9 @@
 # api/main.py
 
 import asyncio
+import atexit
 import logging
-import os
 from contextlib import asynccontextmanager
-from logging.handlers import RotatingFileHandler
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,44 +12,85 @@ from fastapi.security import OAuth2PasswordBearer
 from fastapi.staticfiles import StaticFiles
 
 import api.routes as routes
-from api.config import ckan_settings, swagger_settings
+from api.config import (
+    cache_settings,
+    ckan_settings,
+    health_settings,
+    logging_settings,
+    metrics_settings,
+    swagger_settings,
+)
+from api.middleware import (
+    IdempotencyMiddleware,
+    RequestMetricsMiddleware,
+    ServerTimingMiddleware,
+    SlowRequestMiddleware,
+)
 from api.routes.update_routes.put_dataset import router as dataset_update_router
+from api.services.job_services import job_manager
+from api.services.service_services import service_health
+from api.services.status_services import metrics_publisher, refresh_public_ip
+from api.services.telemetry_services.logging_pipeline import (
+    configure_file_logger,
+    configure_logging,
+)
+from api.tasks.health_task import run_health_checks
+from api.tasks.loop_lag_task import monitor_event_loop
+from api.tasks.metrics_sampler_task import sample_system_metrics
 from api.tasks.metrics_task import record_system_metrics
-
-# Define the format for all logs (timestamp, level, message)
-log_formatter = logging.Formatter(
-    "%(asctime)s [%(levelname)s] %(name)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+from api.tasks.name_index_task import refresh_dataset_names
+from api.tasks.public_ip_task import refresh_public_ip_periodically
+from api.tasks.resource_index_task import refresh_resource_index
+from api.tasks.service_health_task import poll_service_health
+
+# Log calls only enqueue the record; a background thread writes it to the
+# console and the rotating log file, so logging never blocks a request
+log_listener = configure_logging(
+    level=logging_settings.log_level,
+    log_format=logging_settings.log_format,
+    log_file=logging_settings.log_file,
+    max_bytes=logging_settings.log_file_max_bytes,
+    backup_count=logging_settings.log_file_backup_count,
+    queue_size=logging_settings.log_queue_size,
+    sampling=logging_settings.log_sampling,
 )
-
-# Define the path for the log file
-log_file = os.path.join("logs", "metrics.log")
-
-# Create the 'logs' directory if it does not exist
-os.makedirs("logs", exist_ok=True)
-
-# Create a rotating file handler: 5MB per file, keep 3 backups
-file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3)
-file_handler.setFormatter(log_formatter)
-file_handler.setLevel(logging.INFO)
-
-# Create a console handler for stdout logging
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(log_formatter)
-console_handler.setLevel(logging.INFO)
-
-# Configure the root logger to use both handlers
-root_logger = logging.getLogger()
-root_logger.setLevel(logging.INFO)
-root_logger.addHandler(file_handler)
-root_logger.addHandler(console_handler)
+# Flush pending records when the process exits
+atexit.register(log_listener.stop)
+slow_request_listener = configure_file_logger(
+    "api.slow_requests",
+    logging_settings.slow_request_log_file,
+    max_bytes=logging_settings.log_file_max_bytes,
+    backup_count=logging_settings.log_file_backup_count,
+    queue_size=logging_settings.log_queue_size,
+)
+atexit.register(slow_request_listener.stop)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Run tasks on startup and handle shutdown."""
-    task = asyncio.create_task(record_system_metrics())
+    job_manager.start()
+    # Bounded by PUBLIC_IP_TIMEOUT_SECONDS; the first metrics report needs it
+    await asyncio.to_thread(refresh_public_ip)
+    tasks = [
+        asyncio.create_task(sample_system_metrics()),
+        asyncio.create_task(run_health_checks()),
+        asyncio.create_task(refresh_public_ip_periodically()),
+        asyncio.create_task(record_system_metrics()),
+        asyncio.create_task(monitor_event_loop()),
+    ]
+    if cache_settings.dataset_name_index_enabled:
+        tasks.append(asyncio.create_task(refresh_dataset_names()))
+    if cache_settings.resource_index_enabled:
+        tasks.append(asyncio.create_task(refresh_resource_index()))
+    if health_settings.service_health_enabled:
+        tasks.append(asyncio.create_task(poll_service_health()))
     yield
-    task.cancel()
+    for task in tasks:
+        task.cancel()
+    await metrics_publisher.aclose()
+    await service_health.aclose()
+    job_manager.shutdown()
 
 
 app = FastAPI(
@@ -60,6 +100,16 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Registered first so CORS stays the outermost middleware
+app.add_middleware(IdempotencyMiddleware)
+if metrics_settings.request_metrics_enabled:
+    app.add_middleware(RequestMetricsMiddleware)
+# Outside the idempotency middleware so replayed responses get fresh timings
+if metrics_settings.server_timing_enabled:
+    app.add_middleware(ServerTimingMiddleware)
+# Outside the other middlewares, so a slow request's time includes them
+if metrics_settings.slow_request_enabled:
+    app.add_middleware(SlowRequestMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -67,6 +117,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
 
@@ -82,7 +133,10 @@ if ckan_settings.ckan_local_enabled:
 if ckan_settings.ckan_local_enabled:
     app.include_router(routes.delete_router, tags=["Delete"])
 app.include_router(routes.token_router, tags=["Token"])
+app.include_router(routes.job_router, tags=["Jobs"])
 app.include_router(routes.status_router, prefix="/status", tags=["Status"])
+if metrics_settings.request_metrics_enabled:
+    app.include_router(routes.metrics_router, tags=["Status"])
 if ckan_settings.ckan_local_enabled:
     app.include_router(routes.update_router, tags=["Update"])
     app.include_router(dataset_update_router, tags=["Update"])
@@ -0,0 +1,7 @@
+from .idempotency_middleware import (  # noqa: F401
+    IdempotencyMiddleware,
+    idempotency_store,
+)
+from .request_metrics_middleware import RequestMetricsMiddleware  # noqa: F401
+from .server_timing_middleware import ServerTimingMiddleware  # noqa: F401
+from .slow_request_middleware import SlowRequestMiddleware  # noqa: F401
@@ -0,0 +1,255 @@
+# api/middleware/idempotency_middleware.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from api.config.idempotency_settings import idempotency_settings
+
+# Registration routes whose POSTs honour the Idempotency-Key header
+IDEMPOTENT_PATHS = {"/url", "/kafka", "/s3", "/dataset", "/services"}
+
+MAX_KEY_LENGTH = 255
+
+
+class StoredResponse:
+    """A completed response kept for replay."""
+
+    def __init__(
+        self,
+        fingerprint: str,
+        status: int,
+        headers: List[Tuple[bytes, bytes]],
+        body: bytes,
+    ):
+        self.fingerprint = fingerprint
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.created_at = time.monotonic()
+
+
+class IdempotencyStore:
+    """
+    Bounded, in-process store of responses keyed by idempotency key.
+
+    Entries expire after ``ttl`` seconds and the least recently used entry
+    is evicted once ``max_entries`` is reached. Keys whose request is
+    still being processed are tracked separately so concurrent retries
+    can be rejected instead of reaching CKAN twice.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._responses: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._in_flight: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, key: str, fingerprint: str):
+        """
+        Claim a key for a new request.
+
+        Returns the stored response to replay, the string 'in_flight' or
+        'mismatch' when the key cannot be used, or None when the caller
+        should process the request and then ``complete`` or ``release``.
+        """
+        with self._lock:
+            stored = self._responses.get(key)
+            if stored and time.monotonic() - stored.created_at > self.ttl:
+                del self._responses[key]
+                stored = None
+
+            if stored:
+                if stored.fingerprint != fingerprint:
+                    return "mismatch"
+                self._responses.move_to_end(key)
+                return stored
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                return "in_flight" if in_flight == fingerprint else "mismatch"
+
+            self._in_flight[key] = fingerprint
+            return None
+
+    def complete(self, key: str, response: StoredResponse) -> None:
+        """Store the response of a claimed key for later replay."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+            self._responses[key] = response
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_entries:
+                self._responses.popitem(last=False)
+
+    def release(self, key: str) -> None:
+        """Forget a claimed key so the request can be retried."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+            self._in_flight.clear()
+
+
+idempotency_store = IdempotencyStore(
+    max_entries=idempotency_settings.idempotency_max_entries,
+    ttl=idempotency_settings.idempotency_ttl_seconds,
+)
+
+
+class IdempotencyMiddleware:
+    """
+    Replay the original response of a registration POST that is retried
+    with the same ``Idempotency-Key`` header and body.
+
+    Keys are scoped to the caller's Authorization header, only successful
+    (2xx) responses are stored, and replays carry an
+    ``Idempotent-Replayed: true`` header. Reusing a key with a different
+    body returns 422; retrying while the first request is still running
+    returns 409.
+    """
+
+    def __init__(self, app, store: Optional[IdempotencyStore] = None, paths=None):
+        self.app = app
+        self.store = store or idempotency_store
+        self.paths = IDEMPOTENT_PATHS if paths is None else paths
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+            or not idempotency_settings.idempotency_enabled
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key must be at most 255 characters."},
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+
+        body, more_messages = await self._read_body(receive)
+
+        caller = hashlib.sha256(headers.get("authorization", "").encode()).hexdigest()
+        key = f"{caller}:{idempotency_key}"
+        fingerprint = hashlib.sha256(
+            b"\0".join(
+                [
+                    scope["method"].encode(),
+                    scope["path"].encode(),
+                    scope.get("query_string", b""),
+                    body,
+                ]
+            )
+        ).hexdigest()
+
+        claimed = self.store.begin(key, fingerprint)
+        if isinstance(claimed, StoredResponse):
+            await self._replay(claimed, send)
+            return
+        if claimed == "mismatch":
+            response = JSONResponse(
+                {
+                    "detail": (
+                        "Idempotency-Key was already used with a different "
+                        "request body."
+                    )
+                },
+                status_code=422,
+            )
+            await response(scope, receive, send)
+            return
+        if claimed == "in_flight":
+            response = JSONResponse(
+                {
+                    "detail": (
+                        "A request with this Idempotency-Key is still being "
+                        "processed."
+                    )
+                },
+                status_code=409,
+            )
+            await response(scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            if more_messages:
+                return more_messages.pop(0)
+            return await receive()
+
+        status = 500
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def capture_send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        finally:
+            if 200 <= status < 300:
+                self.store.complete(
+                    key,
+                    StoredResponse(
+                        fingerprint, status, response_headers, b"".join(chunks)
+                    ),
+                )
+            else:
+                self.store.release(key)
+
+    @staticmethod
+    async def _read_body(receive) -> Tuple[bytes, list]:
+        chunks = []
+        extra = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                extra.append(message)
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks), extra
+
+    @staticmethod
+    async def _replay(stored: StoredResponse, send) -> None:
+        headers = [
+            (name, value)
+            for name, value in stored.headers
+            if name.lower() != b"content-length"
+        ]
+        headers.append((b"content-length", str(len(stored.body)).encode()))
+        headers.append((b"idempotent-replayed", b"true"))
+        await send(
+            {"type": "http.response.start", "status": stored.status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": stored.body})
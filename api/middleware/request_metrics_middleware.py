@@ -0,0 +1,72 @@
+# api/middleware/request_metrics_middleware.py
+
+import time
+
+from api.services.telemetry_services import metrics_registry
+
+REQUESTS_TOTAL = "pop_http_requests_total"
+REQUEST_DURATION = "pop_http_request_duration_seconds"
+
+metrics_registry.describe(
+    REQUESTS_TOTAL, "counter", "HTTP requests by route, method and status."
+)
+metrics_registry.describe(
+    REQUEST_DURATION,
+    "histogram",
+    "HTTP request latency in seconds by route and method.",
+)
+
+
+def route_template(scope) -> str:
+    """
+    Return the path template of the matched route, e.g. '/dataset/{dataset_id}',
+    so ids in URLs do not create one series per dataset.
+
+    Routes of included routers only know their path relative to the router
+    prefix; FastAPI keeps the full one in the effective route context.
+    """
+    route = (scope.get("fastapi") or {}).get("effective_route_context") or scope.get(
+        "route"
+    )
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware counting requests and timing them per route, method
+    and response status. The time runs until the last body chunk has been
+    sent, so it includes serialization and streaming.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_template(scope)
+            method = scope["method"]
+            metrics_registry.inc(
+                REQUESTS_TOTAL,
+                (("method", method), ("route", route), ("status", str(status))),
+            )
+            metrics_registry.observe(
+                REQUEST_DURATION,
+                (("method", method), ("route", route)),
+                time.perf_counter() - started,
+            )
@@ -0,0 +1,51 @@
+# api/middleware/server_timing_middleware.py
+
+import time
+
+from starlette.datastructures import MutableHeaders
+
+from api.services.telemetry_services.request_context import (
+    close_request_context,
+    open_request_context,
+)
+from api.services.telemetry_services.server_timing import (
+    current_phases,
+    format_server_timing,
+)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware adding a ``Server-Timing`` header to every response.
+
+    The phases (auth, upstream, filter, serialize, ...) are recorded by the
+    code doing the work for the current request; ``total`` is the time
+    until the response headers are sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        _, token = open_request_context()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    format_server_timing(
+                        current_phases(), time.perf_counter() - started
+                    ),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            close_request_context(token)
@@ -0,0 +1,141 @@
+# api/middleware/slow_request_middleware.py
+
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl
+
+from api.config.metrics_settings import metrics_settings
+from api.services.telemetry_services.request_context import (
+    RequestContext,
+    close_request_context,
+    open_request_context,
+)
+from api.services.telemetry_services.slow_requests import sanitize, slow_requests
+
+from .request_metrics_middleware import route_template
+
+
+def _parse_pairs(text: str) -> Dict[str, Any]:
+    """Decode a query string; repeated keys become lists."""
+    params: Dict[str, Any] = {}
+    for key, value in parse_qsl(text, keep_blank_values=True):
+        if key in params:
+            if not isinstance(params[key], list):
+                params[key] = [params[key]]
+            params[key].append(value)
+        else:
+            params[key] = value
+    return params
+
+
+def _decode_body(content_type: str, body: bytes) -> Optional[Any]:
+    """Decode a JSON or form body, None for other or unreadable bodies."""
+    try:
+        if content_type.startswith("application/json"):
+            return json.loads(body)
+        if content_type.startswith("application/x-www-form-urlencoded"):
+            return _parse_pairs(body.decode("utf-8"))
+    except ValueError:
+        return None
+    return None
+
+
+def _upstream_breakdown(context: RequestContext) -> List[Dict[str, Any]]:
+    """Upstream calls of a request per service, server and action, slowest first."""
+    breakdown = []
+    for (service, server, action), (calls, seconds, size) in context.upstream.items():
+        breakdown.append(
+            {
+                "service": service,
+                "server": server,
+                "action": action,
+                "calls": calls,
+                "total_ms": round(seconds * 1000, 1),
+                "response_bytes": size,
+            }
+        )
+    return sorted(breakdown, key=lambda call: call["total_ms"], reverse=True)
+
+
+class SlowRequestMiddleware:
+    """
+    ASGI middleware recording requests slower than the slow-request
+    threshold, with the route, the sanitized query and body parameters,
+    the authenticated user, the Server-Timing phases, the upstream calls
+    grouped by service, server and action, and the response size.
+
+    The first ``SLOW_REQUEST_BODY_MAX_BYTES`` of the request body are kept
+    while it is read, since the body is gone once the request is slow;
+    longer bodies are recorded as truncated. The time runs until the last
+    body chunk has been sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.body_max_bytes = metrics_settings.slow_request_body_max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        context, token = open_request_context()
+        body_chunks: List[bytes] = []
+        body_size = 0
+        response_size = 0
+        status = 500
+
+        async def receive_wrapper():
+            nonlocal body_size
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                if body_size < self.body_max_bytes:
+                    body_chunks.append(chunk[: self.body_max_bytes - body_size])
+                body_size += len(chunk)
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_size, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            close_request_context(token)
+            if duration >= slow_requests.threshold:
+                body = None
+                if body_size and body_size <= self.body_max_bytes:
+                    headers = dict(scope.get("headers") or [])
+                    content_type = headers.get(b"content-type", b"").decode("latin-1")
+                    body = _decode_body(content_type, b"".join(body_chunks))
+                query = scope.get("query_string", b"").decode("latin-1")
+                slow_requests.record(
+                    {
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                        "method": scope["method"],
+                        "route": route_template(scope),
+                        "path": scope["path"],
+                        "status": status,
+                        "duration_ms": round(duration * 1000, 1),
+                        "user_id": context.user_id,
+                        "query": sanitize(_parse_pairs(query)),
+                        "body": sanitize(body),
+                        "body_bytes": body_size,
+                        "body_truncated": body_size > self.body_max_bytes,
+                        "response_bytes": response_size,
+                        "phases_ms": {
+                            name: round(seconds * 1000, 1)
+                            for name, seconds in context.phases.items()
+                        },
+                        "upstream": _upstream_breakdown(context),
+                    }
+                )
@@ -1,3 +1,7 @@
+from .dataset_batch_model import (  # noqa: F401
+    DatasetBatchRequest,
+    DatasetBatchResponse,
+)
 from .datasourcerequest_model import DataSourceRequest  # noqa: F401
 from .datasourceresponse_model import DataSourceResponse  # noqa: F401
 from .datasourceresponse_model import Resource  # noqa: F401
@@ -10,10 +14,20 @@ from .general_dataset_response_model import (  # noqa: F401
     GeneralDatasetResponse,
     ResourceResponse,
 )
+from .job_request_model import (  # noqa: F401
+    CatalogExportJobRequest,
+    OrganizationDeletionJobRequest,
+    OrganizationRetagJobRequest,
+)
+from .job_response_model import JobResponse  # noqa: F401
 from .organizationdeleterequest_model import (  # noqa: F401
     OrganizationDeleteRequest,
 )
 from .organizationrequest_model import OrganizationRequest  # noqa: F401
 from .searchrequest_model import SearchRequest  # noqa: F401
+from .service_health_model import (  # noqa: F401
+    ServiceHealth,
+    ServiceHealthResponse,
+)
 from .service_request_model import ServiceRequest  # noqa: F401
 from .system_metrics_model import SystemMetrics  # noqa: F401
@@ -0,0 +1,45 @@
+# api/models/dataset_batch_model.py
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from .datasourceresponse_model import DataSourceResponse
+
+
+class DatasetBatchRequest(BaseModel):
+    """
+    Represents the input data for the POST /datasets/batch endpoint.
+    """
+
+    ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Dataset ids or names to fetch (at most 1000).",
+        json_schema_extra={"example": ["weather_data", "4e2f5142-9490-436c"]},
+    )
+    server: Literal["local", "global", "pre_ckan"] = Field(
+        "global",
+        description=(
+            "Specify the server to read from: 'local', 'global', "
+            "or 'pre_ckan'. Defaults to 'global'."
+        ),
+    )
+
+
+class DatasetBatchResponse(BaseModel):
+    """
+    Datasets returned by POST /datasets/batch, in request order.
+    """
+
+    datasets: List[Optional[DataSourceResponse]] = Field(
+        ...,
+        description=(
+            "One entry per requested id, in request order; null when the "
+            "dataset was not found."
+        ),
+    )
+    not_found: List[str] = Field(
+        ..., description="Requested ids or names that do not exist."
+    )
@@ -1,6 +1,8 @@
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_serializer
+
+from .service_health_model import ServiceHealth
 
 
 class Resource(BaseModel):
@@ -108,4 +110,22 @@ class DataSourceResponse(BaseModel):
         },
     )
 
+    health: Optional[ServiceHealth] = Field(
+        None,
+        json_schema_extra={
+            "description": (
+                "Cached health of a dataset of the 'services' organization, "
+                "omitted for other datasets."
+            ),
+        },
+    )
+
     model_config = ConfigDict(populate_by_name=True)
+
+    @model_serializer(mode="wrap")
+    def omit_missing_health(self, handler):
+        """Leave 'health' out of datasets that are not probed services."""
+        data = handler(self)
+        if self.health is None:
+            data.pop("health", None)
+        return data
@@ -0,0 +1,38 @@
+# api/models/job_request_model.py
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class OrganizationDeletionJobRequest(BaseModel):
+    """Input for a background organization deletion."""
+
+    organization_name: str = Field(
+        ..., description="The name of the organization to delete."
+    )
+
+
+class OrganizationRetagJobRequest(BaseModel):
+    """Input for a background organization-wide retagging."""
+
+    organization_name: str = Field(
+        ..., description="The name of the organization to retag."
+    )
+    add_tags: Optional[List[str]] = Field(
+        None, description="Tags to add to every dataset of the organization."
+    )
+    remove_tags: Optional[List[str]] = Field(
+        None, description="Tags to remove from every dataset of the organization."
+    )
+
+
+class CatalogExportJobRequest(BaseModel):
+    """Input for a background catalog export."""
+
+    server: Literal["local", "global", "pre_ckan"] = Field(
+        "global", description="The CKAN server to export. Defaults to 'global'."
+    )
+    owner_org: Optional[str] = Field(
+        None, description="Restrict the export to one organization."
+    )
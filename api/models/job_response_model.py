@@ -0,0 +1,41 @@
+# api/models/job_response_model.py
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobResponse(BaseModel):
+    """State and progress of a background job."""
+
+    id: str = Field(..., description="Unique identifier of the job")
+    type: str = Field(..., description="The kind of operation the job runs")
+    params: Dict[str, Any] = Field(..., description="Parameters of the job")
+    user_id: Optional[str] = Field(
+        None, description="Id of the user who submitted the job"
+    )
+    status: str = Field(
+        ..., description="One of 'queued', 'running', 'completed' or 'failed'"
+    )
+    total: Optional[int] = Field(
+        None, description="Number of items to process, once known"
+    )
+    succeeded: int = Field(..., description="Items processed successfully")
+    failed: int = Field(..., description="Items that failed")
+    processed: int = Field(..., description="Items processed so far")
+    throughput: Optional[float] = Field(
+        None, description="Items processed per second since the job started"
+    )
+    errors: List[str] = Field(..., description="The first item-level errors")
+    result: Optional[Dict[str, Any]] = Field(
+        None, description="Result of the job once completed"
+    )
+    error: Optional[str] = Field(None, description="Error that made the job fail")
+    attempts: int = Field(..., description="Number of times the job was started")
+    created_at: float = Field(..., description="Creation time (Unix timestamp)")
+    started_at: Optional[float] = Field(
+        None, description="Start time of the current attempt (Unix timestamp)"
+    )
+    finished_at: Optional[float] = Field(
+        None, description="Completion time (Unix timestamp)"
+    )
@@ -2,7 +2,7 @@
 
 from typing import Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 
 
 class SearchRequest(BaseModel):
@@ -31,6 +31,16 @@ class SearchRequest(BaseModel):
         None, description="A list of field filters (key:value)."
     )
     timestamp: str = Field(None, description="A timestamp or time range for filtering.")
+    extras_filters: Optional[list[str]] = Field(
+        None,
+        description=(
+            "Filters on dataset extras of the form 'extras.<key>=<value>'. "
+            "Values match exactly and case-sensitively; a value ending in "
+            "'*' matches as a prefix. Keys may only contain letters, digits, "
+            "'_', '.' and '-'."
+        ),
+        json_schema_extra={"example": ["extras.file_type=NetCDF"]},
+    )
     server: Optional[Literal["local", "global", "pre_ckan"]] = Field(
         "global",
         description=(
@@ -38,3 +48,32 @@ class SearchRequest(BaseModel):
             "or 'pre_ckan'. Defaults to 'global'."
         ),
     )
+
+    @validator("extras_filters")
+    def validate_extras_filters(cls, v):
+        """
+        Validate that every extras filter has a key and a value part.
+
+        Parameters
+        ----------
+        v : Optional[list[str]]
+            The extras filters to validate.
+
+        Returns
+        -------
+        Optional[list[str]]
+            The validated extras filters.
+
+        Raises
+        ------
+        ValueError
+            If a filter is not of the form 'extras.<key>=<value>'.
+        """
+        for extras_filter in v or []:
+            key, separator, _ = extras_filter.partition("=")
+            if not separator or not key.strip().removeprefix("extras."):
+                raise ValueError(
+                    f"Invalid extras filter '{extras_filter}'. "
+                    "Use 'extras.<key>=<value>' or 'extras.<key>=<prefix>*'."
+                )
+        return v
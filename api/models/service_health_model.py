@@ -0,0 +1,43 @@
+# api/models/service_health_model.py
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ServiceHealth(BaseModel):
+    """Last result of the background probe of a service's health_check_url."""
+
+    status: str = Field(
+        ...,
+        description=(
+            "'up' for a 2xx/3xx answer, 'down' otherwise, 'unknown' when the "
+            "service has no health_check_url, 'refused' when the URL is not "
+            "http(s) or points to a non-public address"
+        ),
+    )
+    http_status: Optional[int] = Field(
+        None, description="HTTP status returned by the health check URL"
+    )
+    latency_ms: Optional[float] = Field(
+        None, description="Time taken by the health check in milliseconds"
+    )
+    checked_at: Optional[str] = Field(
+        None, description="When the service was last probed (ISO 8601)"
+    )
+    error: Optional[str] = Field(None, description="Why the last probe failed")
+
+
+class ServiceHealthResponse(ServiceHealth):
+    """A registered service with its cached health."""
+
+    id: str = Field(..., description="The unique identifier of the service dataset")
+    name: str = Field(..., description="The unique name of the service dataset")
+    title: str = Field(..., description="The title of the service")
+    server: str = Field(
+        ..., description="Catalog the service is registered in: 'local', 'global'..."
+    )
+    service_url: Optional[str] = Field(None, description="URL of the service")
+    health_check_url: Optional[str] = Field(
+        None, description="URL probed to check the service"
+    )
@@ -1,5 +1,7 @@
 from .default_routes import router as default_router  # noqa: F401
 from .delete_routes import router as delete_router  # noqa: F401
+from .job_routes import router as job_router  # noqa: F401
+from .metrics_routes import router as metrics_router  # noqa: F401
 from .register_routes import router as register_router  # noqa: F401
 from .search_routes import router as search_router  # noqa: F401
 from .status_routes import router as status_router  # noqa: F401
@@ -1,5 +1,7 @@
 # api/routes/default_routes/get.py
 
+import asyncio
+
 from fastapi import APIRouter, Request
 
 from api.services import default_services
@@ -9,4 +11,5 @@ router = APIRouter()
 
 @router.get("/")
 async def index(request: Request):
-    return default_services.index(request)
+    # Rendering reads the service status, which may run the health checks
+    return await asyncio.to_thread(default_services.index, request)
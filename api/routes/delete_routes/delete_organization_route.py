@@ -3,9 +3,11 @@
 from typing import Literal
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from api.config.ckan_settings import ckan_settings
 from api.services import organization_services
+from api.services.job_services import stream_progress
 
 router = APIRouter()
 
@@ -16,7 +18,13 @@ router = APIRouter()
     summary="Delete an organization",
     description=(
         "Delete an organization from CKAN by its name, including "
-        "all associated datasets and resources."
+        "all associated datasets and resources.\n\n"
+        "Datasets are purged concurrently, page by page, and the "
+        "organization is only removed once it is verified to be empty.\n\n"
+        "Use `?stream=true` to receive progress as JSON lines "
+        "(`application/x-ndjson`) ending with a `done` or `error` event. "
+        "For very large organizations, prefer the "
+        "`/jobs/organization-deletion` background job."
     ),
     responses={
         200: {
@@ -48,6 +56,7 @@ async def delete_organization(
     server: Literal["local"] = Query(
         "local", description="Choose 'local'. Defaults to 'local'."
     ),
+    stream: bool = Query(False, description="Stream deletion progress as JSON lines."),
 ):
     """
     Endpoint to delete an organization in CKAN by its name.
@@ -67,6 +76,16 @@ async def delete_organization(
         else:
             ckan_instance = ckan_settings.ckan
 
+        if stream:
+            return StreamingResponse(
+                stream_progress(
+                    organization_services.delete_organization,
+                    organization_name=organization_name,
+                    ckan_instance=ckan_instance,
+                ),
+                media_type="application/x-ndjson",
+            )
+
         organization_services.delete_organization(
             organization_name=organization_name, ckan_instance=ckan_instance
         )
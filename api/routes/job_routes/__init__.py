@@ -0,0 +1,10 @@
+# api/routes/job_routes/__init__.py
+from fastapi import APIRouter
+
+from .get import router as get_router
+from .post import router as post_router
+
+router = APIRouter()
+
+router.include_router(get_router)
+router.include_router(post_router)
@@ -0,0 +1,119 @@
+# api/routes/job_routes/get.py
+
+import os
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from api.models import JobResponse
+from api.services.job_services import Job, job_manager
+from api.services.keycloak_services.get_current_user import get_current_user
+
+router = APIRouter()
+
+
+def get_user_job(job_id: str, user: Dict[str, Any]) -> Optional[Job]:
+    """
+    Return a job if the user submitted it. Other users' jobs are reported
+    as missing, so their ids cannot be probed.
+    """
+    job = job_manager.get(job_id)
+    if job is None or job.user_id != user.get("id"):
+        return None
+    return job
+
+
+@router.get(
+    "/jobs",
+    response_model=List[JobResponse],
+    summary="List background jobs",
+    description=(
+        "List the background jobs submitted by the current user, newest "
+        "first, optionally by status."
+    ),
+)
+async def list_jobs(
+    status: Optional[Literal["queued", "running", "completed", "failed"]] = Query(
+        None, description="Only return jobs in this state."
+    ),
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """
+    Endpoint to list the current user's background jobs.
+
+    Returns
+    -------
+    List[JobResponse]
+        The user's jobs and their progress.
+    """
+    jobs = job_manager.list(status=status, user_id=user.get("id"))
+    return [job.to_dict() for job in jobs]
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    summary="Get a background job",
+    description=(
+        "Return the state of a background job submitted by the current "
+        "user, including progress counts and throughput in items per second."
+    ),
+    responses={
+        404: {
+            "description": "Not Found",
+            "content": {"application/json": {"example": {"detail": "Job not found"}}},
+        },
+    },
+)
+async def get_job(job_id: str, user: Dict[str, Any] = Depends(get_current_user)):
+    """
+    Endpoint to poll the progress of a background job.
+
+    Raises
+    ------
+    HTTPException
+        - 404: if the job does not exist or another user submitted it.
+    """
+    job = get_user_job(job_id, user)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.get(
+    "/jobs/{job_id}/download",
+    summary="Download the output of a background job",
+    description="Download the file produced by a completed catalog export job.",
+    responses={
+        404: {
+            "description": "Not Found",
+            "content": {
+                "application/json": {"example": {"detail": "Job output not found"}}
+            },
+        },
+    },
+)
+async def download_job_output(
+    job_id: str, user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Endpoint to download the file produced by a completed job.
+
+    Raises
+    ------
+    HTTPException
+        - 404: if the job does not exist, another user submitted it or it
+          produced no file.
+    """
+    job = get_user_job(job_id, user)
+    if job is None or not job.result or not job.result.get("file"):
+        raise HTTPException(status_code=404, detail="Job output not found")
+
+    path = job.result["file"]
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Job output not found")
+
+    return FileResponse(
+        path, media_type="application/x-ndjson", filename=os.path.basename(path)
+    )
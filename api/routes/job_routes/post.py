@@ -0,0 +1,152 @@
+# api/routes/job_routes/post.py
+
+from typing import Any, Dict, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from api.config.ckan_settings import ckan_settings
+from api.models import (
+    CatalogExportJobRequest,
+    JobResponse,
+    OrganizationDeletionJobRequest,
+    OrganizationRetagJobRequest,
+)
+from api.services.job_services import (
+    CATALOG_EXPORT,
+    ORGANIZATION_DELETION,
+    ORGANIZATION_RETAG,
+    job_manager,
+)
+from api.services.keycloak_services.get_current_user import get_current_user
+
+router = APIRouter()
+
+
+def check_write_server(server: str) -> None:
+    """Raise a 400 error if the selected write server is not enabled."""
+    if server == "pre_ckan":
+        if not ckan_settings.pre_ckan_enabled:
+            raise HTTPException(
+                status_code=400, detail="Pre-CKAN is disabled and cannot be used."
+            )
+    elif not ckan_settings.ckan_local_enabled:
+        raise HTTPException(
+            status_code=400, detail="Local CKAN is disabled and cannot be used."
+        )
+
+
+@router.post(
+    "/jobs/organization-deletion",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Delete an organization in the background",
+    description=(
+        "Queue the deletion of an organization and all its datasets. "
+        "Poll `/jobs/{job_id}` for progress.\n\n"
+        "Use `?server=local` or `?server=pre_ckan` to pick the CKAN instance. "
+        "Defaults to 'local' if not provided.\n"
+    ),
+)
+async def submit_organization_deletion(
+    data: OrganizationDeletionJobRequest,
+    server: Literal["local", "pre_ckan"] = Query(
+        "local", description="Choose 'local' or 'pre_ckan'. Defaults to 'local'."
+    ),
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """
+    Endpoint to queue an organization deletion job.
+
+    Raises
+    ------
+    HTTPException
+        - 400: if the selected server is disabled.
+    """
+    check_write_server(server)
+    job = job_manager.submit(
+        ORGANIZATION_DELETION,
+        user_id=user.get("id"),
+        organization_name=data.organization_name,
+        server=server,
+    )
+    return job.to_dict()
+
+
+@router.post(
+    "/jobs/organization-retag",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Retag every dataset of an organization in the background",
+    description=(
+        "Queue a job that adds `add_tags` to and removes `remove_tags` from "
+        "every dataset of an organization. Poll `/jobs/{job_id}` for "
+        "progress.\n\n"
+        "Use `?server=local` or `?server=pre_ckan` to pick the CKAN instance. "
+        "Defaults to 'local' if not provided.\n"
+    ),
+)
+async def submit_organization_retag(
+    data: OrganizationRetagJobRequest,
+    server: Literal["local", "pre_ckan"] = Query(
+        "local", description="Choose 'local' or 'pre_ckan'. Defaults to 'local'."
+    ),
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """
+    Endpoint to queue an organization retagging job.
+
+    Raises
+    ------
+    HTTPException
+        - 400: if no tags are given or the selected server is disabled.
+    """
+    if not data.add_tags and not data.remove_tags:
+        raise HTTPException(
+            status_code=400, detail="Provide at least one tag to add or remove."
+        )
+    check_write_server(server)
+    job = job_manager.submit(
+        ORGANIZATION_RETAG,
+        user_id=user.get("id"),
+        organization_name=data.organization_name,
+        add_tags=data.add_tags,
+        remove_tags=data.remove_tags,
+        server=server,
+    )
+    return job.to_dict()
+
+
+@router.post(
+    "/jobs/catalog-export",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Export a catalog in the background",
+    description=(
+        "Queue an export of all datasets of a catalog, optionally restricted "
+        "to one organization, as JSON Lines. Poll `/jobs/{job_id}` for "
+        "progress and fetch the file from `/jobs/{job_id}/download`."
+    ),
+)
+async def submit_catalog_export(
+    data: CatalogExportJobRequest,
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """
+    Endpoint to queue a catalog export job.
+
+    Raises
+    ------
+    HTTPException
+        - 400: if 'pre_ckan' is selected but disabled.
+    """
+    if data.server == "pre_ckan" and not ckan_settings.pre_ckan_enabled:
+        raise HTTPException(
+            status_code=400, detail="Pre-CKAN is disabled and cannot be used."
+        )
+    job = job_manager.submit(
+        CATALOG_EXPORT,
+        user_id=user.get("id"),
+        server=data.server,
+        owner_org=data.owner_org,
+    )
+    return job.to_dict()
@@ -0,0 +1,34 @@
+# api/routes/metrics_routes/get.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from api.services.telemetry_services import metrics_registry
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus metrics",
+    description=(
+        "Request counters and latency histograms per route, method and "
+        "status in the Prometheus text exposition format, for scraping.\n\n"
+        "Each worker process keeps its own series."
+    ),
+)
+async def get_prometheus_metrics():
+    """
+    Endpoint exposing the metrics registry to Prometheus.
+
+    Returns
+    -------
+    PlainTextResponse
+        The metrics in Prometheus text format.
+    """
+    return PlainTextResponse(
+        metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -137,4 +137,12 @@ async def create_url_resource(
                 status_code=400,
                 detail="Pre-CKAN server is not configured or unreachable.",
             )
+        if "That name is already in use" in error_msg:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "error": "Duplicate Dataset",
+                    "detail": "A dataset with the given name already exists.",
+                },
+            )
         raise HTTPException(status_code=400, detail=error_msg)
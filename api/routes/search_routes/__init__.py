@@ -1,7 +1,12 @@
 # api/routes/search_routes/__init__.py
 from fastapi import APIRouter
 
+from .get_dataset_exists_route import router as get_dataset_exists_router
+from .get_dataset_route import router as get_dataset_router
+from .get_healthy_services_route import router as get_healthy_services_router
+from .get_resource_lookup_route import router as get_resource_lookup_router
 from .list_organizations_route import router as list_organizations_router
+from .post_datasets_batch_route import router as post_datasets_batch_router
 from .post_search_datasource_route import router as post_get_router
 from .search_datasource_route import router as get_router
 
@@ -10,3 +15,9 @@ router = APIRouter()
 router.include_router(get_router)
 router.include_router(post_get_router)
 router.include_router(list_organizations_router)
+# Registered before /dataset/{dataset_id} so 'exists' is not taken as an id
+router.include_router(get_dataset_exists_router)
+router.include_router(get_dataset_router)
+router.include_router(post_datasets_batch_router)
+router.include_router(get_resource_lookup_router)
+router.include_router(get_healthy_services_router)
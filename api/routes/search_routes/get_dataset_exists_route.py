@@ -0,0 +1,97 @@
+# api/routes/search_routes/get_dataset_exists_route.py
+
+from typing import Literal
+
+from ckanapi import NotFound
+from fastapi import APIRouter, HTTPException, Query
+
+from api.config.ckan_settings import ckan_settings
+from api.services.dataset_services import dataset_cache, dataset_names
+
+router = APIRouter()
+
+
+@router.get(
+    "/dataset/exists",
+    response_model=dict,
+    summary="Check whether a dataset name is taken",
+    description=(
+        "Check whether a dataset with the given name exists, without "
+        "registering anything.\n\n"
+        "The answer comes from an in-memory index of dataset names that "
+        "is refreshed periodically and updated by this API's own writes, "
+        "so datasets created or deleted directly in CKAN may take until "
+        "the next refresh to show up.\n\n"
+        "### Query Parameters\n"
+        "- **name**: The dataset name to check\n"
+        "- **server**: 'local' or 'pre_ckan'. Defaults to 'local'.\n"
+    ),
+    responses={
+        200: {
+            "description": "Name checked",
+            "content": {
+                "application/json": {
+                    "example": {"name": "weather_data", "exists": True}
+                }
+            },
+        },
+        400: {
+            "description": "Bad Request",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Pre-CKAN is disabled and cannot be used."}
+                }
+            },
+        },
+    },
+)
+async def dataset_exists(
+    name: str = Query(..., description="The dataset name to check."),
+    server: Literal["local", "pre_ckan"] = Query(
+        "local", description="Choose 'local' or 'pre_ckan'. Defaults to 'local'."
+    ),
+):
+    """
+    Report whether a dataset name is already in use.
+
+    Parameters
+    ----------
+    name : str
+        The dataset name to check.
+    server : Literal['local', 'pre_ckan']
+        CKAN instance to check. Defaults to 'local'.
+
+    Returns
+    -------
+    dict
+        The name and whether it exists.
+
+    Raises
+    ------
+    HTTPException
+        - 400: if the selected server is disabled or unreachable
+    """
+    if server == "local" and not ckan_settings.ckan_local_enabled:
+        raise HTTPException(
+            status_code=400, detail="Local CKAN is disabled and cannot be used."
+        )
+    if server == "pre_ckan" and not ckan_settings.pre_ckan_enabled:
+        raise HTTPException(
+            status_code=400, detail="Pre-CKAN is disabled and cannot be used."
+        )
+    ckan_instance = (
+        ckan_settings.pre_ckan if server == "pre_ckan" else ckan_settings.ckan
+    )
+
+    exists = dataset_names.contains(ckan_instance, name)
+    if exists is None:
+        # The server has not been indexed yet; ask CKAN directly
+        try:
+            dataset_cache.show(ckan_instance, name)
+            exists = True
+        except NotFound:
+            exists = False
+        except Exception as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    return {"name": name, "exists": exists}
@@ -0,0 +1,106 @@
+# api/routes/search_routes/get_dataset_route.py
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+
+from api.config.ckan_settings import ckan_settings
+from api.services.dataset_services import dataset_etag, etag_matches, get_dataset
+
+router = APIRouter()
+
+
+@router.get(
+    "/dataset/{dataset_id}",
+    response_model=dict,
+    summary="Get a dataset with its ETag",
+    description=(
+        "Return a single CKAN dataset by ID or name.\n\n"
+        "The `ETag` response header identifies the current version of the "
+        "dataset. Send it back in an `If-Match` header on PUT/PATCH to "
+        "update the dataset only if nobody changed it in the meantime, or "
+        "in `If-None-Match` to get a 304 when the dataset is unchanged.\n\n"
+        "### Query Parameter\n"
+        "Use `?server=local` or `?server=pre_ckan` to pick the CKAN instance. "
+        "Defaults to 'local' if not provided.\n"
+    ),
+    responses={
+        200: {"description": "Dataset retrieved successfully"},
+        304: {"description": "Dataset unchanged since the given ETag"},
+        400: {
+            "description": "Bad Request",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Local CKAN is disabled and cannot be used."}
+                }
+            },
+        },
+        404: {
+            "description": "Not Found",
+            "content": {
+                "application/json": {"example": {"detail": "Dataset not found"}}
+            },
+        },
+    },
+)
+async def get_dataset_endpoint(
+    dataset_id: str,
+    response: Response,
+    server: Literal["local", "pre_ckan"] = Query(
+        "local", description="Choose 'local' or 'pre_ckan'. Defaults to 'local'."
+    ),
+    if_none_match: Optional[str] = Header(
+        None, description="Return 304 if the dataset still has this ETag."
+    ),
+):
+    """
+    Retrieve a dataset and expose its version as an ETag.
+
+    Parameters
+    ----------
+    dataset_id : str
+        The ID or name of the dataset.
+    response : Response
+        Used to set the ETag header.
+    server : Literal['local', 'pre_ckan']
+        CKAN instance to use. Defaults to 'local'.
+    if_none_match : Optional[str]
+        ETag of a version the client already has.
+
+    Returns
+    -------
+    dict
+        The CKAN dataset.
+
+    Raises
+    ------
+    HTTPException
+        - 400: if the selected server is disabled
+        - 404: if the dataset does not exist
+    """
+    if server == "local" and not ckan_settings.ckan_local_enabled:
+        raise HTTPException(
+            status_code=400, detail="Local CKAN is disabled and cannot be used."
+        )
+    if server == "pre_ckan" and not ckan_settings.pre_ckan_enabled:
+        raise HTTPException(
+            status_code=400, detail="Pre-CKAN is disabled and cannot be used."
+        )
+    ckan_instance = (
+        ckan_settings.pre_ckan if server == "pre_ckan" else ckan_settings.ckan
+    )
+
+    try:
+        dataset = get_dataset(dataset_id, ckan_instance=ckan_instance)
+    except Exception as exc:
+        error_msg = str(exc)
+        if "not found" in error_msg.lower():
+            raise HTTPException(status_code=404, detail="Dataset not found")
+        raise HTTPException(status_code=400, detail=error_msg)
+
+    etag = dataset_etag(dataset)
+    if etag and if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if etag:
+        response.headers["ETag"] = etag
+    return dataset
@@ -0,0 +1,63 @@
+# api/routes/search_routes/get_healthy_services_route.py
+
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from api.config.health_settings import health_settings
+from api.models import ServiceHealthResponse
+from api.services.service_services import service_health
+
+router = APIRouter()
+
+
+@router.get(
+    "/services/healthy",
+    response_model=List[ServiceHealthResponse],
+    summary="List the registered services that are up",
+    description=(
+        "Returns the services registered in the `services` organization "
+        "whose `health_check_url` answered the last background probe, "
+        "fastest first. Probes run every `SERVICE_HEALTH_INTERVAL_SECONDS`, "
+        "so a service can take that long to appear or disappear; "
+        "`checked_at` tells when each one was last probed."
+    ),
+    responses={
+        503: {
+            "description": "Service health polling is disabled",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Service health polling is disabled."}
+                }
+            },
+        },
+    },
+)
+async def get_healthy_services(
+    server: Optional[Literal["local", "global", "pre_ckan"]] = Query(
+        None, description="Only list services registered in this catalog."
+    ),
+):
+    """
+    Return the live services sorted by latency.
+
+    Parameters
+    ----------
+    server : Optional[str]
+        Catalog to restrict the list to; all catalogs by default.
+
+    Returns
+    -------
+    List[ServiceHealthResponse]
+        Services whose last probe succeeded, fastest first.
+
+    Raises
+    ------
+    HTTPException
+        503 if service health polling is disabled.
+    """
+    if not health_settings.service_health_enabled:
+        raise HTTPException(
+            status_code=503, detail="Service health polling is disabled."
+        )
+    return service_health.healthy(server)
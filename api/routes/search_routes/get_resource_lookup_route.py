@@ -0,0 +1,220 @@
+# api/routes/search_routes/get_resource_lookup_route.py
+
+import asyncio
+from typing import List, Literal
+
+from fastapi import APIRouter, HTTPException, Query
+
+from api.config.cache_settings import cache_settings
+from api.config.ckan_settings import ckan_settings
+from api.models import DataSourceResponse
+from api.services.dataset_services import resource_index
+from api.services.datasource_services.search_datasource import (
+    build_datasource_response,
+)
+
+router = APIRouter()
+
+SERVER_QUERY = Query(
+    "global",
+    description="Choose 'local', 'global' or 'pre_ckan'. Defaults to 'global'.",
+)
+
+LOOKUP_RESPONSES = {
+    400: {
+        "description": "Bad Request",
+        "content": {
+            "application/json": {
+                "example": {"detail": "Pre-CKAN is disabled and cannot be used."}
+            }
+        },
+    },
+    503: {
+        "description": "Index not built yet",
+        "content": {
+            "application/json": {
+                "example": {
+                    "detail": "The resource index of 'global' is not ready yet."
+                }
+            }
+        },
+    },
+}
+
+
+async def indexed_ckan(server: str):
+    """
+    Return the CKAN instance of an indexed server, re-reading datasets
+    changed by recent resource writes first.
+    """
+    if server == "local" and not ckan_settings.ckan_local_enabled:
+        raise HTTPException(
+            status_code=400, detail="Local CKAN is disabled and cannot be used."
+        )
+    if server == "pre_ckan" and not ckan_settings.pre_ckan_enabled:
+        raise HTTPException(
+            status_code=400, detail="Pre-CKAN is disabled and cannot be used."
+        )
+    if server == "local":
+        ckan_instance = ckan_settings.ckan_no_api_key
+    elif server == "global":
+        ckan_instance = ckan_settings.ckan_global
+    else:
+        ckan_instance = ckan_settings.pre_ckan_no_api_key
+
+    if not cache_settings.resource_index_enabled:
+        raise HTTPException(status_code=503, detail="The resource index is disabled.")
+    if resource_index.refreshed_at(ckan_instance) is None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"The resource index of '{server}' is not ready yet.",
+        )
+    if resource_index.has_stale(ckan_instance):
+        await asyncio.to_thread(resource_index.resolve, ckan_instance)
+    return ckan_instance
+
+
+@router.get(
+    "/lookup/url",
+    response_model=List[DataSourceResponse],
+    summary="Find the datasets that register a resource URL",
+    description=(
+        "Return the datasets with a resource at exactly the given URL.\n\n"
+        "Lookups are answered from an in-memory index of the catalog that "
+        "is rebuilt periodically and updated by this API's own writes, so "
+        "changes made directly in CKAN may take until the next refresh to "
+        "show up. Private datasets are not indexed.\n\n"
+        "### Query Parameters\n"
+        "- **url**: The resource URL\n"
+        "- **server**: 'local', 'global' or 'pre_ckan'. Defaults to 'global'.\n"
+    ),
+    responses=LOOKUP_RESPONSES,
+)
+async def lookup_url(
+    url: str = Query(..., description="The resource URL to look up."),
+    server: Literal["local", "global", "pre_ckan"] = SERVER_QUERY,
+):
+    """
+    Find datasets by resource URL.
+
+    Parameters
+    ----------
+    url : str
+        The exact resource URL.
+    server : Literal['local', 'global', 'pre_ckan']
+        CKAN instance to look on. Defaults to 'global'.
+
+    Returns
+    -------
+    List[DataSourceResponse]
+        The datasets with a resource at this URL.
+
+    Raises
+    ------
+    HTTPException
+        - 400: if the selected server is disabled
+        - 503: if the server has not been indexed yet
+    """
+    ckan_instance = await indexed_ckan(server)
+    datasets = resource_index.by_url(ckan_instance, url) or []
+    return [build_datasource_response(dataset) for dataset in datasets]
+
+
+@router.get(
+    "/lookup/kafka",
+    response_model=List[DataSourceResponse],
+    summary="Find the datasets that register a Kafka topic",
+    description=(
+        "Return the datasets whose `host`, `port` and `topic` extras match "
+        "the given Kafka topic.\n\n"
+        "Lookups are answered from the same in-memory index as "
+        "`/lookup/url`.\n\n"
+        "### Query Parameters\n"
+        "- **host**: The Kafka host\n"
+        "- **port**: The Kafka port\n"
+        "- **topic**: The Kafka topic\n"
+        "- **server**: 'local', 'global' or 'pre_ckan'. Defaults to 'global'.\n"
+    ),
+    responses=LOOKUP_RESPONSES,
+)
+async def lookup_kafka(
+    host: str = Query(..., description="The Kafka host."),
+    port: int = Query(..., description="The Kafka port."),
+    topic: str = Query(..., description="The Kafka topic."),
+    server: Literal["local", "global", "pre_ckan"] = SERVER_QUERY,
+):
+    """
+    Find datasets by Kafka host, port and topic.
+
+    Parameters
+    ----------
+    host : str
+        The Kafka host.
+    port : int
+        The Kafka port.
+    topic : str
+        The Kafka topic.
+    server : Literal['local', 'global', 'pre_ckan']
+        CKAN instance to look on. Defaults to 'global'.
+
+    Returns
+    -------
+    List[DataSourceResponse]
+        The datasets registered for this topic.
+
+    Raises
+    ------
+    HTTPException
+        - 400: if the selected server is disabled
+        - 503: if the server has not been indexed yet
+    """
+    ckan_instance = await indexed_ckan(server)
+    datasets = resource_index.by_kafka(ckan_instance, host, port, topic) or []
+    return [build_datasource_response(dataset) for dataset in datasets]
+
+
+@router.get(
+    "/lookup/s3",
+    response_model=List[DataSourceResponse],
+    summary="Find the datasets with S3 resources under a prefix",
+    description=(
+        "Return the datasets with an S3 resource at or below the given "
+        "prefix. The prefix is matched on whole path segments: "
+        "`s3://bucket/climate` matches `s3://bucket/climate/2024/t.nc` but "
+        "not `s3://bucket/climate-old/t.nc`.\n\n"
+        "Lookups are answered from the same in-memory index as "
+        "`/lookup/url`.\n\n"
+        "### Query Parameters\n"
+        "- **prefix**: The S3 URL prefix, e.g. `s3://bucket/folder`\n"
+        "- **server**: 'local', 'global' or 'pre_ckan'. Defaults to 'global'.\n"
+    ),
+    responses=LOOKUP_RESPONSES,
+)
+async def lookup_s3(
+    prefix: str = Query(..., description="The S3 URL prefix to look up."),
+    server: Literal["local", "global", "pre_ckan"] = SERVER_QUERY,
+):
+    """
+    Find datasets by S3 URL prefix.
+
+    Parameters
+    ----------
+    prefix : str
+        The S3 URL prefix, ending on a path segment.
+    server : Literal['local', 'global', 'pre_ckan']
+        CKAN instance to look on. Defaults to 'global'.
+
+    Returns
+    -------
+    List[DataSourceResponse]
+        The datasets with S3 resources under this prefix.
+
+    Raises
+    ------
+    HTTPException
+        - 400: if the selected server is disabled
+        - 503: if the server has not been indexed yet
+    """
+    ckan_instance = await indexed_ckan(server)
+    datasets = resource_index.by_s3_prefix(ckan_instance, prefix) or []
+    return [build_datasource_response(dataset) for dataset in datasets]
@@ -0,0 +1,74 @@
+# api/routes/search_routes/post_datasets_batch_route.py
+
+from fastapi import APIRouter, HTTPException
+
+from api.config.ckan_settings import ckan_settings
+from api.models import DatasetBatchRequest, DatasetBatchResponse
+from api.services import datasource_services
+
+router = APIRouter()
+
+
+@router.post(
+    "/datasets/batch",
+    response_model=DatasetBatchResponse,
+    summary="Fetch many datasets by id or name",
+    description=(
+        "Fetch up to 1000 datasets by id or name in one request.\n\n"
+        "Datasets are resolved with a few batched searches instead of one "
+        "request per dataset, and recently read datasets are served from "
+        "the local cache. Results follow the order of `ids`; ids that do "
+        "not exist yield `null` and are listed in `not_found`.\n\n"
+        "### Example Payload\n"
+        "```json\n"
+        "{\n"
+        '    "ids": ["weather_data", "sensor_stream"],\n'
+        '    "server": "global"\n'
+        "}\n"
+        "```\n"
+    ),
+    responses={
+        400: {
+            "description": "Bad Request",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Pre-CKAN is disabled and cannot be used."}
+                }
+            },
+        },
+    },
+)
+async def get_datasets_batch(data: DatasetBatchRequest) -> DatasetBatchResponse:
+    """
+    Fetch many datasets by id or name, in request order.
+
+    Raises
+    ------
+    HTTPException
+        - 400: if the selected server is disabled or the lookup fails.
+    """
+    if data.server == "local" and not ckan_settings.ckan_local_enabled:
+        raise HTTPException(
+            status_code=400, detail="Local CKAN is disabled and cannot be used."
+        )
+    if data.server == "pre_ckan" and not ckan_settings.pre_ckan_enabled:
+        raise HTTPException(
+            status_code=400, detail="Pre-CKAN is disabled and cannot be used."
+        )
+
+    try:
+        datasets = await datasource_services.get_datasets_batch(
+            ids=data.ids, server=data.server
+        )
+    except Exception as exc:
+        error_text = str(exc)
+        if "No scheme supplied" in error_text:
+            raise HTTPException(
+                status_code=400, detail="Server is not configured or unreachable."
+            )
+        raise HTTPException(status_code=400, detail=error_text)
+
+    return DatasetBatchResponse(
+        datasets=datasets,
+        not_found=[ref for ref, dataset in zip(data.ids, datasets) if dataset is None],
+    )
@@ -2,14 +2,19 @@
 
 from typing import List
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
 
 from api.config.ckan_settings import ckan_settings
 from api.models import DataSourceResponse, SearchRequest
 from api.services import datasource_services
+from api.services.telemetry_services import timed_phase
 
 router = APIRouter()
 
+search_results_adapter = TypeAdapter(List[DataSourceResponse])
+
 
 @router.post(
     "/search",
@@ -31,25 +36,49 @@ router = APIRouter()
         "across all fields\n"
         "- **filter_list**: a list of field filters of the form "
         "`key:value`.\n"
-        "- **timestamp**: a filter on the `timestamp` field of results.\n\n"
+        "- **timestamp**: a filter on the `timestamp` field of results.\n"
+        "- **extras_filters**: filters on dataset extras such as "
+        "`extras.file_type=NetCDF`, or `extras.host=kafka*` for a prefix. "
+        "Values match exactly and case-sensitively, and keys may only "
+        "contain letters, digits, `_`, `.` and `-`. When no other "
+        "dataset-level parameter is given they are answered from an "
+        "in-memory extras index without querying CKAN.\n\n"
         "### Server selection\n"
         "By default, 'server' can be one of `local` or `global`. "
         "Optionally, `pre_ckan` is also supported if enabled.\n\n"
         "### Examples\n"
         "1) Searching by dataset_name and resource_format.\n"
-        "2) Providing multiple comma-separated terms in 'search_term'."
+        "2) Providing multiple comma-separated terms in 'search_term'.\n\n"
+        "### Explain\n"
+        "With `explain=true` the response is an object with the `results` "
+        "and an `explain` section: the Solr `q` and `fq` sent to CKAN, the "
+        "pages and bytes fetched, and how many datasets the resource "
+        "filters and the keyword post-filter dropped. Every response has a "
+        "`Server-Timing` header with the auth, upstream, filter and "
+        "serialize phases."
     ),
     responses={
         200: {
-            "description": "Datasets retrieved successfully",
+            "description": (
+                "Datasets retrieved successfully, with the search explanation "
+                "when `explain=true`"
+            ),
         },
         400: {"description": "Bad Request"},
     },
 )
-async def search_datasource(data: SearchRequest) -> List[DataSourceResponse]:
+async def search_datasource(
+    data: SearchRequest,
+    explain: bool = Query(
+        False, description="Return how the search ran alongside the results."
+    ),
+) -> List[DataSourceResponse]:
     """
     Search by various parameters, including an optional 'pre_ckan' server.
 
+    The results are serialized here rather than by FastAPI so the time it
+    takes shows up as the 'serialize' Server-Timing phase.
+
     Raises
     ------
     HTTPException
@@ -66,8 +95,13 @@ async def search_datasource(data: SearchRequest) -> List[DataSourceResponse]:
         data.resource_format = data.resource_format.lower()
 
     try:
-        results = await datasource_services.search_datasource(**data.model_dump())
-        return results
+        if explain:
+            explanation = {}
+            results = await datasource_services.search_datasource(
+                **data.model_dump(), explain=explanation
+            )
+        else:
+            results = await datasource_services.search_datasource(**data.model_dump())
 
     except Exception as exc:
         error_text = str(exc)
@@ -77,3 +111,19 @@ async def search_datasource(data: SearchRequest) -> List[DataSourceResponse]:
                 status_code=400, detail="Server is not configured or unreachable."
             )
         raise HTTPException(status_code=400, detail=error_text)
+
+    with timed_phase("serialize"):
+        results = search_results_adapter.validate_python(results, from_attributes=True)
+        if explain:
+            return JSONResponse(
+                {
+                    "results": search_results_adapter.dump_python(
+                        results, mode="json", by_alias=True
+                    ),
+                    "explain": explanation,
+                }
+            )
+        return Response(
+            content=search_results_adapter.dump_json(results, by_alias=True),
+            media_type="application/json",
+        )
@@ -6,10 +6,12 @@ from ...config.swagger_settings import swagger_settings
 from .get import router as get_router
 from .get_jupyter import router as get_jupyter_router
 from .kafka_details import router as kafka_router
+from .post_profile import router as profile_router
 
 router = APIRouter()
 
 router.include_router(get_router)
 router.include_router(kafka_router)
+router.include_router(profile_router)
 if swagger_settings.use_jupyterlab:
     router.include_router(get_jupyter_router)
@@ -1,9 +1,21 @@
 # api/routes/status_routes/get.py
 
-from fastapi import APIRouter
+import asyncio
+from typing import Any, Dict, Optional
 
+from fastapi import APIRouter, Depends, Query
+
+from api.config.metrics_settings import metrics_settings
+from api.config.profiler_settings import profiler_settings
 from api.services import status_services
-from api.services.status_services import get_full_metrics
+from api.services.keycloak_services.get_current_user import get_current_user
+from api.services.status_services import get_full_metrics, metrics_sampler
+from api.services.telemetry_services import (
+    loop_monitor,
+    slow_calls,
+    slow_requests,
+    upstream_summary,
+)
 
 router = APIRouter()
 
@@ -12,7 +24,15 @@ router = APIRouter()
     "/",
     response_model=dict,
     summary="Check system status",
-    description=("Check if the CKAN and Keycloak servers are active " "andreachable."),
+    description=(
+        "Check if the CKAN and Keycloak servers are active and reachable.\n\n"
+        "The checks run concurrently in the background every "
+        "`HEALTH_CHECK_INTERVAL_SECONDS`, each bounded by "
+        "`HEALTH_CHECK_TIMEOUT_SECONDS`. This endpoint returns the last "
+        "snapshot, with the latency and age of every check under `checks`.\n\n"
+        "`circuit_breakers` lists the breaker of each CKAN server and "
+        "Keycloak: `open` means calls to it currently fail at once."
+    ),
 )
 async def get_status():
     """
@@ -29,7 +49,9 @@ async def get_status():
         If there is an error connecting to CKAN or Keycloak, an HTTPException
         is raised with a detailed message.
     """
-    return_dict = status_services.get_status()
+    # The first call, before any background round, runs the checks;
+    # keep that wait off the event loop
+    return_dict = await asyncio.to_thread(status_services.get_status)
 
     return return_dict
 
@@ -49,4 +71,146 @@ async def get_metrics():
     dict
         System metrics (IP, CPU, memory, disk) and services status.
     """
-    return get_full_metrics()
+    return await asyncio.to_thread(get_full_metrics)
+
+
+@router.get(
+    "/metrics/history",
+    response_model=dict,
+    summary="Retrieve recent system metrics samples",
+    description=(
+        "Returns the recent series of system metrics samples (CPU, memory, "
+        "disk, network and API process), oldest first. A sample is taken "
+        "every `METRICS_SAMPLE_INTERVAL_SECONDS` and the last "
+        "`METRICS_HISTORY_SIZE` samples are kept in memory."
+    ),
+)
+async def get_metrics_history(
+    limit: Optional[int] = Query(
+        None, ge=1, description="Return only the most recent samples."
+    ),
+):
+    """
+    Endpoint to retrieve the buffered system metrics samples.
+
+    Parameters
+    ----------
+    limit : Optional[int]
+        Maximum number of most recent samples to return.
+
+    Returns
+    -------
+    dict
+        The sampling interval and the samples, oldest first.
+    """
+    return {
+        "interval_seconds": metrics_settings.metrics_sample_interval_seconds,
+        "samples": metrics_sampler.history(limit),
+    }
+
+
+@router.get(
+    "/upstreams",
+    response_model=dict,
+    summary="Retrieve CKAN and Keycloak call statistics",
+    description=(
+        "Returns latency statistics of the calls this API made to CKAN and "
+        "Keycloak, per service, server, action and outcome, and the "
+        "slowest calls of the last `UPSTREAM_SLOW_CALLS_WINDOW_SECONDS` "
+        "with their response size. Percentiles are upper bounds of the "
+        "latency histogram buckets."
+    ),
+)
+async def get_upstreams():
+    """
+    Endpoint to retrieve upstream call statistics.
+
+    Returns
+    -------
+    dict
+        Per-action summary and the slowest recent calls, slowest first.
+    """
+    return {
+        "window_seconds": slow_calls.window,
+        "summary": upstream_summary(),
+        "slowest": slow_calls.slowest(),
+    }
+
+
+@router.get(
+    "/event-loop",
+    response_model=dict,
+    summary="Retrieve event-loop lag and blocking calls",
+    description=(
+        "Returns percentiles of the event-loop scheduling lag over the last "
+        "`LOOP_LAG_HISTORY_SIZE` samples. With "
+        "`LOOP_BLOCKING_CAPTURE_ENABLED=True` it also lists the most recent "
+        "callbacks that blocked the loop longer than "
+        "`LOOP_BLOCKING_THRESHOLD_SECONDS`, with how long they blocked it "
+        "and the stack of the loop thread while it was blocked."
+    ),
+)
+async def get_event_loop():
+    """
+    Endpoint to retrieve event-loop health.
+
+    Returns
+    -------
+    dict
+        Lag percentiles in ms and the captured blocking calls, most recent
+        first.
+    """
+    return {
+        "interval_seconds": metrics_settings.loop_lag_interval_seconds,
+        "lag": loop_monitor.lag_summary(),
+        "blocking_capture_enabled": metrics_settings.loop_blocking_capture_enabled,
+        "blocking_threshold_seconds": loop_monitor.blocking_threshold,
+        "blocking_calls": loop_monitor.blocking_calls(),
+    }
+
+
+@router.get(
+    "/slow-requests",
+    response_model=dict,
+    summary="Retrieve recent slow requests",
+    description=(
+        "Returns the most recent requests that took longer than "
+        "`SLOW_REQUEST_THRESHOLD_SECONDS`, most recent first, out of the "
+        "last `SLOW_REQUEST_HISTORY_SIZE`. Each one has its route, query "
+        "and body parameters (sensitive values redacted), user id, status, "
+        "response size, Server-Timing phases and the time spent in CKAN "
+        "and Keycloak per server and action. The same entries are written "
+        "to `SLOW_REQUEST_LOG_FILE`.\n\n"
+        "Filter with `route` (the route template, e.g. `/search`), "
+        "`user_id` and `min_duration_ms`. Users listed in "
+        "`PROFILER_ADMIN_USERS` see every request; other users only see "
+        "their own, whatever `user_id` they pass."
+    ),
+)
+async def get_slow_requests(
+    route: Optional[str] = Query(None, description="Route template"),
+    user_id: Optional[str] = Query(None, description="Id of the user"),
+    min_duration_ms: float = Query(0, ge=0, description="Minimum duration"),
+    limit: int = Query(50, ge=1, le=1000, description="Maximum entries"),
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """
+    Endpoint to retrieve recent slow requests. The entries hold the
+    parameters users sent, so only admins can read other users' requests.
+
+    Returns
+    -------
+    dict
+        The threshold and the matching slow requests, most recent first.
+    """
+    if user.get("username") not in profiler_settings.profiler_admin_users:
+        user_id = user.get("id")
+    return {
+        "threshold_seconds": slow_requests.threshold,
+        "requests": slow_requests.recent(
+            route=route,
+            user_id=user_id,
+            min_duration_ms=min_duration_ms,
+            limit=limit,
+        ),
+    }
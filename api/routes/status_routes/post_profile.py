@@ -0,0 +1,99 @@
+# api/routes/status_routes/post_profile.py
+
+import asyncio
+from typing import Any, Dict, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from api.config.profiler_settings import profiler_settings
+from api.services.keycloak_services import oauth2_scheme
+from api.services.keycloak_services.get_current_user import get_current_user
+from api.services.telemetry_services import ProfilerBusy, collapsed_text, profiler
+
+router = APIRouter()
+
+
+def get_profiler_admin(token: Optional[str] = Depends(oauth2_scheme)):
+    """
+    Return the current user if the profiler is enabled and the user is one
+    of PROFILER_ADMIN_USERS.
+
+    Raises
+    ------
+    HTTPException
+        404 if the profiler is disabled, 401 if the token is invalid and
+        403 if the user is not a profiler admin.
+    """
+    if not profiler_settings.profiler_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    user = get_current_user(token)
+    if user.get("username") not in profiler_settings.profiler_admin_users:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only profiler admins can run the profiler.",
+        )
+    return user
+
+
+@router.post(
+    "/profile",
+    summary="Profile the running API",
+    description=(
+        "Samples the stacks of every thread of the API for `seconds` and "
+        "returns how often each stack was seen, in the collapsed format "
+        "read by flamegraph.pl and speedscope (`format=collapsed` returns "
+        "the file itself). With `memory=true`, tracemalloc traces "
+        "allocations during the profile and the allocation sites that grew "
+        "most are returned under `memory`.\n\n"
+        "Disabled unless `PROFILER_ENABLED=True`, and limited to the users "
+        "listed in `PROFILER_ADMIN_USERS`. Only one profile runs at a time."
+    ),
+    responses={
+        200: {"description": "The profile"},
+        403: {"description": "The user is not a profiler admin"},
+        404: {"description": "The profiler is disabled"},
+        409: {"description": "Another profile is running"},
+    },
+)
+async def run_profile(
+    seconds: float = Query(
+        10, gt=0, description="How long to sample, at most PROFILER_MAX_SECONDS."
+    ),
+    memory: bool = Query(False, description="Also diff tracemalloc snapshots."),
+    format: Literal["json", "collapsed"] = Query(
+        "json", description="'collapsed' returns a plain-text collapsed-stack file."
+    ),
+    _: Dict[str, Any] = Depends(get_profiler_admin),
+):
+    """
+    Run the sampling profiler in a worker thread, so the event loop keeps
+    serving (and is sampled) meanwhile.
+
+    Returns
+    -------
+    dict or PlainTextResponse
+        The profile, or the collapsed stacks as text.
+
+    Raises
+    ------
+    HTTPException
+        400 if `seconds` exceeds PROFILER_MAX_SECONDS, 409 if a profile is
+        already running.
+    """
+    if seconds > profiler_settings.profiler_max_seconds:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "seconds must be at most "
+                f"{profiler_settings.profiler_max_seconds:g}."
+            ),
+        )
+    try:
+        profile = await asyncio.to_thread(profiler.profile, seconds, memory)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == "collapsed":
+        return PlainTextResponse(collapsed_text(profile))
+    return profile
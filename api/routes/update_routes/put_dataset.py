@@ -1,9 +1,15 @@
 # api/routes/update_routes/put_dataset.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 
 from api.config.ckan_settings import ckan_settings
 from api.models.update_dataset_model import DatasetUpdateRequest
+from api.services.dataset_services.dataset_cache import (
+    PreconditionFailed,
+    dataset_cache,
+)
 from api.services.keycloak_services.get_current_user import get_current_user
 from api.services.url_services.update_dataset import update_dataset
 
@@ -14,16 +20,28 @@ router = APIRouter()
 async def update_dataset_endpoint(
     dataset_id: str,
     data: DatasetUpdateRequest,
+    response: Response,
     server: str = Query("local", enum=["local", "pre_ckan"]),
+    if_match: Optional[str] = Header(None),
     _: dict = Depends(get_current_user),
 ):
     try:
         ckan_instance = (
             ckan_settings.pre_ckan if server == "pre_ckan" else ckan_settings.ckan
         )
-        return await update_dataset(
-            dataset_id=dataset_id, data=data, ckan_instance=ckan_instance
+        result = await update_dataset(
+            dataset_id=dataset_id,
+            data=data,
+            ckan_instance=ckan_instance,
+            if_match=if_match,
         )
+        etag = dataset_cache.etag(ckan_instance, dataset_id)
+        if etag:
+            response.headers["ETag"] = etag
+        return result
+
+    except PreconditionFailed as e:
+        raise HTTPException(status_code=412, detail=str(e))
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
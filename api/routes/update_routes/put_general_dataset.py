@@ -1,12 +1,19 @@
 # api/routes/update_routes/put_general_dataset.py
 
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 
-from api.config import ckan_settings
+from api.config import ckan_settings, coalescing_settings
 from api.models.general_dataset_request_model import GeneralDatasetUpdateRequest
+from api.services.dataset_services.dataset_cache import (
+    PreconditionFailed,
+    dataset_cache,
+)
 from api.services.dataset_services.general_dataset import update_general_dataset
+from api.services.dataset_services.write_coalescer import (
+    coalesce_update_general_dataset,
+)
 from api.services.keycloak_services.get_current_user import get_current_user
 
 router = APIRouter()
@@ -35,6 +42,11 @@ router = APIRouter()
         "### Query Parameter\n"
         "Use `?server=local` or `?server=pre_ckan` to pick the CKAN instance. "
         "Defaults to 'local' if not provided.\n\n"
+        "### Write Coalescing\n"
+        "With `WRITE_COALESCING_ENABLED=true`, requests to the same dataset "
+        "arriving within `WRITE_COALESCING_WINDOW_MS` are merged and sent "
+        "to CKAN as one update. Every caller receives the combined result. "
+        "Requests with `If-Match` are never merged.\n\n"
         "### Example Payload\n"
         "```json\n"
         "{\n"
@@ -77,9 +89,13 @@ router = APIRouter()
 async def update_general_dataset_endpoint(
     dataset_id: str,
     data: GeneralDatasetUpdateRequest,
+    response: Response,
     server: Literal["local", "pre_ckan"] = Query(
         "local", description="Choose 'local' or 'pre_ckan'. Defaults to 'local'."
     ),
+    if_match: Optional[str] = Header(
+        None, description="ETag of the dataset version being updated."
+    ),
     _: Dict[str, Any] = Depends(get_current_user),
 ):
     """
@@ -96,6 +112,10 @@ async def update_general_dataset_endpoint(
         The updated dataset information.
     server : Literal['local', 'pre_ckan']
         CKAN instance to use. Defaults to 'local'.
+    response : Response
+        Used to return the new ETag of the dataset.
+    if_match : Optional[str]
+        ETag of the dataset version the client is updating.
     _ : Dict[str, Any]
         Keycloak user auth (unused).
 
@@ -109,6 +129,7 @@ async def update_general_dataset_endpoint(
     HTTPException
         - 400: for update errors or invalid server config
         - 404: if dataset not found
+        - 412: if If-Match does not match the current version
     """
     try:
         if server == "pre_ckan":
@@ -125,8 +146,7 @@ async def update_general_dataset_endpoint(
         if data.resources:
             resources = [resource.dict() for resource in data.resources]
 
-        updated_id = update_general_dataset(
-            dataset_id=dataset_id,
+        changes = dict(
             name=data.name,
             title=data.title,
             owner_org=data.owner_org,
@@ -138,16 +158,35 @@ async def update_general_dataset_endpoint(
             private=data.private,
             license_id=data.license_id,
             version=data.version,
-            ckan_instance=ckan_instance,
         )
 
+        # Conditional writes are never merged with other requests
+        if coalescing_settings.write_coalescing_enabled and not if_match:
+            updated_id = await coalesce_update_general_dataset(
+                dataset_id, ckan_instance, **changes
+            )
+        else:
+            updated_id = update_general_dataset(
+                dataset_id=dataset_id,
+                ckan_instance=ckan_instance,
+                if_match=if_match,
+                **changes,
+            )
+
         if not updated_id:
             raise HTTPException(status_code=404, detail="Dataset not found")
 
+        etag = dataset_cache.etag(ckan_instance, updated_id)
+        if etag:
+            response.headers["ETag"] = etag
         return {"message": "Dataset updated successfully"}
 
     except HTTPException as he:
         raise he
+    except PreconditionFailed as exc:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+        )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
     except KeyError as exc:
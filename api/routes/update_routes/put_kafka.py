@@ -1,12 +1,16 @@
 # api/routes/update_routes/put_kafka.py
 
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 
 from api.config import ckan_settings
 from api.models.update_kafka_model import KafkaDataSourceUpdateRequest
 from api.services import kafka_services
+from api.services.dataset_services.dataset_cache import (
+    PreconditionFailed,
+    dataset_cache,
+)
 from api.services.keycloak_services.get_current_user import get_current_user
 
 router = APIRouter()
@@ -67,9 +71,13 @@ router = APIRouter()
 async def update_kafka_datasource(
     dataset_id: str,
     data: KafkaDataSourceUpdateRequest,
+    response: Response,
     server: Literal["local", "pre_ckan"] = Query(
         "local", description="Choose 'local' or 'pre_ckan'. Defaults to 'local'."
     ),
+    if_match: Optional[str] = Header(
+        None, description="ETag of the dataset version being updated."
+    ),
     _: Dict[str, Any] = Depends(get_current_user),
 ):
     """
@@ -82,6 +90,7 @@ async def update_kafka_datasource(
     HTTPException
         - 400: for update errors or invalid server config
         - 404: if dataset not found
+        - 412: if If-Match does not match the current version
     """
     try:
         if server == "pre_ckan":
@@ -106,13 +115,21 @@ async def update_kafka_datasource(
             mapping=data.mapping,
             processing=data.processing,
             ckan_instance=ckan_instance,  # Pass the chosen instance
+            if_match=if_match,
         )
         if not updated:
             raise HTTPException(status_code=404, detail="Kafka dataset not found")
+        etag = dataset_cache.etag(ckan_instance, updated)
+        if etag:
+            response.headers["ETag"] = etag
         return {"message": "Kafka dataset updated successfully"}
 
     except HTTPException as he:
         raise he
+    except PreconditionFailed as exc:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+        )
     except Exception as exc:
         error_msg = str(exc)
         if "No scheme supplied" in error_msg:
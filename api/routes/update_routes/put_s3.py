@@ -1,11 +1,15 @@
 # api/routes/update_routes/put_s3.py
 
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 
 from api.config.ckan_settings import ckan_settings
 from api.models.update_s3_model import S3ResourceUpdateRequest
+from api.services.dataset_services.dataset_cache import (
+    PreconditionFailed,
+    dataset_cache,
+)
 from api.services.keycloak_services.get_current_user import get_current_user
 from api.services.s3_services.update_s3 import update_s3
 
@@ -67,9 +71,13 @@ router = APIRouter()
 async def update_s3_resource(
     resource_id: str,
     data: S3ResourceUpdateRequest,
+    response: Response,
     server: Literal["local", "pre_ckan"] = Query(
         "local", description="Choose 'local' or 'pre_ckan'. Defaults to 'local'."
     ),
+    if_match: Optional[str] = Header(
+        None, description="ETag of the dataset version being updated."
+    ),
     _: Dict[str, Any] = Depends(get_current_user),
 ):
     """
@@ -78,7 +86,8 @@ async def update_s3_resource(
     If ?server=pre_ckan is used and pre_ckan is enabled/configured,
     updates the resource in the pre-CKAN instance. Otherwise defaults
     to local CKAN. Returns a 400 error if pre_ckan is disabled or
-    missing a valid scheme.
+    missing a valid scheme. Returns 412 if If-Match names an outdated
+    version of the dataset.
     """
     try:
         # Determine CKAN instance
@@ -100,11 +109,19 @@ async def update_s3_resource(
             notes=data.notes,
             extras=data.extras,
             ckan_instance=ckan_instance,
+            if_match=if_match,
         )
         if not updated_id:
             raise HTTPException(status_code=404, detail="S3 resource not found")
+        etag = dataset_cache.etag(ckan_instance, updated_id)
+        if etag:
+            response.headers["ETag"] = etag
         return {"message": "S3 resource updated successfully"}
 
+    except PreconditionFailed as exc:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+        )
     except Exception as exc:
         error_msg = str(exc)
         if "No scheme supplied" in error_msg:
@@ -1,11 +1,15 @@
 # api/routes/update_routes/put_url.py
 
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 
 from api.config.ckan_settings import ckan_settings
 from api.models.update_url_model import URLUpdateRequest
+from api.services.dataset_services.dataset_cache import (
+    PreconditionFailed,
+    dataset_cache,
+)
 from api.services.keycloak_services.get_current_user import get_current_user
 from api.services.url_services.update_url import update_url
 
@@ -73,9 +77,13 @@ router = APIRouter()
 async def update_url_resource(
     resource_id: str,
     data: URLUpdateRequest,
+    response: Response,
     server: Literal["local", "pre_ckan"] = Query(
         "local", description="Choose 'local' or 'pre_ckan'. Defaults to 'local'."
     ),
+    if_match: Optional[str] = Header(
+        None, description="ETag of the dataset version being updated."
+    ),
     _: Dict[str, Any] = Depends(get_current_user),
 ):
     """
@@ -83,7 +91,8 @@ async def update_url_resource(
 
     If ?server=pre_ckan, uses the pre-CKAN instance if enabled. Otherwise,
     defaults to local CKAN. Returns a 400 error if pre_ckan is disabled
-    or missing a valid scheme.
+    or missing a valid scheme. Returns 412 if If-Match names an outdated
+    version of the dataset.
     """
     try:
         if server == "pre_ckan":
@@ -107,9 +116,17 @@ async def update_url_resource(
             mapping=data.mapping,
             processing=data.processing,
             ckan_instance=ckan_instance,
+            if_match=if_match,
         )
+        etag = dataset_cache.etag(ckan_instance, resource_id)
+        if etag:
+            response.headers["ETag"] = etag
         return {"message": "Resource updated successfully"}
 
+    except PreconditionFailed as exc:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+        )
     except KeyError as e:
         raise HTTPException(status_code=400, detail=f"Reserved key error: {str(e)}")
     except ValueError as e:
@@ -1,6 +1,20 @@
+from .create_package import create_package  # noqa: F401
+from .dataset_cache import (  # noqa: F401
+    PreconditionFailed,
+    dataset_cache,
+    dataset_etag,
+    etag_matches,
+)
 from .delete_dataset import delete_dataset  # noqa: F401
 from .general_dataset import (  # noqa: F401
     create_general_dataset,
     patch_general_dataset,
     update_general_dataset,
 )
+from .get_dataset import get_dataset  # noqa: F401
+from .name_index import dataset_names  # noqa: F401
+from .resource_index import resource_index  # noqa: F401
+from .write_coalescer import (  # noqa: F401
+    coalesce_patch_general_dataset,
+    coalesce_update_general_dataset,
+)
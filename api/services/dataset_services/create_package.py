@@ -0,0 +1,82 @@
+# api/services/dataset_services/create_package.py
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from .dataset_cache import dataset_cache
+from .name_index import dataset_names
+
+logger = logging.getLogger(__name__)
+
+
+def create_package(
+    ckan_instance,
+    dataset_dict: Dict[str, Any],
+    resources: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Create a CKAN package together with its resources in one round trip.
+
+    The resources are embedded in the ``package_create`` payload, so CKAN
+    validates and stores the package and its resources in a single
+    transaction. If CKAN nevertheless reports back fewer resources than
+    were sent, the package is purged so no half-created dataset is left
+    behind.
+
+    Parameters
+    ----------
+    ckan_instance : RemoteCKAN
+        The CKAN instance to create the package on.
+    dataset_dict : Dict[str, Any]
+        The package fields (name, title, owner_org, extras, ...).
+    resources : Optional[List[Dict[str, Any]]]
+        Resources to embed in the package.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The package dictionary returned by CKAN.
+
+    Raises
+    ------
+    Exception
+        If the name is known to be taken, CKAN rejects the package or the
+        resources were not all created.
+    """
+    # Reject known duplicates without a round trip; the wording matches
+    # CKAN's own validation error so routes answer 409 either way.
+    if dataset_names.contains(ckan_instance, dataset_dict.get("name")):
+        raise Exception("That name is already in use.")
+
+    payload = dict(dataset_dict)
+    if resources:
+        payload["resources"] = [dict(resource) for resource in resources]
+
+    package = ckan_instance.action.package_create(**payload)
+
+    expected = len(resources or [])
+    created = package.get("resources")
+    if created is not None and len(created) < expected:
+        rollback_package(ckan_instance, package.get("id"))
+        raise Exception(
+            f"Only {len(created)} of {expected} resources were created; "
+            "the package has been rolled back"
+        )
+
+    # Replaces any cached "not found" for the new name
+    dataset_cache.remember(ckan_instance, package)
+    dataset_names.add(ckan_instance, package.get("name"))
+    return package
+
+
+def rollback_package(ckan_instance, package_id: Optional[str]) -> None:
+    """
+    Purge a partially created package. Failures are logged, not raised,
+    so the original error reaches the caller.
+    """
+    if not package_id:
+        return
+    try:
+        ckan_instance.action.dataset_purge(id=package_id)
+    except Exception as exc:
+        logger.error(f"Failed to roll back package {package_id}: {exc}")
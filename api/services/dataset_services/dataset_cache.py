@@ -0,0 +1,241 @@
+# api/services/dataset_services/dataset_cache.py
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ckanapi import NotFound
+
+from api.config.cache_settings import cache_settings
+
+
+class PreconditionFailed(Exception):
+    """Raised when an If-Match header does not match the stored dataset."""
+
+
+def dataset_etag(dataset: Any) -> Optional[str]:
+    """
+    Return the ETag of a CKAN package, derived from its id and
+    ``metadata_modified`` timestamp, or None if the package has no
+    modification time.
+    """
+    if not isinstance(dataset, dict) or not dataset.get("metadata_modified"):
+        return None
+    version = f"{dataset.get('id')}@{dataset['metadata_modified']}"
+    return '"' + hashlib.sha1(version.encode()).hexdigest() + '"'
+
+
+def etag_matches(header: str, etag: Optional[str]) -> bool:
+    """Check an If-Match / If-None-Match header value against an ETag."""
+    if etag is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class DatasetCache:
+    """
+    Read-through cache of ``package_show`` results, shared by every
+    service that reads a dataset before writing it.
+
+    Entries are keyed by CKAN server and by both the id and the name of
+    the dataset. Found datasets are kept for ``ttl`` seconds and NotFound
+    answers for ``negative_ttl`` seconds. Writes made through this API
+    refresh (``remember``) or drop (``forget``) the affected entries, so
+    the cache only goes stale through changes made directly in CKAN.
+
+    Listeners registered with ``add_listener``, such as the resource
+    index, are told about every dataset the cache stores or drops.
+
+    The cached version also backs If-Match: a write whose ETag names the
+    cached version can skip fetching the dataset altogether.
+
+    Update services build their write on the cached copy, so repeated
+    updates of a hot dataset cost one ``package_show``. A change made by
+    another worker or directly in CKAN within the last ``ttl`` seconds is
+    not in that copy; a full replacement built on it would undo the
+    change. Bounding that window is the job of ``ttl``; clients that need
+    to detect such conflicts send If-Match, which is checked against a
+    fresh ``package_show`` unless it names the cached version.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, negative_ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # (server, ref) -> (stored_at, dataset or NotFound exception)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Objects kept in sync with the datasets this cache learns about
+        self._listeners: List[Any] = []
+
+    @staticmethod
+    def _server(ckan_instance) -> str:
+        return str(getattr(ckan_instance, "address", id(ckan_instance)))
+
+    def _lookup(self, ckan_instance, dataset_id: str) -> Optional[Any]:
+        key = (self._server(ckan_instance), dataset_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            ttl = self.negative_ttl if isinstance(value, NotFound) else self.ttl
+            if time.monotonic() - stored_at > ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: Tuple[str, str], value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, ckan_instance, dataset_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached package, if present and fresh."""
+        value = self._lookup(ckan_instance, dataset_id)
+        if not isinstance(value, dict):
+            return None
+        return copy.deepcopy(value)
+
+    def etag(self, ckan_instance, dataset_id: str) -> Optional[str]:
+        """Return the ETag of the cached package, if any."""
+        return dataset_etag(self.get(ckan_instance, dataset_id))
+
+    def show(
+        self, ckan_instance, dataset_id: str, refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Return a dataset, calling ``package_show`` only on a cache miss.
+
+        Parameters
+        ----------
+        ckan_instance : RemoteCKAN
+            The CKAN server to read from.
+        dataset_id : str
+            The ID or name of the dataset.
+        refresh : bool
+            Skip the cache and fetch the dataset from CKAN.
+
+        Returns
+        -------
+        Dict[str, Any]
+            A copy of the package, safe to modify.
+
+        Raises
+        ------
+        NotFound
+            If CKAN reported, possibly a few seconds ago, that the dataset
+            does not exist.
+        """
+        if not refresh:
+            value = self._lookup(ckan_instance, dataset_id)
+            if isinstance(value, NotFound):
+                self.hits += 1
+                raise NotFound(*value.args)
+            if value is not None:
+                self.hits += 1
+                return copy.deepcopy(value)
+
+        self.misses += 1
+        try:
+            dataset = ckan_instance.action.package_show(id=dataset_id)
+        except NotFound as exc:
+            with self._lock:
+                self._store((self._server(ckan_instance), dataset_id), exc)
+            raise
+
+        self.remember(ckan_instance, dataset)
+        return copy.deepcopy(dataset)
+
+    def remember(self, ckan_instance, dataset: Any) -> None:
+        """Cache a full package returned by CKAN, e.g. after a write."""
+        if not isinstance(dataset, dict) or not dataset.get("id"):
+            return
+        server = self._server(ckan_instance)
+        snapshot = copy.deepcopy(dataset)
+        with self._lock:
+            # Drop the old name of a renamed dataset
+            previous = self._entries.get((server, dataset["id"]))
+            if previous is not None and isinstance(previous[1], dict):
+                self._entries.pop((server, previous[1].get("name")), None)
+            for ref in {dataset["id"], dataset.get("name")} - {None}:
+                self._store((server, ref), snapshot)
+        for listener in self._listeners:
+            listener.dataset_changed(ckan_instance, snapshot)
+
+    def forget(self, ckan_instance, dataset_id: str) -> None:
+        """Drop a dataset whose new state is not known."""
+        server = self._server(ckan_instance)
+        with self._lock:
+            entry = self._entries.pop((server, dataset_id), None)
+            if entry is not None and isinstance(entry[1], dict):
+                for ref in (entry[1].get("id"), entry[1].get("name")):
+                    self._entries.pop((server, ref), None)
+                dataset_id = entry[1].get("id") or dataset_id
+        for listener in self._listeners:
+            listener.dataset_forgotten(ckan_instance, dataset_id)
+
+    def add_listener(self, listener: Any) -> None:
+        """
+        Register an object whose ``dataset_changed(ckan, dataset)`` and
+        ``dataset_forgotten(ckan, dataset_id)`` methods are called when a
+        dataset is cached or dropped.
+        """
+        self._listeners.append(listener)
+
+    def match(
+        self, ckan_instance, dataset_id: str, if_match: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached package when ``if_match`` names its version, so
+        the caller can skip fetching it from CKAN.
+        """
+        if not if_match:
+            return None
+        dataset = self.get(ckan_instance, dataset_id)
+        if dataset is not None and etag_matches(if_match, dataset_etag(dataset)):
+            return dataset
+        return None
+
+    def check(self, dataset: Dict[str, Any], if_match: Optional[str]) -> None:
+        """
+        Verify ``if_match`` against a package freshly fetched from CKAN.
+
+        Raises
+        ------
+        PreconditionFailed
+            If the client's version is not the current one.
+        """
+        if if_match and not etag_matches(if_match, dataset_etag(dataset)):
+            raise PreconditionFailed(
+                "Dataset has been modified since the version given in If-Match "
+                f"(current ETag: {dataset_etag(dataset)})"
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+dataset_cache = DatasetCache(
+    max_entries=cache_settings.dataset_cache_max_entries,
+    ttl=cache_settings.dataset_cache_ttl_seconds,
+    negative_ttl=cache_settings.dataset_cache_negative_ttl_seconds,
+)
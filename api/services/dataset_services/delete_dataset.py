@@ -3,6 +3,9 @@ from ckanapi import NotFound
 
 from api.config.ckan_settings import ckan_settings
 
+from .dataset_cache import dataset_cache
+from .name_index import dataset_names
+
 
 def delete_dataset(
     dataset_name: str = None, resource_id: str = None, ckan_instance=None
@@ -19,18 +22,22 @@ def delete_dataset(
         raise ValueError("Must provide either dataset_name or resource_id.")
 
     try:
-        # Retrieve the dataset to ensure it exists
+        # Retrieve the dataset to ensure it exists and to learn its name
         if dataset_name:
-            dataset = ckan_instance.action.package_show(id=dataset_name)
+            dataset = dataset_cache.show(ckan_instance, dataset_name)
             if resource_id and resource_id != dataset["id"]:
                 raise ValueError(
                     f"Provided resource_id '{resource_id}' does not match "
                     f"the dataset id '{dataset['id']}' for '{dataset_name}'."
                 )
             resource_id = dataset["id"]
+        else:
+            dataset = dataset_cache.show(ckan_instance, resource_id)
 
         # Attempt to delete the dataset using its ID
         ckan_instance.action.dataset_purge(id=resource_id)
+        dataset_cache.forget(ckan_instance, resource_id)
+        dataset_names.discard(ckan_instance, dataset.get("name"))
 
     except NotFound:
         raise Exception(f"Dataset '{dataset_name}' not found.")
@@ -1,9 +1,13 @@
 # api/services/dataset_services/general_dataset.py
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from api.config.ckan_settings import ckan_settings
 
+from .create_package import create_package
+from .dataset_cache import dataset_cache
+from .name_index import dataset_names
+
 RESERVED_KEYS = {
     "name",
     "title",
@@ -22,6 +26,63 @@ RESERVED_KEYS = {
 }
 
 
+def validate_extras(extras: Optional[Dict[str, Any]]) -> None:
+    """
+    Check that extras is a dictionary without reserved keys.
+
+    Raises
+    ------
+    ValueError
+        If extras is not a dictionary.
+    KeyError
+        If extras contains reserved keys.
+    """
+    if extras and not isinstance(extras, dict):
+        raise ValueError("Extras must be a dictionary or None.")
+
+    if extras and RESERVED_KEYS.intersection(extras):
+        raise KeyError(
+            "Extras contain reserved keys: " f"{RESERVED_KEYS.intersection(extras)}"
+        )
+
+
+def merge_dataset_changes(
+    changes: List[Dict[str, Any]], append_resources: bool
+) -> Dict[str, Any]:
+    """
+    Fold several update requests for the same dataset into one.
+
+    Later values win for plain fields, tags and groups, extras are merged
+    in order, and resources are either appended in order (PATCH, so each
+    one is later added or updated by URL or name) or replaced by the last
+    list given (PUT). Fields set to None are treated as not provided.
+
+    Parameters
+    ----------
+    changes : List[Dict[str, Any]]
+        Keyword arguments of the individual update requests, oldest first.
+    append_resources : bool
+        Whether resources accumulate (PATCH) or replace each other (PUT).
+
+    Returns
+    -------
+    Dict[str, Any]
+        The keyword arguments of the combined request.
+    """
+    merged: Dict[str, Any] = {}
+    for change in changes:
+        for key, value in change.items():
+            if value is None:
+                continue
+            if key == "extras":
+                merged.setdefault("extras", {}).update(value)
+            elif key == "resources" and append_resources:
+                merged.setdefault("resources", []).extend(value)
+            else:
+                merged[key] = value
+    return merged
+
+
 def create_general_dataset(
     name: str,
     title: str,
@@ -123,23 +184,13 @@ def create_general_dataset(
     if extras:
         dataset_dict["extras"] = [{"key": k, "value": v} for k, v in extras.items()]
 
-    # Create the CKAN dataset
+    # Create the CKAN dataset and its resources in a single call
     try:
-        dataset = ckan_instance.action.package_create(**dataset_dict)
+        dataset = create_package(ckan_instance, dataset_dict, resources)
         dataset_id = dataset["id"]
     except Exception as exc:
         raise Exception(f"Error creating general dataset: {str(exc)}")
 
-    # Create resources if provided
-    if resources:
-        try:
-            for resource in resources:
-                resource_dict = resource.copy()
-                resource_dict["package_id"] = dataset_id
-                ckan_instance.action.resource_create(**resource_dict)
-        except Exception as exc:
-            raise Exception(f"Error creating dataset resources: {str(exc)}")
-
     return dataset_id
 
 
@@ -157,33 +208,37 @@ def update_general_dataset(
     license_id: Optional[str] = None,
     version: Optional[str] = None,
     ckan_instance=None,
+    if_match: Optional[str] = None,
 ) -> str:
     """
     Update a general dataset in CKAN (full replacement).
 
     For resources, this function REPLACES all existing resources
     with the provided ones (PUT behavior).
+
+    When ``if_match`` is given, the write only goes ahead if it names the
+    current version of the dataset; otherwise PreconditionFailed is raised.
     """
     if ckan_instance is None:
         ckan_instance = ckan_settings.ckan
 
-    # Validate extras
-    if extras and not isinstance(extras, dict):
-        raise ValueError("Extras must be a dictionary or None.")
-
-    if extras and RESERVED_KEYS.intersection(extras):
-        raise KeyError(
-            "Extras contain reserved keys: " f"{RESERVED_KEYS.intersection(extras)}"
-        )
+    validate_extras(extras)
 
-    try:
-        # Fetch the existing dataset
-        dataset = ckan_instance.action.package_show(id=dataset_id)
-    except Exception as exc:
-        raise Exception(f"Error fetching dataset: {str(exc)}")
+    # Reuse the version the client last saw when it is still current
+    dataset = dataset_cache.match(ckan_instance, dataset_id, if_match)
+    if dataset is None:
+        try:
+            # Fetch the existing dataset
+            dataset = dataset_cache.show(
+                ckan_instance, dataset_id, refresh=bool(if_match)
+            )
+        except Exception as exc:
+            raise Exception(f"Error fetching dataset: {str(exc)}")
+        dataset_cache.check(dataset, if_match)
 
     # Update fields with new values or keep existing ones
-    dataset["name"] = name or dataset.get("name")
+    previous_name = dataset.get("name")
+    dataset["name"] = name or previous_name
     dataset["title"] = title or dataset.get("title")
     dataset["owner_org"] = owner_org or dataset.get("owner_org")
 
@@ -218,10 +273,13 @@ def update_general_dataset(
 
     try:
         updated_dataset = ckan_instance.action.package_update(**dataset)
-        return updated_dataset["id"]
     except Exception as exc:
         raise Exception(f"Error updating general dataset: {str(exc)}")
 
+    dataset_cache.remember(ckan_instance, updated_dataset)
+    dataset_names.rename(ckan_instance, previous_name, updated_dataset.get("name"))
+    return updated_dataset["id"]
+
 
 def patch_general_dataset(
     dataset_id: str,
@@ -237,6 +295,7 @@ def patch_general_dataset(
     license_id: Optional[str] = None,
     version: Optional[str] = None,
     ckan_instance=None,
+    if_match: Optional[str] = None,
 ) -> str:
     """
     Partially update a general dataset in CKAN.
@@ -245,6 +304,11 @@ def patch_general_dataset(
     For resources, this function ADDS new resources to existing ones rather
     than replacing them completely.
 
+    Only the fields that differ from the stored dataset are sent to CKAN:
+    package fields through ``package_patch``, changed resources through
+    ``resource_patch`` and new resources through ``resource_create``. A
+    request that changes nothing makes no write at all.
+
     Parameters
     ----------
     dataset_id : str
@@ -274,6 +338,9 @@ def patch_general_dataset(
     ckan_instance : optional
         A CKAN instance to use for dataset patch. If not provided,
         uses the default `ckan_settings.ckan`.
+    if_match : Optional[str]
+        ETag the client expects the dataset to have. When it names the
+        version last seen by this API, the dataset is not fetched again.
 
     Returns
     -------
@@ -286,86 +353,153 @@ def patch_general_dataset(
         If extras is not a dictionary.
     KeyError
         If extras contains reserved keys.
+    PreconditionFailed
+        If ``if_match`` does not match the current dataset version.
     Exception
         For errors during dataset patch.
     """
     if ckan_instance is None:
         ckan_instance = ckan_settings.ckan
 
-    # Validate extras
-    if extras and not isinstance(extras, dict):
-        raise ValueError("Extras must be a dictionary or None.")
-
-    if extras and RESERVED_KEYS.intersection(extras):
-        raise KeyError(
-            "Extras contain reserved keys: " f"{RESERVED_KEYS.intersection(extras)}"
-        )
+    validate_extras(extras)
 
-    try:
-        # Fetch the existing dataset
-        dataset = ckan_instance.action.package_show(id=dataset_id)
-    except Exception as exc:
-        raise Exception(f"Error fetching dataset: {str(exc)}")
+    # Reuse the version the client last saw when it is still current
+    dataset = dataset_cache.match(ckan_instance, dataset_id, if_match)
+    if dataset is None:
+        try:
+            # Fetch the existing dataset
+            dataset = dataset_cache.show(
+                ckan_instance, dataset_id, refresh=bool(if_match)
+            )
+        except Exception as exc:
+            raise Exception(f"Error fetching dataset: {str(exc)}")
+        dataset_cache.check(dataset, if_match)
 
-    # Update fields with new values or keep existing ones
-    if name is not None:
-        dataset["name"] = name
-    if title is not None:
-        dataset["title"] = title
-    if owner_org is not None:
-        dataset["owner_org"] = owner_org
-    if notes is not None:
-        dataset["notes"] = notes
-    if private is not None:
-        dataset["private"] = private
-    if license_id is not None:
-        dataset["license_id"] = license_id
-    if version is not None:
-        dataset["version"] = version
+    # Collect only the package fields whose value actually changes
+    requested = {
+        "name": name,
+        "title": title,
+        "owner_org": owner_org,
+        "notes": notes,
+        "private": private,
+        "license_id": license_id,
+        "version": version,
+    }
+    changes = {
+        key: value
+        for key, value in requested.items()
+        if value is not None and dataset.get(key) != value
+    }
 
     # Handle tags - replace if provided
     if tags is not None:
-        dataset["tags"] = [{"name": tag} for tag in tags]
+        current_tags = [tag.get("name") for tag in dataset.get("tags") or []]
+        if current_tags != tags:
+            changes["tags"] = [{"name": tag} for tag in tags]
 
     # Handle groups - replace if provided
     if groups is not None:
-        dataset["groups"] = [{"name": group} for group in groups]
+        current_groups = [group.get("name") for group in dataset.get("groups") or []]
+        if current_groups != groups:
+            changes["groups"] = [{"name": group} for group in groups]
 
-    # Handle extras - merge with existing if provided
+    # Handle extras - merge with existing if provided. CKAN replaces the
+    # whole extras list, so the merged list is sent when anything changed.
     if extras is not None:
         current_extras = {
-            extra["key"]: extra["value"] for extra in dataset.get("extras", [])
+            extra["key"]: extra["value"] for extra in dataset.get("extras") or []
         }
-        current_extras.update(extras)
-        dataset["extras"] = [{"key": k, "value": v} for k, v in current_extras.items()]
+        merged_extras = {**current_extras, **extras}
+        if merged_extras != current_extras:
+            changes["extras"] = [
+                {"key": k, "value": v} for k, v in merged_extras.items()
+            ]
 
     # Handle resources - ADD new resources to existing ones (PATCH behavior)
-    if resources is not None:
-        existing_resources = dataset.get("resources", [])
+    resource_patches, resource_creates = diff_resources(
+        dataset.get("resources") or [], resources or []
+    )
 
-        # For PATCH operation, we ADD new resources instead of replacing
-        for new_resource in resources:
-            # Check if resource already exists (by URL or name)
-            resource_exists = False
+    package_id = dataset.get("id", dataset_id)
+    try:
+        if changes:
+            patched = ckan_instance.action.package_patch(id=package_id, **changes)
+            dataset_cache.remember(ckan_instance, patched)
+            dataset_names.rename(
+                ckan_instance, dataset.get("name"), patched.get("name")
+            )
+            package_id = patched["id"]
+        for resource_id, resource_changes in resource_patches:
+            ckan_instance.action.resource_patch(id=resource_id, **resource_changes)
+        for new_resource in resource_creates:
+            ckan_instance.action.resource_create(package_id=package_id, **new_resource)
+    except Exception as exc:
+        dataset_cache.forget(ckan_instance, package_id)
+        raise Exception(f"Error updating general dataset: {str(exc)}")
 
-            for i, existing_resource in enumerate(existing_resources):
-                # Update existing resource if same URL or name
-                if new_resource.get("url") == existing_resource.get(
-                    "url"
-                ) or new_resource.get("name") == existing_resource.get("name"):
-                    # Update the existing resource with new data
-                    existing_resources[i].update(new_resource)
-                    resource_exists = True
-                    break
+    # Resource writes bump the package version without returning it
+    if resource_patches or resource_creates:
+        dataset_cache.forget(ckan_instance, package_id)
+    return package_id
 
-            # If resource doesn't exist, add it as new
-            if not resource_exists:
-                existing_resources.append(new_resource)
 
-        dataset["resources"] = existing_resources
+def diff_resources(
+    existing_resources: List[Dict[str, Any]],
+    resources: List[Dict[str, Any]],
+) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    Work out the minimal set of resource changes for a PATCH.
 
-    try:
-        updated_dataset = ckan_instance.action.package_update(**dataset)
-        return updated_dataset["id"]
-    except Exception as exc:
-        raise Exception(f"Error updating general dataset: {str(exc)}")
+    Each requested resource is matched to an existing one by URL first and
+    then by name. Matched resources only carry the fields whose value
+    differs; unmatched ones are created. Fields set to None are treated as
+    not provided.
+
+    Parameters
+    ----------
+    existing_resources : List[Dict[str, Any]]
+        The resources currently attached to the dataset.
+    resources : List[Dict[str, Any]]
+        The resources sent in the PATCH request.
+
+    Returns
+    -------
+    Tuple[List[Tuple[str, Dict[str, Any]]], List[Dict[str, Any]]]
+        The ``(resource_id, changed_fields)`` pairs to patch and the
+        resources to create, in request order.
+    """
+    by_url: Dict[Any, Dict[str, Any]] = {}
+    by_name: Dict[Any, Dict[str, Any]] = {}
+
+    def index(resource: Dict[str, Any]) -> None:
+        if resource.get("url") is not None:
+            by_url.setdefault(resource["url"], resource)
+        if resource.get("name") is not None:
+            by_name.setdefault(resource["name"], resource)
+
+    for existing in existing_resources:
+        index(existing)
+
+    patches: Dict[str, Dict[str, Any]] = {}
+    creates: List[Dict[str, Any]] = []
+
+    for new_resource in resources:
+        fields = {k: v for k, v in new_resource.items() if v is not None}
+        match = by_url.get(fields.get("url")) or by_name.get(fields.get("name"))
+
+        if match is None:
+            # Later entries of the same request may update this one
+            created = dict(fields)
+            creates.append(created)
+            index(created)
+        elif match.get("id") is None:
+            # A resource created earlier in this same request
+            match.update(fields)
+        else:
+            changed = {k: v for k, v in fields.items() if match.get(k) != v}
+            if changed:
+                patches.setdefault(match["id"], {}).update(changed)
+                match.update(changed)
+                index(match)
+
+    return list(patches.items()), creates
@@ -0,0 +1,39 @@
+# api/services/dataset_services/get_dataset.py
+
+from typing import Any, Dict
+
+from api.config.ckan_settings import ckan_settings
+
+from .dataset_cache import dataset_cache
+
+
+def get_dataset(dataset_id: str, ckan_instance=None) -> Dict[str, Any]:
+    """
+    Fetch the current version of a dataset from CKAN and refresh the
+    dataset cache, so that a later write sent with the matching If-Match
+    header does not need to fetch it again.
+
+    Parameters
+    ----------
+    dataset_id : str
+        The ID or name of the dataset.
+    ckan_instance : optional
+        The CKAN instance to read from. Defaults to `ckan_settings.ckan`.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The CKAN package dictionary.
+
+    Raises
+    ------
+    Exception
+        If the dataset cannot be fetched.
+    """
+    if ckan_instance is None:
+        ckan_instance = ckan_settings.ckan
+
+    try:
+        return dataset_cache.show(ckan_instance, dataset_id, refresh=True)
+    except Exception as exc:
+        raise Exception(f"Error fetching dataset: {str(exc)}")
@@ -0,0 +1,194 @@
+# api/services/dataset_services/name_index.py
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set
+
+from api.config.cache_settings import cache_settings
+
+logger = logging.getLogger(__name__)
+
+# Names requested per package_search page while scanning a server
+PAGE_SIZE = 1000
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    ``might_contain`` never returns False for an added item and returns
+    True for an absent item with a probability close to ``error_rate``
+    while no more than ``capacity`` items have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: position_i = h1 + i * h2
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class _ServerNames:
+    def __init__(self, names: Set[str], error_rate: float):
+        # Leave room for names registered before the next refresh
+        self.bloom = BloomFilter(max(len(names) * 2, 1024), error_rate)
+        for name in names:
+            self.bloom.add(name)
+        self.names = names
+        self.refreshed_at = time.time()
+
+
+class DatasetNameIndex:
+    """
+    Names of the datasets that exist on each CKAN server.
+
+    A Bloom filter answers most "is this name free?" questions without
+    touching the exact set; the exact set confirms positives so a false
+    positive never blocks a registration. The index is rebuilt by
+    ``refresh`` and kept current between refreshes by this worker's own
+    creations, renames and deletions, so a hit in the exact set is trusted
+    without asking CKAN. Changes made directly in CKAN or by other workers
+    show up at the next refresh; until then a name freed elsewhere is still
+    reported as taken.
+    """
+
+    def __init__(self, error_rate: float):
+        self.error_rate = error_rate
+        self._servers: Dict[str, _ServerNames] = {}
+        # Changes made while a refresh scan is running, replayed on swap
+        self._pending: Dict[str, Dict[str, bool]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _server(ckan_instance) -> str:
+        return str(getattr(ckan_instance, "address", id(ckan_instance)))
+
+    def refresh(self, ckan_instance) -> int:
+        """
+        Rebuild the index of one server from a full name scan.
+
+        Returns
+        -------
+        int
+            The number of names indexed.
+        """
+        server = self._server(ckan_instance)
+        with self._lock:
+            self._pending[server] = {}
+
+        try:
+            names: Set[str] = set()
+            start = 0
+            while True:
+                page = ckan_instance.action.package_search(
+                    q="*:*",
+                    fl="name",
+                    rows=PAGE_SIZE,
+                    start=start,
+                    sort="name asc",
+                    include_private=True,
+                    include_drafts=True,
+                )
+                results = page.get("results", [])
+                names.update(result["name"] for result in results)
+                start += len(results)
+                if not results or start >= page.get("count", 0):
+                    break
+        except Exception:
+            with self._lock:
+                self._pending.pop(server, None)
+            raise
+
+        with self._lock:
+            for name, exists in self._pending.pop(server, {}).items():
+                if exists:
+                    names.add(name)
+                else:
+                    names.discard(name)
+            self._servers[server] = _ServerNames(names, self.error_rate)
+        logger.info(f"Indexed {len(names)} dataset names from {server}")
+        return len(names)
+
+    def contains(self, ckan_instance, name: Optional[str]) -> Optional[bool]:
+        """
+        Whether a dataset with this name exists, or None if the server
+        has not been indexed yet.
+        """
+        if not name:
+            return None
+        with self._lock:
+            entry = self._servers.get(self._server(ckan_instance))
+        if entry is None:
+            return None
+        if not entry.bloom.might_contain(name):
+            return False
+        return name in entry.names
+
+    def add(self, ckan_instance, name: Optional[str]) -> None:
+        """Record a dataset created through this API."""
+        self._record(ckan_instance, name, True)
+
+    def discard(self, ckan_instance, name: Optional[str]) -> None:
+        """Record a dataset deleted through this API."""
+        self._record(ckan_instance, name, False)
+
+    def rename(
+        self, ckan_instance, old_name: Optional[str], new_name: Optional[str]
+    ) -> None:
+        """Record a dataset renamed through this API."""
+        if old_name != new_name:
+            self.discard(ckan_instance, old_name)
+            self.add(ckan_instance, new_name)
+
+    def _record(self, ckan_instance, name: Optional[str], exists: bool) -> None:
+        if not name:
+            return
+        server = self._server(ckan_instance)
+        with self._lock:
+            if server in self._pending:
+                self._pending[server][name] = exists
+            entry = self._servers.get(server)
+            if entry is None:
+                return
+            if exists:
+                entry.names.add(name)
+                entry.bloom.add(name)
+            else:
+                # A Bloom filter cannot forget; the exact set decides
+                entry.names.discard(name)
+
+    def refreshed_at(self, ckan_instance) -> Optional[float]:
+        """Time of the last successful refresh of a server."""
+        with self._lock:
+            entry = self._servers.get(self._server(ckan_instance))
+        return entry.refreshed_at if entry else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._servers.clear()
+            self._pending.clear()
+
+
+dataset_names = DatasetNameIndex(
+    error_rate=cache_settings.dataset_name_bloom_error_rate
+)
@@ -0,0 +1,356 @@
+# api/services/dataset_services/resource_index.py
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from ckanapi import NotAuthorized, NotFound
+
+from .dataset_cache import dataset_cache
+
+logger = logging.getLogger(__name__)
+
+# Datasets requested per package_search page while scanning a server
+PAGE_SIZE = 1000
+
+# Failed re-reads of a forgotten dataset before it is left to the next refresh
+MAX_RESOLVE_ATTEMPTS = 5
+
+KafkaKey = Tuple[str, str, str]
+# (key, value, is_prefix) filter on dataset extras
+ExtrasFilter = Tuple[str, str, bool]
+
+
+def s3_prefixes(url: str) -> List[str]:
+    """
+    Return every path prefix of an S3 URL, from the bucket down to the
+    full object key, without trailing slashes.
+
+    ``s3://bucket/a/b.nc`` gives ``s3://bucket``, ``s3://bucket/a`` and
+    ``s3://bucket/a/b.nc``.
+    """
+    url = url.strip().rstrip("/")
+    scheme, separator, path = url.partition("://")
+    if not separator:
+        scheme, path = "", url
+    head = scheme + separator
+    prefixes = []
+    for segment in filter(None, path.split("/")):
+        head = f"{head}/{segment}" if prefixes else f"{head}{segment}"
+        prefixes.append(head)
+    return prefixes
+
+
+def _dataset_keys(dataset: Dict[str, Any]) -> Dict[str, Set[Hashable]]:
+    """Extract the lookup keys of every index from a CKAN package."""
+    keys: Dict[str, Set[Hashable]] = {
+        "url": set(),
+        "kafka": set(),
+        "s3": set(),
+        "extras": set(),
+    }
+    for resource in dataset.get("resources") or []:
+        url = resource.get("url")
+        if not url:
+            continue
+        keys["url"].add(url)
+        if (resource.get("format") or "").lower() == "s3" or url.startswith("s3://"):
+            keys["s3"].update(s3_prefixes(url))
+
+    extras = {
+        extra.get("key"): extra.get("value") for extra in dataset.get("extras") or []
+    }
+    keys["extras"].update(
+        (str(key), str(value)) for key, value in extras.items() if key is not None
+    )
+    if extras.get("host") and extras.get("port") and extras.get("topic"):
+        keys["kafka"].add(
+            (str(extras["host"]), str(extras["port"]), str(extras["topic"]))
+        )
+    return keys
+
+
+class _ServerResources:
+    def __init__(self):
+        self.datasets: Dict[str, Dict[str, Any]] = {}
+        self.names: Dict[str, str] = {}
+        self.keys: Dict[str, Dict[str, Set[Hashable]]] = {}
+        self.indexes: Dict[str, Dict[Hashable, Set[str]]] = {
+            "url": defaultdict(set),
+            "kafka": defaultdict(set),
+            "s3": defaultdict(set),
+            "extras": defaultdict(set),
+        }
+        # Extras key -> its indexed values, for prefix filters
+        self.extra_values: Dict[str, Set[str]] = defaultdict(set)
+        self.refreshed_at = time.time()
+
+    def add(self, dataset: Dict[str, Any]) -> None:
+        self.remove(dataset["id"])
+        if dataset.get("private"):
+            # Lookups are anonymous, like search; never index private data
+            return
+        keys = _dataset_keys(dataset)
+        self.datasets[dataset["id"]] = dataset
+        if dataset.get("name"):
+            self.names[dataset["name"]] = dataset["id"]
+        self.keys[dataset["id"]] = keys
+        for index, values in keys.items():
+            for value in values:
+                self.indexes[index][value].add(dataset["id"])
+                if index == "extras":
+                    self.extra_values[value[0]].add(value[1])
+
+    def remove(self, dataset_id: str) -> None:
+        dataset_id = self.names.get(dataset_id, dataset_id)
+        dataset = self.datasets.pop(dataset_id, None)
+        if dataset is not None:
+            self.names.pop(dataset.get("name"), None)
+        for index, values in self.keys.pop(dataset_id, {}).items():
+            for value in values:
+                ids = self.indexes[index].get(value)
+                if ids is not None:
+                    ids.discard(dataset_id)
+                    if not ids:
+                        del self.indexes[index][value]
+                        if index == "extras":
+                            self._drop_extra_value(*value)
+
+    def _drop_extra_value(self, key: str, value: str) -> None:
+        self.extra_values[key].discard(value)
+        if not self.extra_values[key]:
+            del self.extra_values[key]
+
+    def find(self, index: str, value: Hashable) -> List[Dict[str, Any]]:
+        ids = self.indexes[index].get(value, ())
+        return [self.datasets[dataset_id] for dataset_id in sorted(ids)]
+
+    def find_extras(self, filters: List[ExtrasFilter]) -> List[Dict[str, Any]]:
+        matches: Optional[Set[str]] = None
+        for key, value, prefix in filters:
+            if prefix:
+                ids: Set[str] = set()
+                for candidate in self.extra_values.get(key, ()):
+                    if candidate.startswith(value):
+                        ids |= self.indexes["extras"][(key, candidate)]
+            else:
+                ids = self.indexes["extras"].get((key, value), set())
+            matches = set(ids) if matches is None else matches & ids
+            if not matches:
+                return []
+        return [self.datasets[dataset_id] for dataset_id in sorted(matches or ())]
+
+
+class DatasetResourceIndex:
+    """
+    Reverse indexes from what a dataset points at to the dataset.
+
+    For every indexed CKAN server it maps resource URLs, Kafka
+    ``(host, port, topic)`` extras and S3 URL prefixes to the public
+    datasets that use them, so each lookup is a single dictionary access.
+    A secondary index maps every extras key to its values and each value
+    to its datasets, for equality and prefix filters on extras.
+
+    The indexes are rebuilt by ``refresh`` and kept current between
+    refreshes by listening to the dataset cache: packages returned by
+    writes through this API replace their old entry, and datasets the
+    cache forgets (deletions and resource writes whose result is not
+    known) are dropped and re-read from CKAN by ``resolve``. Changes made
+    directly in CKAN show up at the next refresh.
+    """
+
+    def __init__(self):
+        self._servers: Dict[str, _ServerResources] = {}
+        # Changes seen while a refresh scan is running, replayed on swap
+        self._pending: Dict[str, List[Tuple[str, Any]]] = {}
+        # Dataset ids to re-read from CKAN, per server
+        self._stale: Dict[str, Set[str]] = defaultdict(set)
+        # (server, dataset id) -> failed re-reads so far
+        self._attempts: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _server(ckan_instance) -> str:
+        return str(getattr(ckan_instance, "address", id(ckan_instance)))
+
+    def refresh(self, ckan_instance) -> int:
+        """
+        Rebuild the indexes of one server from a full catalog scan.
+
+        Returns
+        -------
+        int
+            The number of datasets indexed.
+        """
+        server = self._server(ckan_instance)
+        with self._lock:
+            self._pending[server] = []
+
+        entry = _ServerResources()
+        try:
+            start = 0
+            while True:
+                page = ckan_instance.action.package_search(
+                    q="*:*", rows=PAGE_SIZE, start=start, sort="id asc"
+                )
+                results = page.get("results", [])
+                for dataset in results:
+                    entry.add(dataset)
+                start += len(results)
+                if not results or start >= page.get("count", 0):
+                    break
+        except Exception:
+            with self._lock:
+                self._pending.pop(server, None)
+            raise
+
+        with self._lock:
+            for action, value in self._pending.pop(server, []):
+                if action == "add":
+                    entry.add(value)
+                else:
+                    entry.remove(value)
+            self._servers[server] = entry
+        logger.info(
+            f"Indexed resources of {len(entry.datasets)} datasets from {server}"
+        )
+        return len(entry.datasets)
+
+    def dataset_changed(self, ckan_instance, dataset: Dict[str, Any]) -> None:
+        """Index the current state of a dataset (dataset cache listener)."""
+        self._apply(self._server(ckan_instance), "add", dataset)
+
+    def dataset_forgotten(self, ckan_instance, dataset_id: str) -> None:
+        """Drop a dataset whose state is unknown (dataset cache listener)."""
+        server = self._server(ckan_instance)
+        self._apply(server, "remove", dataset_id)
+        with self._lock:
+            if server in self._servers:
+                self._stale[server].add(dataset_id)
+
+    def _apply(self, server: str, action: str, value: Any) -> None:
+        with self._lock:
+            if server in self._pending:
+                self._pending[server].append((action, value))
+            entry = self._servers.get(server)
+            if entry is None:
+                return
+            if action == "add":
+                entry.add(value)
+            else:
+                entry.remove(value)
+
+    def resolve(self, ckan_instance) -> int:
+        """
+        Re-read the datasets forgotten since the last call from CKAN.
+
+        A dataset CKAN no longer has, or no longer shows to this client
+        (e.g. a private dataset read with an anonymous client), stays out
+        of the index. One that cannot be read for another reason is tried
+        again on the next call, up to ``MAX_RESOLVE_ATTEMPTS`` times, and
+        then left to the next refresh.
+
+        Returns
+        -------
+        int
+            The number of datasets re-read.
+        """
+        server = self._server(ckan_instance)
+        with self._lock:
+            stale = self._stale.pop(server, set())
+        for dataset_id in stale:
+            try:
+                # The cache hands the package back through dataset_changed
+                dataset_cache.show(ckan_instance, dataset_id, refresh=True)
+            except (NotFound, NotAuthorized):
+                pass
+            except Exception as exc:
+                with self._lock:
+                    attempts = self._attempts.get((server, dataset_id), 0) + 1
+                    if attempts < MAX_RESOLVE_ATTEMPTS:
+                        self._attempts[(server, dataset_id)] = attempts
+                        self._stale[server].add(dataset_id)
+                        logger.warning(
+                            f"Could not re-index dataset {dataset_id}: {exc}"
+                        )
+                        continue
+                logger.error(
+                    f"Giving up re-indexing dataset {dataset_id} after "
+                    f"{attempts} attempts: {exc}"
+                )
+            with self._lock:
+                self._attempts.pop((server, dataset_id), None)
+        return len(stale)
+
+    def has_stale(self, ckan_instance) -> bool:
+        with self._lock:
+            return bool(self._stale.get(self._server(ckan_instance)))
+
+    def _find(
+        self, ckan_instance, index: str, value: Hashable
+    ) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._servers.get(self._server(ckan_instance))
+            if entry is None:
+                return None
+            return entry.find(index, value)
+
+    def by_url(self, ckan_instance, url: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Datasets with a resource at exactly this URL, or None if the
+        server has not been indexed yet.
+        """
+        return self._find(ckan_instance, "url", url)
+
+    def by_kafka(
+        self, ckan_instance, host: str, port: Any, topic: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Datasets registered for a Kafka topic, or None if the server has
+        not been indexed yet.
+        """
+        key: KafkaKey = (str(host), str(port), str(topic))
+        return self._find(ckan_instance, "kafka", key)
+
+    def by_s3_prefix(
+        self, ckan_instance, prefix: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Datasets with an S3 resource under a prefix, or None if the
+        server has not been indexed yet. The prefix must end on a path
+        segment boundary, e.g. ``s3://bucket/folder``.
+        """
+        return self._find(ckan_instance, "s3", prefix.strip().rstrip("/"))
+
+    def by_extras(
+        self, ckan_instance, filters: List[ExtrasFilter]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Datasets whose extras match every ``(key, value, is_prefix)``
+        filter, or None if the server has not been indexed yet. A filter
+        matches the value exactly, or as a prefix when ``is_prefix``.
+        """
+        with self._lock:
+            entry = self._servers.get(self._server(ckan_instance))
+            if entry is None:
+                return None
+            return entry.find_extras(filters)
+
+    def refreshed_at(self, ckan_instance) -> Optional[float]:
+        """Time of the last successful refresh of a server."""
+        with self._lock:
+            entry = self._servers.get(self._server(ckan_instance))
+        return entry.refreshed_at if entry else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._servers.clear()
+            self._pending.clear()
+            self._stale.clear()
+            self._attempts.clear()
+
+
+resource_index = DatasetResourceIndex()
+dataset_cache.add_listener(resource_index)
@@ -0,0 +1,232 @@
+# api/services/dataset_services/write_coalescer.py
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from api.config.coalescing_settings import coalescing_settings
+
+from .dataset_cache import dataset_cache
+from .general_dataset import (
+    merge_dataset_changes,
+    patch_general_dataset,
+    update_general_dataset,
+    validate_extras,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    def __init__(self, ckan_instance, apply: Callable[..., Any], lock_key: Hashable):
+        self.ckan_instance = ckan_instance
+        self.apply = apply
+        self.lock_key = lock_key
+        self.changes: List[Dict[str, Any]] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class WriteCoalescer:
+    """
+    Buffer writes aimed at the same key for a short window and apply them
+    as one combined write.
+
+    Every caller of ``submit`` receives the result (or the error) of the
+    combined write. Batches sharing a ``lock_key`` are applied one after
+    the other, so a batch never reads a dataset another batch is still
+    writing, even when the two batches are different kinds of write.
+    """
+
+    def __init__(self, window: float, max_batch: int):
+        self.window = window
+        self.max_batch = max_batch
+        self._batches: Dict[Hashable, _Batch] = {}
+        self._running: Dict[Hashable, asyncio.Future] = {}
+        self._resolving: Dict[Hashable, asyncio.Future] = {}
+
+    async def submit(
+        self,
+        key: Hashable,
+        ckan_instance,
+        changes: Dict[str, Any],
+        apply: Callable[[Any, List[Dict[str, Any]]], Any],
+        lock_key: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        Queue ``changes`` for ``key`` and wait for the combined write.
+
+        ``apply(ckan_instance, changes_list)`` is run in a worker thread
+        with the changes of every request in the batch, oldest first.
+        The batch waits for any running batch with the same ``lock_key``,
+        which defaults to ``key``.
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = _Batch(ckan_instance, apply, key if lock_key is None else lock_key)
+            self._batches[key] = batch
+            batch.timer = loop.call_later(self.window, self._close, key, batch)
+
+        future = loop.create_future()
+        batch.changes.append(changes)
+        batch.futures.append(future)
+        if len(batch.changes) >= self.max_batch:
+            batch.timer.cancel()
+            self._close(key, batch)
+        return await future
+
+    def _close(self, key: Hashable, batch: _Batch) -> None:
+        if self._batches.get(key) is batch:
+            del self._batches[key]
+        asyncio.ensure_future(self._flush(key, batch))
+
+    async def _flush(self, key: Hashable, batch: _Batch) -> None:
+        previous = self._running.get(batch.lock_key)
+        done = asyncio.get_running_loop().create_future()
+        self._running[batch.lock_key] = done
+        try:
+            if previous is not None:
+                await previous
+            logger.debug(f"Applying {len(batch.changes)} coalesced writes to {key}")
+            result = await asyncio.to_thread(
+                batch.apply, batch.ckan_instance, batch.changes
+            )
+        except Exception as exc:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            done.set_result(None)
+            if self._running.get(batch.lock_key) is done:
+                del self._running[batch.lock_key]
+
+    async def dataset_key(self, ckan_instance, dataset_id: str) -> Tuple[str, str]:
+        """
+        Return ``(server, dataset id)`` for a dataset given by ID or name,
+        so that writes naming the same dataset differently share a key.
+
+        Names are resolved through the dataset cache; concurrent lookups
+        of the same name share one ``package_show``. A dataset that
+        cannot be found keeps the reference it was given.
+        """
+        server = _server(ckan_instance)
+        if _is_uuid(dataset_id):
+            return server, dataset_id
+        cached = dataset_cache.get(ckan_instance, dataset_id)
+        if cached is not None:
+            return server, cached.get("id") or dataset_id
+
+        pending = self._resolving.get((server, dataset_id))
+        if pending is None:
+            pending = asyncio.ensure_future(
+                asyncio.to_thread(dataset_cache.show, ckan_instance, dataset_id)
+            )
+            self._resolving[(server, dataset_id)] = pending
+            pending.add_done_callback(
+                lambda _: self._resolving.pop((server, dataset_id), None)
+            )
+        try:
+            dataset = await asyncio.shield(pending)
+        except Exception:
+            return server, dataset_id
+        return server, dataset.get("id") or dataset_id
+
+
+write_coalescer = WriteCoalescer(
+    window=coalescing_settings.write_coalescing_window_ms / 1000,
+    max_batch=coalescing_settings.write_coalescing_max_batch,
+)
+
+
+def _server(ckan_instance) -> str:
+    return str(getattr(ckan_instance, "address", id(ckan_instance)))
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+async def coalesce_patch_general_dataset(
+    dataset_id: str, ckan_instance, **changes: Any
+) -> str:
+    """
+    Patch a general dataset together with other patches to the same
+    dataset received within the coalescing window.
+
+    Each request is validated on its own, so an invalid request fails
+    alone instead of failing the whole batch.
+
+    Parameters
+    ----------
+    dataset_id : str
+        The ID or name of the dataset to patch.
+    ckan_instance : RemoteCKAN
+        The CKAN instance holding the dataset.
+    **changes
+        The keyword arguments accepted by ``patch_general_dataset``.
+
+    Returns
+    -------
+    str
+        The ID of the patched dataset.
+    """
+    validate_extras(changes.get("extras"))
+
+    def apply(ckan, batch: List[Dict[str, Any]]) -> str:
+        return patch_general_dataset(
+            dataset_id=dataset_id,
+            ckan_instance=ckan,
+            **merge_dataset_changes(batch, append_resources=True),
+        )
+
+    dataset_key = await write_coalescer.dataset_key(ckan_instance, dataset_id)
+    return await write_coalescer.submit(
+        ("patch",) + dataset_key, ckan_instance, changes, apply, lock_key=dataset_key
+    )
+
+
+async def coalesce_update_general_dataset(
+    dataset_id: str, ckan_instance, **changes: Any
+) -> str:
+    """
+    Update (PUT) a general dataset together with other updates to the
+    same dataset received within the coalescing window. The last
+    resource list given replaces the dataset's resources.
+
+    Parameters
+    ----------
+    dataset_id : str
+        The ID or name of the dataset to update.
+    ckan_instance : RemoteCKAN
+        The CKAN instance holding the dataset.
+    **changes
+        The keyword arguments accepted by ``update_general_dataset``.
+
+    Returns
+    -------
+    str
+        The ID of the updated dataset.
+    """
+    validate_extras(changes.get("extras"))
+
+    def apply(ckan, batch: List[Dict[str, Any]]) -> str:
+        return update_general_dataset(
+            dataset_id=dataset_id,
+            ckan_instance=ckan,
+            **merge_dataset_changes(batch, append_resources=False),
+        )
+
+    dataset_key = await write_coalescer.dataset_key(ckan_instance, dataset_id)
+    return await write_coalescer.submit(
+        ("update",) + dataset_key, ckan_instance, changes, apply, lock_key=dataset_key
+    )
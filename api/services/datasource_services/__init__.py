@@ -1,3 +1,5 @@
 from .add_datasource import add_datasource  # noqa: F401
+from .export_catalog import export_catalog  # noqa: F401
+from .get_datasets_batch import get_datasets_batch  # noqa: F401
 from .search_datasets_by_terms import search_datasets_by_terms  # noqa: F401
 from .search_datasource import search_datasource  # noqa: F401
@@ -1,4 +1,5 @@
 from api.config.ckan_settings import ckan_settings
+from api.services.dataset_services.create_package import create_package
 
 # Define a set of reserved keys that should not be used in the extras
 RESERVED_KEYS = {"name", "title", "owner_org", "notes", "id", "resources", "collection"}
@@ -66,19 +67,27 @@ def add_datasource(
 
     ckan = ckan_settings.ckan
 
-    try:
-        # Create the dataset in CKAN with additional extras if provided
-        dataset_dict = {
-            "name": dataset_name,
-            "title": dataset_title,
-            "owner_org": owner_org,
-            "notes": dataset_description,
-        }
+    # Create the dataset in CKAN with additional extras if provided
+    dataset_dict = {
+        "name": dataset_name,
+        "title": dataset_title,
+        "owner_org": owner_org,
+        "notes": dataset_description,
+    }
+
+    if extras:
+        dataset_dict["extras"] = [{"key": k, "value": v} for k, v in extras.items()]
 
-        if extras:
-            dataset_dict["extras"] = [{"key": k, "value": v} for k, v in extras.items()]
+    resource_dict = {
+        "url": resource_url,
+        "name": resource_name,
+        "description": resource_description,
+        "format": resource_format,
+    }
 
-        dataset = ckan.action.package_create(**dataset_dict)
+    try:
+        # Create the dataset and its resource in a single package_create call
+        dataset = create_package(ckan, dataset_dict, [resource_dict])
 
         # Retrieve the dataset ID
         dataset_id = dataset["id"]
@@ -87,20 +96,6 @@ def add_datasource(
         raise Exception(f"Error creating dataset: {str(e)}")
 
     if dataset_id:
-        try:
-            # Create the resource within the newly created dataset
-            ckan.action.resource_create(
-                package_id=dataset_id,
-                url=resource_url,
-                name=resource_name,
-                description=resource_description,
-                format=resource_format,
-            )
-        except Exception as e:
-            # If an error occurs, raise an exception with a detailed error
-            # message
-            raise Exception(f"Error creating resource: {str(e)}")
-
         # If everything goes well, return the dataset ID
         return dataset_id
     else:
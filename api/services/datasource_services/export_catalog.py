@@ -0,0 +1,74 @@
+# api/services/datasource_services/export_catalog.py
+import json
+import os
+from typing import Optional
+
+from api.config.ckan_settings import ckan_settings
+from api.config.job_settings import job_settings
+
+
+def export_catalog(
+    output_path: str,
+    server: str = "global",
+    owner_org: Optional[str] = None,
+    progress=None,
+) -> dict:
+    """
+    Export the datasets of a CKAN catalog to a JSON Lines file.
+
+    Parameters
+    ----------
+    output_path : str
+        Path of the file to write, one dataset per line.
+    server : str
+        The CKAN server to export: 'local', 'global' or 'pre_ckan'.
+    owner_org : Optional[str]
+        Restrict the export to one organization.
+    progress : optional
+        A progress tracker with ``set_total`` and ``advance`` methods,
+        such as a background Job.
+
+    Returns
+    -------
+    dict
+        The path of the export file and the number of datasets written.
+    """
+    if server not in ["local", "global", "pre_ckan"]:
+        raise Exception("Invalid server. Use 'local', 'global', or 'pre_ckan'.")
+
+    if server == "local":
+        ckan = ckan_settings.ckan_no_api_key
+    elif server == "global":
+        ckan = ckan_settings.ckan_global
+    else:  # server == "pre_ckan"
+        ckan = ckan_settings.pre_ckan
+
+    search_params = {"q": "*:*", "sort": "name asc"}
+    if owner_org:
+        search_params["fq"] = f"organization:{owner_org}"
+
+    rows = job_settings.job_page_size
+    start = 0
+    written = 0
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "w") as f:
+        while True:
+            page = ckan.action.package_search(rows=rows, start=start, **search_params)
+            if progress and start == 0:
+                progress.set_total(page.get("count", 0))
+
+            datasets = page.get("results", [])
+            for dataset in datasets:
+                f.write(json.dumps(dataset) + "\n")
+                written += 1
+                if progress:
+                    progress.advance()
+
+            if len(datasets) < rows:
+                break
+            start += len(datasets)
+
+    os.replace(tmp_path, output_path)
+    return {"file": output_path, "datasets": written}
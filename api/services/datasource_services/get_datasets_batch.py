@@ -0,0 +1,95 @@
+# api/services/datasource_services/get_datasets_batch.py
+
+import asyncio
+from typing import Dict, List, Optional
+
+from api.config.ckan_settings import ckan_settings
+from api.models import DataSourceResponse
+from api.services.dataset_services.dataset_cache import dataset_cache
+
+from .search_datasource import build_datasource_response
+
+# Number of ids or names resolved by a single package_search call
+CHUNK_SIZE = 100
+
+
+def _quote(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _search_chunk(ckan, refs: List[str]) -> List[dict]:
+    terms = " OR ".join(_quote(ref) for ref in refs)
+    results = ckan.action.package_search(
+        q="*:*",
+        fq=f"id:({terms}) OR name:({terms})",
+        rows=2 * len(refs),
+    )
+    return results.get("results", [])
+
+
+async def get_datasets_batch(
+    ids: List[str], server: str = "global"
+) -> List[Optional[DataSourceResponse]]:
+    """
+    Fetch many datasets by id or name at once.
+
+    Datasets already in the dataset cache are served locally. The rest
+    are resolved with chunked ``package_search`` calls of the form
+    ``id:(a OR b ...) OR name:(a OR b ...)``, run concurrently.
+
+    Parameters
+    ----------
+    ids : List[str]
+        Dataset ids or names, in the order the results should follow.
+    server : str
+        'local', 'global' or 'pre_ckan'.
+
+    Returns
+    -------
+    List[Optional[DataSourceResponse]]
+        One entry per requested id, in request order, None where the
+        dataset does not exist.
+
+    Raises
+    ------
+    Exception
+        If the server is invalid or a search fails.
+    """
+    if server == "local":
+        ckan = ckan_settings.ckan_no_api_key
+    elif server == "global":
+        ckan = ckan_settings.ckan_global
+    elif server == "pre_ckan":
+        ckan = ckan_settings.pre_ckan_no_api_key
+    else:
+        raise Exception("Invalid server. Use 'local', 'global', or 'pre_ckan'.")
+
+    found: Dict[str, dict] = {}
+    missing: List[str] = []
+    for ref in dict.fromkeys(ids):
+        cached = dataset_cache.get(ckan, ref)
+        # The cache is shared with authenticated reads; never leak a
+        # private dataset through this anonymous lookup.
+        if cached is not None and not cached.get("private"):
+            found[ref] = cached
+        else:
+            missing.append(ref)
+
+    chunks = [missing[i : i + CHUNK_SIZE] for i in range(0, len(missing), CHUNK_SIZE)]
+    try:
+        pages = await asyncio.gather(
+            *(asyncio.to_thread(_search_chunk, ckan, chunk) for chunk in chunks)
+        )
+    except Exception as exc:
+        raise Exception(f"Error fetching datasets: {str(exc)}")
+
+    for page in pages:
+        for dataset in page:
+            dataset_cache.remember(ckan, dataset)
+            found.setdefault(dataset["id"], dataset)
+            found.setdefault(dataset["name"], dataset)
+
+    return [
+        build_datasource_response(found[ref]) if ref in found else None for ref in ids
+    ]
@@ -9,6 +9,7 @@ from fastapi import HTTPException
 
 from api.config.ckan_settings import ckan_settings
 from api.models import DataSourceResponse, Resource
+from api.services.service_services import service_health
 
 
 def escape_solr_special_chars(value: str) -> str:
@@ -106,6 +107,11 @@ async def search_datasets_by_terms(
                         description=dataset.get("notes"),
                         resources=resources_list,
                         extras=extras,
+                        health=(
+                            service_health.health(dataset["id"])
+                            if organization_name == "services"
+                            else None
+                        ),
                     )
                 )
 
@@ -1,11 +1,19 @@
 # api/services/datasource_services/search_datasource.py
+import asyncio
 import json
-from typing import List, Optional
+import re
+from typing import List, Optional, Tuple
 
 from ckanapi import NotFound
 
 from api.config.ckan_settings import ckan_settings
 from api.models import DataSourceResponse, Resource
+from api.services.dataset_services.resource_index import resource_index
+from api.services.service_services import service_health
+from api.services.telemetry_services import timed_phase
+
+# Extras keys end up in a Solr field name, so anything else is rejected
+EXTRAS_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
 
 
 def tstamp_to_query(timestamp):
@@ -47,6 +55,79 @@ def tstamp_to_query(timestamp):
     return (fq, count_max, sort)
 
 
+def parse_extras_filters(extras_filters: List[str]) -> List[Tuple[str, str, bool]]:
+    """
+    Parse ``extras.<key>=<value>`` filters into ``(key, value, is_prefix)``
+    tuples. The ``extras.`` prefix is optional and a value ending in ``*``
+    matches as a prefix. Values match exactly and case-sensitively.
+
+    Raises
+    ------
+    ValueError
+        If a filter has no key or value part, or the key has characters
+        other than letters, digits, '_', '.' and '-'.
+    """
+    filters = []
+    for extras_filter in extras_filters:
+        key, separator, value = extras_filter.partition("=")
+        key = key.strip()
+        if key.startswith("extras."):
+            key = key[len("extras.") :]
+        if not separator or not key:
+            raise ValueError(
+                f"Invalid extras filter '{extras_filter}'. "
+                "Use 'extras.<key>=<value>' or 'extras.<key>=<prefix>*'."
+            )
+        if not EXTRAS_KEY_PATTERN.fullmatch(key):
+            raise ValueError(
+                f"Invalid extras key '{key}'. Keys may only contain letters, "
+                "digits, '_', '.' and '-'."
+            )
+        value = value.strip()
+        prefix = value.endswith("*")
+        filters.append((key, value[:-1] if prefix else value, prefix))
+    return filters
+
+
+def extras_filter_to_fq(key: str, value: str, prefix: bool) -> str:
+    """
+    Translate an extras filter into a Solr filter query on extras_<key>.
+
+    CKAN indexes extras as tokenized text, so the query may match more
+    datasets than the filter; search_datasource re-checks them with
+    ``matches_extras``.
+    """
+    if not EXTRAS_KEY_PATTERN.fullmatch(key):
+        raise ValueError(f"Invalid extras key '{key}'.")
+    if prefix:
+        escaped = "".join(
+            "\\" + char if char in '\\+-&|!(){}[]^"~*?:/ ' else char for char in value
+        )
+        return f"extras_{key}:{escaped}*"
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'extras_{key}:"{escaped}"'
+
+
+def matches_extras(dataset: dict, extras: List[Tuple[str, str, bool]]) -> bool:
+    """
+    Whether the extras of a CKAN package match every ``(key, value,
+    is_prefix)`` filter, exactly and case-sensitively as the extras index
+    does.
+    """
+    values = {
+        extra.get("key"): str(extra.get("value"))
+        for extra in dataset.get("extras") or []
+    }
+    for key, value, prefix in extras:
+        if key not in values:
+            return False
+        if prefix and not values[key].startswith(value):
+            return False
+        if not prefix and values[key] != value:
+            return False
+    return True
+
+
 async def search_datasource(
     dataset_name: Optional[str] = None,
     dataset_title: Optional[str] = None,
@@ -60,7 +141,18 @@ async def search_datasource(
     filter_list: Optional[list[str]] = None,
     timestamp: Optional[str] = None,
     server: Optional[str] = "local",
+    extras_filters: Optional[list[str]] = None,
+    explain: Optional[dict] = None,
 ) -> List[DataSourceResponse]:
+    """
+    Search datasets on a CKAN server and keep the resources matching the
+    resource conditions.
+
+    When ``explain`` is a dict it is filled with how the search ran: the
+    source ('ckan' or 'extras_index'), the Solr q, fq and sort, the pages
+    and bytes fetched, and the datasets dropped by the extras filters, the
+    resource filters and the keyword post-filter.
+    """
     if server not in ["local", "global", "pre_ckan"]:
         raise Exception("Invalid server. Use 'local', 'global', or 'pre_ckan'.")
 
@@ -71,6 +163,42 @@ async def search_datasource(
     else:  # server == "pre_ckan"
         ckan = ckan_settings.pre_ckan
 
+    extras = parse_extras_filters(extras_filters) if extras_filters else []
+
+    # Extras filters alone are answered by the extras index, without CKAN
+    if extras and not any(
+        [
+            filter_list,
+            search_term,
+            dataset_name,
+            dataset_title,
+            owner_org,
+            dataset_description,
+            timestamp,
+        ]
+    ):
+        if resource_index.has_stale(ckan):
+            await asyncio.to_thread(resource_index.resolve, ckan)
+        indexed = resource_index.by_extras(ckan, extras)
+        if indexed is not None:
+            with timed_phase("filter"):
+                results = filter_resources(
+                    indexed,
+                    resource_url,
+                    resource_name,
+                    resource_description,
+                    resource_format,
+                )
+            if explain is not None:
+                explain.update(
+                    source="extras_index",
+                    extras_filters=[list(f) for f in extras],
+                    datasets_fetched=len(indexed),
+                    dropped_by_resource_filters=len(indexed) - len(results),
+                    returned=len(results),
+                )
+            return results
+
     search_params = []
 
     if filter_list:
@@ -88,20 +216,31 @@ async def search_datasource(
         if dataset_description:
             search_params.append(f"notes:{dataset_description}")
 
-    fq_list = []
+    fq_list = [extras_filter_to_fq(*extras_filter) for extras_filter in extras]
 
     query_string = " AND ".join(search_params) if search_params else "*:*"
 
     count_max = None
     sort = None
     if timestamp:
-        (fq_tstamp, count_max, sort) = tstamp_to_query(timestamp)
+        fq_tstamp, count_max, sort = tstamp_to_query(timestamp)
         fq_list.append(fq_tstamp)
 
     rows = 1000
     if count_max and count_max < rows:
         rows = count_max
 
+    if explain is not None:
+        explain.update(
+            source="ckan",
+            q=query_string,
+            fq=list(fq_list),
+            sort=sort,
+            rows=rows,
+            pages_fetched=0,
+            bytes_fetched=0,
+        )
+
     try:
         start = 0
         datasets = None
@@ -115,6 +254,11 @@ async def search_datasource(
             if sort:
                 data_dict["sort"] = sort
             results = ckan.action.package_search(**data_dict)
+            if explain is not None:
+                explain["pages_fetched"] += 1
+                size = getattr(ckan, "last_response_size", None)
+                if isinstance(size, int):
+                    explain["bytes_fetched"] += size
             if results and results["results"]:
                 if datasets:
                     datasets["results"].extend(results["results"])
@@ -128,79 +272,39 @@ async def search_datasource(
             if count_max and start >= count_max:
                 break
 
-        results = []
-
-        for dataset in datasets["results"]:
-            matching_resources = []
-            for resource in dataset.get("resources", []):
-                # Ensure that the resource matches all provided filter
-                # conditions
-                if (
-                    (not resource_url or resource.get("url") == resource_url)
-                    and (not resource_name or resource.get("name") == resource_name)
-                    and (
-                        not resource_description
-                        or resource.get("description") == resource_description
-                    )
-                    and (
-                        not resource_format
-                        or resource.get("format").lower() == resource_format.lower()
-                    )
-                ):
-                    # Add only those resources that match all conditions
-                    matching_resources.append(resource)
-
-            # Include dataset if at least one resource matches all the provided
-            # conditions
-            if matching_resources:
-                resources_list = [
-                    Resource(
-                        id=res["id"],
-                        url=res["url"],
-                        name=res["name"],
-                        description=res.get("description"),
-                        format=res.get("format"),
-                    )
-                    for res in matching_resources
-                ]
+        with timed_phase("filter"):
+            fetched = datasets["results"]
+            if extras:
+                fetched = [d for d in fetched if matches_extras(d, extras)]
+            results = filter_resources(
+                fetched,
+                resource_url,
+                resource_name,
+                resource_description,
+                resource_format,
+            )
+            after_resource_filters = len(results)
 
-                organization_name = (
-                    dataset.get("organization", {}).get("name")
-                    if dataset.get("organization")
-                    else None
-                )
-                extras = {
-                    extra["key"]: extra["value"] for extra in dataset.get("extras", [])
-                }
-
-                # Parse JSON strings for specific extras
-                if "mapping" in extras:
-                    extras["mapping"] = json.loads(extras["mapping"])
-                if "processing" in extras:
-                    extras["processing"] = json.loads(extras["processing"])
-
-                results.append(
-                    DataSourceResponse(
-                        id=dataset["id"],
-                        name=dataset["name"],
-                        title=dataset["title"],
-                        owner_org=organization_name,
-                        description=dataset.get("notes"),
-                        resources=resources_list,
-                        extras=extras,
-                    )
-                )
+            # Apply post-retrieval keyword filtering
+            if search_term:
+                keywords_list = [
+                    keyword.strip().lower() for keyword in search_term.split(",")
+                ]
+                results = [
+                    dataset
+                    for dataset in results
+                    if stream_matches_keywords(dataset, keywords_list)
+                ]
 
-        # Apply post-retrieval keyword filtering
-        if search_term:
-            keywords_list = [
-                keyword.strip().lower() for keyword in search_term.split(",")
-            ]
-            results = [
-                dataset
-                for dataset in results
-                if stream_matches_keywords(dataset, keywords_list)
-            ]
+        if explain is not None:
+            explain.update(
+                total_count=datasets.get("count"),
+                datasets_fetched=len(datasets["results"]),
+                dropped_by_extras_filters=len(datasets["results"]) - len(fetched),
+                dropped_by_resource_filters=len(fetched) - after_resource_filters,
+                dropped_by_keywords=after_resource_filters - len(results),
+                returned=len(results),
+            )
 
         return results
 
@@ -210,6 +314,96 @@ async def search_datasource(
         raise Exception(f"Error searching for datasets: {str(e)}")
 
 
+def filter_resources(
+    datasets: List[dict],
+    resource_url: Optional[str] = None,
+    resource_name: Optional[str] = None,
+    resource_description: Optional[str] = None,
+    resource_format: Optional[str] = None,
+) -> List[DataSourceResponse]:
+    """
+    Keep the resources of each dataset that match every given resource
+    condition, and the datasets left with at least one resource.
+    """
+    results = []
+    for dataset in datasets:
+        matching_resources = []
+        for resource in dataset.get("resources", []):
+            # Ensure that the resource matches all provided filter
+            # conditions
+            if (
+                (not resource_url or resource.get("url") == resource_url)
+                and (not resource_name or resource.get("name") == resource_name)
+                and (
+                    not resource_description
+                    or resource.get("description") == resource_description
+                )
+                and (
+                    not resource_format
+                    or resource.get("format").lower() == resource_format.lower()
+                )
+            ):
+                # Add only those resources that match all conditions
+                matching_resources.append(resource)
+
+        # Include dataset if at least one resource matches all the provided
+        # conditions
+        if matching_resources:
+            results.append(build_datasource_response(dataset, matching_resources))
+    return results
+
+
+def build_datasource_response(
+    dataset: dict, resources: Optional[List[dict]] = None
+) -> DataSourceResponse:
+    """
+    Convert a CKAN package into a DataSourceResponse, keeping only the
+    given resources (all of them by default), decoding the JSON
+    'mapping' and 'processing' extras and adding the cached health of
+    registered services.
+    """
+    if resources is None:
+        resources = dataset.get("resources", [])
+    resources_list = [
+        Resource(
+            id=res["id"],
+            url=res["url"],
+            name=res["name"],
+            description=res.get("description"),
+            format=res.get("format"),
+        )
+        for res in resources
+    ]
+
+    organization_name = (
+        dataset.get("organization", {}).get("name")
+        if dataset.get("organization")
+        else None
+    )
+    extras = {extra["key"]: extra["value"] for extra in dataset.get("extras", [])}
+
+    # Parse JSON strings for specific extras
+    if "mapping" in extras:
+        extras["mapping"] = json.loads(extras["mapping"])
+    if "processing" in extras:
+        extras["processing"] = json.loads(extras["processing"])
+
+    return DataSourceResponse(
+        id=dataset["id"],
+        name=dataset["name"],
+        title=dataset["title"],
+        owner_org=organization_name,
+        description=dataset.get("notes"),
+        resources=resources_list,
+        extras=extras,
+        health=(
+            service_health.health(dataset["id"])
+            if organization_name == "services"
+            else None
+        ),
+    )
+
+
 def stream_matches_keywords(stream, keywords_list):
     """
     Check if the stream's attributes match all of the provided keywords.
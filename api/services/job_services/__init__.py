@@ -0,0 +1,10 @@
+from .job_handlers import (  # noqa: F401
+    CATALOG_EXPORT,
+    ORGANIZATION_DELETION,
+    ORGANIZATION_RETAG,
+    register_job_handlers,
+)
+from .job_manager import Job, JobManager, job_manager  # noqa: F401
+from .progress_stream import QueueProgress, stream_progress  # noqa: F401
+
+register_job_handlers(job_manager)
@@ -0,0 +1,63 @@
+# api/services/job_services/job_handlers.py
+import os
+from typing import List, Optional
+
+from api.config.ckan_settings import ckan_settings
+from api.config.job_settings import job_settings
+from api.services.datasource_services.export_catalog import export_catalog
+from api.services.organization_services.delete_organization import (
+    delete_organization,
+)
+from api.services.organization_services.retag_organization import (
+    retag_organization,
+)
+
+ORGANIZATION_DELETION = "organization_deletion"
+ORGANIZATION_RETAG = "organization_retag"
+CATALOG_EXPORT = "catalog_export"
+
+
+def _ckan_instance(server: str):
+    # Jobs persist the server name, not the client, so resolve it on run
+    if server == "pre_ckan":
+        return ckan_settings.pre_ckan
+    return ckan_settings.ckan
+
+
+def run_organization_deletion(job, organization_name: str, server: str = "local"):
+    delete_organization(
+        organization_name=organization_name,
+        ckan_instance=_ckan_instance(server),
+        progress=job,
+    )
+    return {"message": "Organization deleted successfully"}
+
+
+def run_organization_retag(
+    job,
+    organization_name: str,
+    add_tags: Optional[List[str]] = None,
+    remove_tags: Optional[List[str]] = None,
+    server: str = "local",
+):
+    return retag_organization(
+        organization_name=organization_name,
+        add_tags=add_tags,
+        remove_tags=remove_tags,
+        ckan_instance=_ckan_instance(server),
+        progress=job,
+    )
+
+
+def run_catalog_export(job, server: str = "global", owner_org: Optional[str] = None):
+    output_path = os.path.join(job_settings.job_store_dir, "exports", f"{job.id}.jsonl")
+    return export_catalog(
+        output_path=output_path, server=server, owner_org=owner_org, progress=job
+    )
+
+
+def register_job_handlers(manager) -> None:
+    """Register every long-running catalog operation with a JobManager."""
+    manager.register(ORGANIZATION_DELETION, run_organization_deletion)
+    manager.register(ORGANIZATION_RETAG, run_organization_retag)
+    manager.register(CATALOG_EXPORT, run_catalog_export)
@@ -0,0 +1,493 @@
+# api/services/job_services/job_manager.py
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from api.config.job_settings import job_settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+UNFINISHED_STATES = {QUEUED, RUNNING}
+
+# Minimum number of seconds between two progress writes of the same job
+PERSIST_INTERVAL = 1.0
+
+# A claim lock older than this was left by a crashed process
+CLAIM_LOCK_TIMEOUT = 10.0
+
+
+class Job:
+    """
+    State of a single background job.
+
+    Handlers report progress through ``set_total`` and ``advance``; the
+    manager takes care of status transitions and persistence. ``user_id``
+    is the id of the user who submitted the job.
+    """
+
+    def __init__(
+        self,
+        job_type: str,
+        params: Dict[str, Any],
+        job_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ):
+        self.id = job_id or uuid.uuid4().hex
+        self.type = job_type
+        self.params = params
+        self.user_id = user_id
+        self.status = QUEUED
+        self.total: Optional[int] = None
+        self.succeeded = 0
+        self.failed = 0
+        self.errors: List[str] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._on_change: Optional[Callable[["Job"], None]] = None
+
+    def set_total(self, total: int) -> None:
+        """Record the number of items the job is going to process."""
+        with self._lock:
+            self.total = total
+        self._changed()
+
+    def advance(self, ok: bool = True, error: Optional[str] = None) -> None:
+        """Record one processed item, keeping the first 20 item errors."""
+        with self._lock:
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+                if error and len(self.errors) < 20:
+                    self.errors.append(error)
+        self._changed()
+
+    def _changed(self) -> None:
+        if self._on_change:
+            self._on_change(self)
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Processed items per second since the job started."""
+        if not self.started_at:
+            return None
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        if elapsed <= 0:
+            return None
+        return round(self.processed / elapsed, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "id": self.id,
+                "type": self.type,
+                "params": self.params,
+                "user_id": self.user_id,
+                "status": self.status,
+                "total": self.total,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "processed": self.processed,
+                "throughput": self.throughput,
+                "errors": list(self.errors),
+                "result": self.result,
+                "error": self.error,
+                "attempts": self.attempts,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        job = cls(
+            data["type"],
+            data.get("params") or {},
+            job_id=data["id"],
+            user_id=data.get("user_id"),
+        )
+        job.status = data.get("status", QUEUED)
+        job.total = data.get("total")
+        job.succeeded = data.get("succeeded", 0)
+        job.failed = data.get("failed", 0)
+        job.errors = data.get("errors") or []
+        job.result = data.get("result")
+        job.error = data.get("error")
+        job.attempts = data.get("attempts", 0)
+        job.created_at = data.get("created_at") or time.time()
+        job.started_at = data.get("started_at")
+        job.finished_at = data.get("finished_at")
+        return job
+
+
+class JobManager:
+    """
+    Run registered job types on a bounded thread pool and persist their
+    state as one JSON file per job, so that state survives a restart and
+    is visible to every API worker sharing the store directory.
+
+    A worker only runs a job it holds the lease of: a ``<job id>.lease``
+    file naming the worker and an expiry time, which the worker renews
+    every third of ``lease_seconds`` while the job runs. Leases are
+    granted under a claim lock created with O_EXCL, so two workers never
+    hold the same job. Unfinished jobs whose lease expired, because their
+    worker died, are resumed by the next worker that scans the store.
+    """
+
+    def __init__(
+        self,
+        store_dir: str,
+        max_workers: int,
+        lease_seconds: Optional[float] = None,
+    ):
+        self.store_dir = store_dir
+        self.max_workers = max_workers
+        self.lease_seconds = (
+            job_settings.job_lease_seconds if lease_seconds is None else lease_seconds
+        )
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, Callable[..., Optional[Dict[str, Any]]]] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._last_saved: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._leases: Set[str] = set()
+        self._stop = threading.Event()
+        self._lease_thread: Optional[threading.Thread] = None
+
+    def register(self, job_type: str, handler: Callable[..., Any]) -> None:
+        """
+        Register a handler for a job type. The handler is called as
+        ``handler(job, **params)`` and may return a result dictionary.
+        """
+        self._handlers[job_type] = handler
+
+    def start(self) -> None:
+        """
+        Load persisted jobs, prune old ones, resume unfinished jobs whose
+        lease expired and start renewing leases in the background.
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+        cutoff = time.time() - job_settings.job_retention_hours * 3600
+
+        for job in self._load_all():
+            if job.status in UNFINISHED_STATES:
+                continue
+            if (job.finished_at or job.created_at) < cutoff:
+                self._remove(job)
+            else:
+                self._jobs[job.id] = job
+
+        self._resume_orphans()
+        self._start_lease_thread()
+
+    def shutdown(self) -> None:
+        """
+        Stop accepting work. Running jobs are resumed by a worker once
+        their lease expires.
+        """
+        self._stop.set()
+        if self._lease_thread is not None:
+            self._lease_thread.join(timeout=1)
+            self._lease_thread = None
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(
+        self, job_type: str, user_id: Optional[str] = None, **params: Any
+    ) -> Job:
+        """
+        Create a job of the given type on behalf of ``user_id`` and queue
+        it for execution.
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type '{job_type}'")
+        job = Job(job_type, params, user_id=user_id)
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._claim(job.id)
+        self._enqueue(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Return a job by ID, reading the store when the job was submitted
+        by another worker process.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        return self._load(self._path(job_id))
+
+    def list(
+        self, status: Optional[str] = None, user_id: Optional[str] = None
+    ) -> List[Job]:
+        """
+        Return all known jobs, newest first, optionally by status and by
+        the user who submitted them.
+        """
+        jobs = {job.id: job for job in self._load_all()}
+        jobs.update(self._jobs)
+        result = [
+            job
+            for job in jobs.values()
+            if (not status or job.status == status)
+            and (user_id is None or job.user_id == user_id)
+        ]
+        return sorted(result, key=lambda job: job.created_at, reverse=True)
+
+    def _resume_orphans(self) -> None:
+        """Claim and resume unfinished jobs that no live worker holds."""
+        for job in self._load_all():
+            if job.status not in UNFINISHED_STATES or job.id in self._leases:
+                continue
+            if not self._claim(job.id):
+                continue
+
+            if job.type not in self._handlers:
+                job.status = FAILED
+                job.error = f"Unknown job type '{job.type}'"
+                job.finished_at = time.time()
+                self._jobs[job.id] = job
+                self._save(job)
+                self._release(job.id)
+                continue
+
+            logger.info(f"Resuming job {job.id} ({job.type})")
+            job.status = QUEUED
+            self._enqueue(job)
+
+    def _lease_path(self, job_id: str) -> str:
+        return os.path.join(self.store_dir, f"{os.path.basename(job_id)}.lease")
+
+    def _read_lease(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._lease_path(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_lease(self, job_id: str) -> None:
+        path = self._lease_path(job_id)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "owner": self.owner,
+                    "pid": os.getpid(),
+                    "expires_at": time.time() + self.lease_seconds,
+                },
+                f,
+            )
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def _claim_lock(self) -> Iterator[bool]:
+        """
+        Hold the store-wide claim lock, yielding False if another worker
+        holds it. A lock left by a crashed worker is broken after
+        CLAIM_LOCK_TIMEOUT seconds.
+        """
+        path = os.path.join(self.store_dir, ".claim.lock")
+        deadline = time.monotonic() + CLAIM_LOCK_TIMEOUT
+        while True:
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(path) > CLAIM_LOCK_TIMEOUT:
+                        os.remove(path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    yield False
+                    return
+                time.sleep(0.01)
+        try:
+            os.write(fd, self.owner.encode())
+            os.close(fd)
+            yield True
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _claim(self, job_id: str) -> bool:
+        """Take the lease of a job unless another worker holds a live one."""
+        with self._claim_lock() as locked:
+            if not locked:
+                return False
+            lease = self._read_lease(job_id)
+            if (
+                lease is not None
+                and lease.get("owner") != self.owner
+                and lease.get("expires_at", 0) > time.time()
+            ):
+                return False
+            try:
+                self._write_lease(job_id)
+            except OSError as exc:
+                logger.error(f"Could not claim job {job_id}: {exc}")
+                return False
+        with self._lock:
+            self._leases.add(job_id)
+        return True
+
+    def _release(self, job_id: str) -> None:
+        with self._lock:
+            self._leases.discard(job_id)
+        lease = self._read_lease(job_id)
+        if lease is not None and lease.get("owner") == self.owner:
+            try:
+                os.remove(self._lease_path(job_id))
+            except OSError:
+                pass
+
+    def _renew_leases(self) -> None:
+        with self._lock:
+            held = list(self._leases)
+        for job_id in held:
+            lease = self._read_lease(job_id)
+            if lease is not None and lease.get("owner") != self.owner:
+                logger.warning(f"Lost the lease of job {job_id} to {lease['owner']}")
+                with self._lock:
+                    self._leases.discard(job_id)
+                continue
+            try:
+                self._write_lease(job_id)
+            except OSError as exc:
+                logger.error(f"Could not renew the lease of job {job_id}: {exc}")
+
+    def _start_lease_thread(self) -> None:
+        if self._lease_thread is not None and self._lease_thread.is_alive():
+            return
+        self._stop.clear()
+        self._lease_thread = threading.Thread(
+            target=self._maintain_leases, name="job-leases", daemon=True
+        )
+        self._lease_thread.start()
+
+    def _maintain_leases(self) -> None:
+        while not self._stop.wait(self.lease_seconds / 3):
+            self._renew_leases()
+            self._resume_orphans()
+
+    def _enqueue(self, job: Job) -> None:
+        job._on_change = self._persist
+        with self._lock:
+            self._jobs[job.id] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="job"
+                )
+            executor = self._executor
+        self._save(job)
+        executor.submit(self._run, job)
+
+    def _run(self, job: Job) -> None:
+        handler = self._handlers[job.type]
+        # Progress counts describe the current attempt; a resumed job
+        # starts counting again from zero.
+        job.status = RUNNING
+        job.attempts += 1
+        job.total = None
+        job.succeeded = 0
+        job.failed = 0
+        job.errors = []
+        job.error = None
+        job.started_at = time.time()
+        job.finished_at = None
+        self._save(job)
+
+        try:
+            job.result = handler(job, **job.params)
+            job.status = COMPLETED
+        except Exception as exc:
+            logger.error(f"Job {job.id} ({job.type}) failed: {exc}")
+            job.error = str(exc)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            self._save(job)
+            self._release(job.id)
+
+    def _persist(self, job: Job) -> None:
+        # Progress updates are throttled; status changes always go through
+        # _save directly.
+        now = time.time()
+        if now - self._last_saved.get(job.id, 0) >= PERSIST_INTERVAL:
+            self._save(job)
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.store_dir, f"{os.path.basename(job_id)}.json")
+
+    def _save(self, job: Job) -> None:
+        self._last_saved[job.id] = time.time()
+        path = self._path(job.id)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(job.to_dict(), f)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.error(f"Could not persist job {job.id}: {exc}")
+
+    def _load(self, path: str) -> Optional[Job]:
+        try:
+            with open(path) as f:
+                return Job.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _load_all(self) -> List[Job]:
+        if not os.path.isdir(self.store_dir):
+            return []
+        jobs = []
+        for name in os.listdir(self.store_dir):
+            if name.endswith(".json"):
+                job = self._load(os.path.join(self.store_dir, name))
+                if job is not None:
+                    jobs.append(job)
+        return jobs
+
+    def _remove(self, job: Job) -> None:
+        # Drop the job file, its lease and any file the job produced
+        paths = [self._path(job.id), self._lease_path(job.id)]
+        if job.result and job.result.get("file"):
+            paths.append(job.result["file"])
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+job_manager = JobManager(
+    store_dir=job_settings.job_store_dir, max_workers=job_settings.job_workers
+)
@@ -0,0 +1,78 @@
+# api/services/job_services/progress_stream.py
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+# Minimum number of seconds between two progress events
+EVENT_INTERVAL = 0.25
+
+
+class QueueProgress:
+    """Progress tracker that publishes throttled events to a queue."""
+
+    def __init__(self, events: "queue.Queue[dict]"):
+        self.events = events
+        self.total: Optional[int] = None
+        self.succeeded = 0
+        self.failed = 0
+        self._last_event = 0.0
+        self._lock = threading.Lock()
+
+    def set_total(self, total: int) -> None:
+        with self._lock:
+            self.total = total
+            self._publish(force=True)
+
+    def advance(self, ok: bool = True, error: Optional[str] = None) -> None:
+        with self._lock:
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            self._publish(force=not ok)
+
+    def snapshot(self) -> dict:
+        return {
+            "event": "progress",
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "processed": self.succeeded + self.failed,
+        }
+
+    def _publish(self, force: bool = False) -> None:
+        now = time.time()
+        if force or now - self._last_event >= EVENT_INTERVAL:
+            self._last_event = now
+            self.events.put(self.snapshot())
+
+
+def stream_progress(func: Callable[..., Any], **kwargs: Any) -> Iterator[str]:
+    """
+    Run ``func(progress=..., **kwargs)`` in a thread and yield its progress
+    as JSON lines, ending with a 'done' or 'error' event.
+    """
+    events: "queue.Queue[dict]" = queue.Queue()
+    progress = QueueProgress(events)
+    finished = object()
+
+    def run() -> None:
+        try:
+            result = func(progress=progress, **kwargs)
+            events.put(progress.snapshot())
+            events.put({"event": "done", "result": result})
+        except Exception as exc:
+            events.put(progress.snapshot())
+            events.put({"event": "error", "detail": str(exc)})
+        finally:
+            events.put(finished)
+
+    threading.Thread(target=run, daemon=True).start()
+
+    while True:
+        event = events.get()
+        if event is finished:
+            break
+        yield json.dumps(event) + "\n"
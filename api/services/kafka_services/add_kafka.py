@@ -3,6 +3,7 @@ import json
 from typing import Optional
 
 from api.config.ckan_settings import ckan_settings
+from api.services.dataset_services.create_package import create_package
 
 RESERVED_KEYS = {
     "name",
@@ -109,32 +110,29 @@ def add_kafka(
     if ckan_instance is None:
         ckan_instance = ckan_settings.ckan
 
-    # Create the CKAN dataset
+    dataset_dict = {
+        "name": dataset_name,
+        "title": dataset_title,
+        "owner_org": owner_org,
+        "notes": dataset_description,
+        "extras": [{"key": k, "value": v} for k, v in extras_cleaned.items()],
+    }
+
+    # Describe the Kafka resource so it is created along with the dataset
+    resource_dict = {
+        "name": kafka_topic,
+        "description": (
+            f"Kafka topic {kafka_topic} " f"hosted at {kafka_host}:{kafka_port}"
+        ),
+        "format": "kafka",
+    }
+
+    # Create the CKAN dataset and its resource in a single call
     try:
-        dataset_dict = {
-            "name": dataset_name,
-            "title": dataset_title,
-            "owner_org": owner_org,
-            "notes": dataset_description,
-            "extras": [{"key": k, "value": v} for k, v in extras_cleaned.items()],
-        }
-        dataset = ckan_instance.action.package_create(**dataset_dict)
+        dataset = create_package(ckan_instance, dataset_dict, [resource_dict])
         dataset_id = dataset["id"]
 
     except Exception as exc:
         raise Exception(f"Error creating Kafka dataset: {str(exc)}")
 
-    # Create a Kafka resource within that dataset
-    try:
-        ckan_instance.action.resource_create(
-            package_id=dataset_id,
-            name=kafka_topic,
-            description=(
-                f"Kafka topic {kafka_topic} " f"hosted at {kafka_host}:{kafka_port}"
-            ),
-            format="kafka",
-        )
-    except Exception as exc:
-        raise Exception(f"Error creating Kafka resource: {str(exc)}")
-
     return dataset_id
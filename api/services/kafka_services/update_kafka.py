@@ -4,6 +4,8 @@ import json
 from typing import Optional
 
 from api.config.ckan_settings import ckan_settings
+from api.services.dataset_services.dataset_cache import dataset_cache
+from api.services.dataset_services.name_index import dataset_names
 
 RESERVED_KEYS = {
     "name",
@@ -34,22 +36,31 @@ def update_kafka(
     mapping: Optional[dict] = None,
     processing: Optional[dict] = None,
     ckan_instance=None,  # new optional param
+    if_match: Optional[str] = None,
 ):
     """
     Update a Kafka dataset on CKAN, supporting a custom ckan_instance.
     If ckan_instance is None, defaults to ckan_settings.ckan.
+    If if_match is given, it must name the current dataset version.
     """
     if ckan_instance is None:
         ckan_instance = ckan_settings.ckan
 
-    try:
-        # Fetch the existing dataset
-        dataset = ckan_instance.action.package_show(id=dataset_id)
-    except Exception as e:
-        raise Exception(f"Error fetching Kafka dataset: {str(e)}")
+    # Reuse the version the client last saw when it is still current
+    dataset = dataset_cache.match(ckan_instance, dataset_id, if_match)
+    if dataset is None:
+        try:
+            # Fetch the existing dataset
+            dataset = dataset_cache.show(
+                ckan_instance, dataset_id, refresh=bool(if_match)
+            )
+        except Exception as e:
+            raise Exception(f"Error fetching Kafka dataset: {str(e)}")
+        dataset_cache.check(dataset, if_match)
 
     # Preserve all existing fields unless new values are provided
-    dataset["name"] = dataset_name or dataset.get("name")
+    previous_name = dataset.get("name")
+    dataset["name"] = dataset_name or previous_name
     dataset["title"] = dataset_title or dataset.get("title")
     dataset["owner_org"] = owner_org or dataset.get("owner_org")
     dataset["notes"] = dataset_description or dataset.get("notes")
@@ -84,4 +95,6 @@ def update_kafka(
     except Exception as e:
         raise Exception(f"Error updating Kafka dataset: {str(e)}")
 
+    dataset_cache.remember(ckan_instance, updated_dataset)
+    dataset_names.rename(ckan_instance, previous_name, updated_dataset.get("name"))
     return updated_dataset["id"]
@@ -4,6 +4,7 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 
 from ...config.keycloak_settings import keycloak_settings
+from ..telemetry_services import set_request_user, timed_phase
 from . import oauth2_scheme
 from .get_user_info_from_test import get_user_info_from_test
 from .get_user_info_from_token import get_user_info_from_token
@@ -26,16 +27,17 @@ def get_current_user(token: Optional[str] = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    if token == keycloak_settings.test_username:
-        user = get_user_info_from_test()
-    else:
-        try:
-            # Get the user information using the provided token
-            user = get_user_info_from_token(token)
-        except Exception:
-            # Raise the credentials exception if an error occurs while
-            # getting the user information
-            raise credentials_exception
+    with timed_phase("auth"):
+        if token == keycloak_settings.test_username:
+            user = get_user_info_from_test()
+        else:
+            try:
+                # Get the user information using the provided token
+                user = get_user_info_from_token(token)
+            except Exception:
+                # Raise the credentials exception if an error occurs while
+                # getting the user information
+                raise credentials_exception
 
     # Check if the user information contains an error
     if "error" in user:
@@ -52,4 +54,5 @@ def get_current_user(token: Optional[str] = Depends(oauth2_scheme)):
             )
     else:
         # Return the user details if there are no errors
+        set_request_user(user.get("id"))
         return user
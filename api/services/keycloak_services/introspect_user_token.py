@@ -1,6 +1,7 @@
 import requests
 
-from api.config import keycloak_settings
+from api.config import keycloak_settings, upstream_settings
+from api.services.telemetry_services import retry_read, upstream_call
 
 
 def get_client_token():
@@ -14,9 +15,20 @@ def get_client_token():
         "client_secret": keycloak_settings.client_secret,
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    response = requests.post(url, data=data, headers=headers)
-    response.raise_for_status()
-    return response.json()["access_token"]
+
+    def post():
+        with upstream_call("keycloak", "keycloak", "client_token") as call:
+            response = requests.post(
+                url,
+                data=data,
+                headers=headers,
+                timeout=upstream_settings.upstream_timeout_seconds,
+            )
+            call.response(response)
+        response.raise_for_status()
+        return response
+
+    return retry_read(post).json()["access_token"]
 
 
 def introspect_user_token(user_token):
@@ -37,6 +49,17 @@ def introspect_user_token(user_token):
         "Authorization": f"Bearer {client_token}",  # Use the client token here
         "Content-Type": "application/x-www-form-urlencoded",
     }
-    response = requests.post(introspection_url, data=data, headers=headers)
-    response.raise_for_status()
-    return response.json()
+
+    def post():
+        with upstream_call("keycloak", "keycloak", "introspect") as call:
+            response = requests.post(
+                introspection_url,
+                data=data,
+                headers=headers,
+                timeout=upstream_settings.upstream_timeout_seconds,
+            )
+            call.response(response)
+        response.raise_for_status()
+        return response
+
+    return retry_read(post).json()
@@ -2,7 +2,8 @@ import logging
 
 import requests
 
-from api.config import keycloak_settings
+from api.config import keycloak_settings, upstream_settings
+from api.services.telemetry_services import upstream_call
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +22,15 @@ def get_user_token(username, password):
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-    response = requests.post(url, data=data, headers=headers)
-    logger.info(response.text)
+    with upstream_call("keycloak", "keycloak", "user_token") as call:
+        response = requests.post(
+            url,
+            data=data,
+            headers=headers,
+            timeout=upstream_settings.upstream_timeout_seconds,
+        )
+        call.response(response)
+    logger.debug("Keycloak token request returned %s", response.status_code)
 
     response.raise_for_status()
     return response.json()["access_token"]
@@ -4,3 +4,4 @@ from .delete_organization_and_datasets import (  # noqa: F401
     delete_organization_and_datasets,
 )
 from .list_organization import list_organization  # noqa: F401
+from .retag_organization import retag_organization  # noqa: F401
@@ -3,13 +3,23 @@ from ckanapi import NotFound
 
 from api.config.ckan_settings import ckan_settings
 
+from .purge_organization_datasets import purge_organization_datasets
+
 
 def delete_organization(
-    organization_name: str, ckan_instance=None  # new optional parameter
+    organization_name: str,
+    ckan_instance=None,  # new optional parameter
+    progress=None,
 ):
     """
     Delete an organization from CKAN by its name, optionally using a
     custom ckan_instance. Defaults to ckan_settings.ckan if none is provided.
+
+    All datasets of the organization are purged concurrently, page by
+    page; the organization itself is only deleted and purged once it is
+    verified to be empty. If a progress tracker (an object with
+    ``set_total`` and ``advance`` methods, such as a background Job) is
+    given, it is updated as each dataset is purged.
     """
     if ckan_instance is None:
         ckan_instance = ckan_settings.ckan
@@ -19,12 +29,10 @@ def delete_organization(
         organization = ckan_instance.action.organization_show(id=organization_name)
         organization_id = organization["id"]
 
-        # Delete all datasets associated with the organization
-        datasets = ckan_instance.action.package_search(
-            fq=f"owner_org:{organization_id}", rows=1000
+        # Purge all datasets associated with the organization
+        purge_organization_datasets(
+            ckan_instance, organization_id, action="dataset_purge", progress=progress
         )
-        for dataset in datasets["results"]:
-            ckan_instance.action.dataset_purge(id=dataset["id"])
 
         # Delete the organization
         ckan_instance.action.organization_delete(id=organization_id)
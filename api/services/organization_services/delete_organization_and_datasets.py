@@ -2,15 +2,22 @@ from ckanapi import NotFound, ValidationError
 
 from api.config.ckan_settings import ckan_settings
 
+from .purge_organization_datasets import purge_organization_datasets
 
-def delete_organization_and_datasets(organization_id: str) -> str:
+
+def delete_organization_and_datasets(organization_id: str, progress=None) -> str:
     """
     Delete an organization and all its datasets in CKAN.
 
+    Datasets are deleted concurrently, page by page, and the organization
+    is only deleted once it is verified to be empty.
+
     Parameters
     ----------
     organization_id : str
         The ID of the organization to delete.
+    progress : optional
+        A progress tracker with ``set_total`` and ``advance`` methods.
 
     Returns
     -------
@@ -25,14 +32,10 @@ def delete_organization_and_datasets(organization_id: str) -> str:
     ckan = ckan_settings.ckan
 
     try:
-        # Get all datasets for the organization
-        datasets = ckan.action.package_search(
-            fq=f"owner_org:{organization_id}", rows=1000
-        )
-
         # Delete all datasets associated with the organization
-        for dataset in datasets["results"]:
-            ckan.action.package_delete(id=dataset["id"])
+        purge_organization_datasets(
+            ckan, organization_id, action="package_delete", progress=progress
+        )
 
         # Delete the organization
         ckan.action.organization_delete(id=organization_id)
@@ -0,0 +1,129 @@
+# api/services/organization_services/purge_organization_datasets.py
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from api.config.job_settings import job_settings
+from api.services.dataset_services.dataset_cache import dataset_cache
+from api.services.dataset_services.name_index import dataset_names
+
+logger = logging.getLogger(__name__)
+
+# Number of list-and-purge passes before giving up on emptying the org
+MAX_PASSES = 3
+
+
+def _search_params(organization_id: str) -> dict:
+    return {
+        "fq": f"owner_org:{organization_id}",
+        "include_private": True,
+        "include_drafts": True,
+    }
+
+
+def list_organization_datasets(
+    ckan_instance, organization_id: str
+) -> List[Dict[str, Any]]:
+    """Page through package_search and return every dataset of an org."""
+    rows = job_settings.job_page_size
+    start = 0
+    datasets = []
+    while True:
+        page = ckan_instance.action.package_search(
+            rows=rows, start=start, sort="id asc", **_search_params(organization_id)
+        )
+        results = page.get("results", [])
+        datasets.extend(results)
+        if len(results) < rows:
+            break
+        start += len(results)
+    return datasets
+
+
+def count_organization_datasets(ckan_instance, organization_id: str) -> int:
+    """Return the number of datasets still owned by an organization."""
+    page = ckan_instance.action.package_search(
+        rows=0, **_search_params(organization_id)
+    )
+    return page.get("count", 0)
+
+
+def purge_organization_datasets(
+    ckan_instance,
+    organization_id: str,
+    action: str = "dataset_purge",
+    progress=None,
+) -> int:
+    """
+    Remove every dataset of an organization and verify it is empty.
+
+    All dataset IDs are collected page by page first, then removed
+    concurrently by a bounded pool of ``job_item_workers`` threads. The
+    organization is then counted again; datasets that failed or appeared
+    meanwhile are retried for up to ``MAX_PASSES`` passes.
+
+    Parameters
+    ----------
+    ckan_instance : RemoteCKAN
+        The CKAN instance to use.
+    organization_id : str
+        The ID of the organization to empty.
+    action : str
+        The CKAN action used per dataset, 'dataset_purge' or
+        'package_delete'.
+    progress : optional
+        A progress tracker with ``set_total`` and ``advance`` methods.
+
+    Returns
+    -------
+    int
+        The number of datasets removed.
+
+    Raises
+    ------
+    Exception
+        If the organization still owns datasets after the last pass.
+    """
+    remove = getattr(ckan_instance.action, action)
+    removed = 0
+    planned = 0
+    errors: List[str] = []
+
+    def remove_one(dataset: Dict[str, Any]) -> bool:
+        try:
+            remove(id=dataset["id"])
+        except Exception as exc:
+            message = f"{dataset['id']}: {exc}"
+            errors.append(message)
+            if progress:
+                progress.advance(ok=False, error=message)
+            return False
+        dataset_cache.forget(ckan_instance, dataset["id"])
+        dataset_names.discard(ckan_instance, dataset.get("name"))
+        if progress:
+            progress.advance()
+        return True
+
+    for _ in range(MAX_PASSES):
+        datasets = list_organization_datasets(ckan_instance, organization_id)
+        if not datasets:
+            break
+        planned += len(datasets)
+        if progress:
+            progress.set_total(planned)
+
+        with ThreadPoolExecutor(max_workers=job_settings.job_item_workers) as pool:
+            removed += sum(pool.map(remove_one, datasets))
+
+        if count_organization_datasets(ckan_instance, organization_id) == 0:
+            break
+    else:
+        remaining = count_organization_datasets(ckan_instance, organization_id)
+        if remaining:
+            detail = f" First error: {errors[0]}" if errors else ""
+            raise Exception(
+                f"Organization still has {remaining} datasets after "
+                f"{MAX_PASSES} passes.{detail}"
+            )
+
+    return removed
@@ -0,0 +1,101 @@
+# api/services/organization_services/retag_organization.py
+from typing import List, Optional
+
+from ckanapi import NotFound
+
+from api.config.ckan_settings import ckan_settings
+from api.config.job_settings import job_settings
+from api.services.dataset_services.dataset_cache import dataset_cache
+
+
+def retag_organization(
+    organization_name: str,
+    add_tags: Optional[List[str]] = None,
+    remove_tags: Optional[List[str]] = None,
+    ckan_instance=None,
+    progress=None,
+) -> dict:
+    """
+    Add and/or remove tags on every dataset of an organization.
+
+    Parameters
+    ----------
+    organization_name : str
+        The name or ID of the organization.
+    add_tags : Optional[List[str]]
+        Tags to add to each dataset.
+    remove_tags : Optional[List[str]]
+        Tags to remove from each dataset.
+    ckan_instance : optional
+        A CKAN instance to use. Defaults to `ckan_settings.ckan`.
+    progress : optional
+        A progress tracker with ``set_total`` and ``advance`` methods,
+        such as a background Job.
+
+    Returns
+    -------
+    dict
+        The number of datasets updated and left unchanged.
+
+    Raises
+    ------
+    Exception
+        If the organization does not exist or cannot be listed.
+    """
+    if ckan_instance is None:
+        ckan_instance = ckan_settings.ckan
+
+    to_add = set(add_tags or [])
+    to_remove = set(remove_tags or [])
+    if not to_add and not to_remove:
+        raise ValueError("Provide at least one tag to add or remove.")
+
+    try:
+        organization = ckan_instance.action.organization_show(id=organization_name)
+    except NotFound:
+        raise Exception("Organization not found")
+
+    updated = 0
+    unchanged = 0
+    start = 0
+    rows = job_settings.job_page_size
+
+    # Retagging does not change the result set, so offset paging is stable
+    while True:
+        page = ckan_instance.action.package_search(
+            fq=f"owner_org:{organization['id']}",
+            rows=rows,
+            start=start,
+            sort="name asc",
+            include_private=True,
+        )
+        if progress and start == 0:
+            progress.set_total(page.get("count", 0))
+
+        datasets = page.get("results", [])
+        for dataset in datasets:
+            current = {tag["name"] for tag in dataset.get("tags", [])}
+            new_tags = (current - to_remove) | to_add
+            if new_tags == current:
+                unchanged += 1
+                if progress:
+                    progress.advance()
+                continue
+
+            try:
+                patched = ckan_instance.action.package_patch(
+                    id=dataset["id"], tags=[{"name": t} for t in sorted(new_tags)]
+                )
+                dataset_cache.remember(ckan_instance, patched)
+                updated += 1
+                if progress:
+                    progress.advance()
+            except Exception as exc:
+                if progress:
+                    progress.advance(ok=False, error=f"{dataset['name']}: {exc}")
+
+        if len(datasets) < rows:
+            break
+        start += len(datasets)
+
+    return {"updated": updated, "unchanged": unchanged}
@@ -1,5 +1,6 @@
 # api/services/s3_services/add_s3.py
 from api.config import ckan_settings
+from api.services.dataset_services.create_package import create_package
 
 RESERVED_KEYS = {"name", "title", "owner_org", "notes", "id", "resources", "collection"}
 
@@ -62,37 +63,36 @@ def add_s3(
     if ckan_instance is None:
         ckan_instance = ckan_settings.ckan
 
-    try:
-        resource_package_dict = {
-            "name": resource_name,
-            "title": resource_title,
-            "owner_org": owner_org,
-            "notes": notes,
-        }
+    resource_package_dict = {
+        "name": resource_name,
+        "title": resource_title,
+        "owner_org": owner_org,
+        "notes": notes,
+    }
+
+    if extras:
+        resource_package_dict["extras"] = [
+            {"key": k, "value": v} for k, v in extras.items()
+        ]
 
-        if extras:
-            resource_package_dict["extras"] = [
-                {"key": k, "value": v} for k, v in extras.items()
-            ]
+    resource_dict = {
+        "url": resource_s3,
+        "name": resource_name,
+        "description": f"Resource pointing to {resource_s3}",
+        "format": "s3",
+    }
 
-        resource_package = ckan_instance.action.package_create(**resource_package_dict)
+    # Create the package and its resource in a single package_create call
+    try:
+        resource_package = create_package(
+            ckan_instance, resource_package_dict, [resource_dict]
+        )
         resource_package_id = resource_package["id"]
 
     except Exception as e:
         raise Exception(f"Error creating resource package: {str(e)}")
 
     if resource_package_id:
-        try:
-            ckan_instance.action.resource_create(
-                package_id=resource_package_id,
-                url=resource_s3,
-                name=resource_name,
-                description=f"Resource pointing to {resource_s3}",
-                format="s3",
-            )
-        except Exception as e:
-            raise Exception(f"Error creating resource: {str(e)}")
-
         return resource_package_id
     else:
         raise Exception("Unknown error occurred")
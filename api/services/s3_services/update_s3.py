@@ -3,6 +3,8 @@
 from typing import Dict, Optional
 
 from api.config.ckan_settings import ckan_settings
+from api.services.dataset_services.dataset_cache import dataset_cache
+from api.services.dataset_services.name_index import dataset_names
 
 RESERVED_KEYS = {"name", "title", "owner_org", "notes", "id", "resources", "collection"}
 
@@ -16,22 +18,31 @@ async def update_s3(
     notes: Optional[str] = None,
     extras: Optional[Dict[str, str]] = None,
     ckan_instance=None,  # new optional parameter
+    if_match: Optional[str] = None,
 ):
     """
     Update an existing S3 resource in CKAN, supporting a custom ckan_instance.
     If ckan_instance is None, defaults to ckan_settings.ckan.
+    If if_match is given, it must name the current dataset version.
     """
     if ckan_instance is None:
         ckan_instance = ckan_settings.ckan
 
-    try:
-        # Fetch the existing resource
-        resource = ckan_instance.action.package_show(id=resource_id)
-    except Exception as e:
-        raise Exception(f"Error fetching S3 resource: {str(e)}")
+    # Reuse the version the client last saw when it is still current
+    resource = dataset_cache.match(ckan_instance, resource_id, if_match)
+    if resource is None:
+        try:
+            # Fetch the existing resource
+            resource = dataset_cache.show(
+                ckan_instance, resource_id, refresh=bool(if_match)
+            )
+        except Exception as e:
+            raise Exception(f"Error fetching S3 resource: {str(e)}")
+        dataset_cache.check(resource, if_match)
 
     # Preserve all existing fields unless new values are provided
-    resource["name"] = resource_name or resource.get("name")
+    previous_name = resource.get("name")
+    resource["name"] = resource_name or previous_name
     resource["title"] = resource_title or resource.get("title")
     resource["owner_org"] = owner_org or resource.get("owner_org")
     resource["notes"] = notes or resource.get("notes")
@@ -63,6 +74,13 @@ async def update_s3(
                     )
                     break
     except Exception as e:
+        dataset_cache.forget(ckan_instance, resource_id)
         raise Exception(f"Error updating S3 resource: {str(e)}")
 
+    # A resource URL change bumps the package version without returning it
+    if resource_s3:
+        dataset_cache.forget(ckan_instance, resource_id)
+    else:
+        dataset_cache.remember(ckan_instance, updated_resource)
+    dataset_names.rename(ckan_instance, previous_name, updated_resource.get("name"))
     return updated_resource["id"]
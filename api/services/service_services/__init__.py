@@ -1 +1,2 @@
 from .add_service import add_service  # noqa: F401
+from .health_poller import discover_services, service_health  # noqa: F401
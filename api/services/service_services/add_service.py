@@ -2,6 +2,7 @@
 from typing import Any, Dict, Optional
 
 from api.config import ckan_settings
+from api.services.dataset_services.create_package import create_package
 
 RESERVED_KEYS = {
     "name",
@@ -107,44 +108,40 @@ def add_service(
     extras_cleaned = extras.copy() if extras else {}
     extras_cleaned.update(service_extras)
 
+    # Create the service package/dataset in CKAN
+    service_package_dict = {
+        "name": service_name,
+        "title": service_title,
+        "owner_org": owner_org,
+        "notes": notes or f"Service: {service_title}",
+    }
+
+    # Add extras if any
+    if extras_cleaned:
+        service_package_dict["extras"] = [
+            {"key": k, "value": v} for k, v in extras_cleaned.items()
+        ]
+
+    # The service resource is embedded in the same package_create call
+    service_resource_dict = {
+        "url": service_url,
+        "name": service_name,
+        "description": (
+            f"Service endpoint for {service_title} " f"accessible at {service_url}"
+        ),
+        "format": "service",
+    }
+
     try:
-        # Create the service package/dataset in CKAN
-        service_package_dict = {
-            "name": service_name,
-            "title": service_title,
-            "owner_org": owner_org,
-            "notes": notes or f"Service: {service_title}",
-        }
-
-        # Add extras if any
-        if extras_cleaned:
-            service_package_dict["extras"] = [
-                {"key": k, "value": v} for k, v in extras_cleaned.items()
-            ]
-
-        service_package = ckan_instance.action.package_create(**service_package_dict)
+        service_package = create_package(
+            ckan_instance, service_package_dict, [service_resource_dict]
+        )
         service_package_id = service_package["id"]
 
     except Exception as exc:
         raise Exception(f"Error creating service package: {str(exc)}")
 
-    # Create the service resource within the dataset
     if service_package_id:
-        try:
-            resource_description = (
-                f"Service endpoint for {service_title} " f"accessible at {service_url}"
-            )
-
-            ckan_instance.action.resource_create(
-                package_id=service_package_id,
-                url=service_url,
-                name=service_name,
-                description=resource_description,
-                format="service",
-            )
-        except Exception as exc:
-            raise Exception(f"Error creating service resource: {str(exc)}")
-
         return service_package_id
     else:
         raise Exception("Unknown error occurred during service creation")
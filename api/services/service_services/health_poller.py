@@ -0,0 +1,251 @@
+# api/services/service_services/health_poller.py
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from api.config.health_settings import health_settings
+
+logger = logging.getLogger(__name__)
+
+SERVICES_ORG = "services"
+
+
+def discover_services(ckan, server: str) -> List[Dict[str, Any]]:
+    """
+    Return every public dataset of the 'services' organization of a CKAN
+    server, with its service URL and health check URL.
+    """
+    services = []
+    start = 0
+    while True:
+        page = ckan.action.package_search(
+            q="*:*",
+            fq=f"organization:{SERVICES_ORG}",
+            rows=1000,
+            start=start,
+            sort="id asc",
+        )
+        results = page.get("results", [])
+        for dataset in results:
+            extras = {e["key"]: e["value"] for e in dataset.get("extras", [])}
+            service_url = next(
+                (
+                    resource.get("url")
+                    for resource in dataset.get("resources", [])
+                    if (resource.get("format") or "").lower() == "service"
+                ),
+                None,
+            )
+            services.append(
+                {
+                    "id": dataset["id"],
+                    "name": dataset["name"],
+                    "title": dataset.get("title") or dataset["name"],
+                    "server": server,
+                    "service_url": service_url,
+                    "health_check_url": extras.get("health_check_url"),
+                }
+            )
+        start += len(results)
+        if not results or start >= page.get("count", 0):
+            break
+    return services
+
+
+class ServiceHealthPoller:
+    """
+    Probes the health_check_url of registered services and caches the result.
+
+    Probes of a round run concurrently, at most ``concurrency`` at a time,
+    each bounded by ``timeout`` seconds, over one long-lived HTTP client.
+    A 2xx or 3xx answer means the service is up; redirects are not
+    followed. Services without a health check URL are listed as 'unknown'
+    and never probed. Readers get the cached results without waiting on
+    any probe.
+
+    Health check URLs are registered by catalog users, so only http and
+    https URLs are probed, and only when every address their host
+    resolves to is public. The probe then connects to the address that
+    was checked, sending the original host name as Host header and TLS
+    server name, so a DNS answer that changes between the check and the
+    request (DNS rebinding) cannot redirect it; proxies from the
+    environment are not used for the same reason. Services of the
+    catalogs in ``private_servers`` may also be probed on private,
+    loopback and link-local addresses. Other URLs are listed as
+    'refused'.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        concurrency: int,
+        private_servers: Iterable[str] = (),
+    ):
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.private_servers = set(private_servers)
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, trust_env=False)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        return [info[4][0] for info in infos]
+
+    async def _request(
+        self, service: Dict[str, Any]
+    ) -> Tuple[Optional[httpx.Request], Optional[str]]:
+        """
+        Build the probe request of a service, or return why its health
+        check URL may not be probed.
+        """
+        try:
+            url = httpx.URL(service["health_check_url"])
+        except Exception:
+            return None, "Invalid health check URL"
+        if url.scheme not in ("http", "https"):
+            return None, f"Scheme '{url.scheme}' is not allowed"
+        if not url.host:
+            return None, "Health check URL has no host"
+        if service.get("server") in self.private_servers:
+            return self.client.build_request("GET", url), None
+
+        port = url.port or (443 if url.scheme == "https" else 80)
+        try:
+            addresses = await self._resolve(url.host, port)
+        except OSError as e:
+            return None, f"Cannot resolve {url.host}: {e}"
+        if not addresses:
+            return None, f"Cannot resolve {url.host}"
+        for address in addresses:
+            ip = ipaddress.ip_address(address.split("%")[0])
+            if getattr(ip, "ipv4_mapped", None):
+                ip = ip.ipv4_mapped
+            if not ip.is_global or ip.is_multicast:
+                return None, f"{url.host} resolves to non-public address {ip}"
+
+        # Connect to the checked address, not to a fresh DNS answer
+        request = self.client.build_request(
+            "GET",
+            url.copy_with(host=addresses[0].split("%")[0]),
+            headers={"Host": url.netloc.decode("ascii")},
+            extensions={"sni_hostname": url.host},
+        )
+        return request, None
+
+    async def _probe(
+        self, service: Dict[str, Any], semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        result = {
+            **service,
+            "status": "unknown",
+            "http_status": None,
+            "latency_ms": None,
+            "checked_at": time.time(),
+            "error": None,
+        }
+        if not service.get("health_check_url"):
+            return result
+        async with semaphore:
+            request, refusal = await self._request(service)
+            if refusal:
+                result["status"] = "refused"
+                result["error"] = refusal
+                return result
+            started = time.perf_counter()
+            try:
+                response = await self.client.send(request)
+                result["http_status"] = response.status_code
+                result["status"] = "up" if response.status_code < 400 else "down"
+            except Exception as e:
+                result["status"] = "down"
+                result["error"] = str(e) or type(e).__name__
+            result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            result["checked_at"] = time.time()
+        return result
+
+    async def poll(self, services: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Probe every service once and replace the cache with the results, so
+        services no longer registered disappear from it.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        probed = await asyncio.gather(
+            *(self._probe(service, semaphore) for service in services)
+        )
+        results = {result["id"]: result for result in probed}
+        down = sum(1 for r in probed if r["status"] == "down")
+        if down:
+            logger.warning(f"{down} of {len(probed)} registered services are down")
+        with self._lock:
+            self._results = results
+        return results
+
+    @staticmethod
+    def _public(result: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **result,
+            "checked_at": datetime.fromtimestamp(
+                result["checked_at"], timezone.utc
+            ).isoformat(),
+        }
+
+    def health(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached health of a service dataset, or None."""
+        with self._lock:
+            result = self._results.get(dataset_id)
+        if result is None:
+            return None
+        public = self._public(result)
+        return {
+            key: public[key]
+            for key in ("status", "http_status", "latency_ms", "checked_at", "error")
+        }
+
+    def services(self) -> List[Dict[str, Any]]:
+        """Return every known service with its cached health."""
+        with self._lock:
+            results = list(self._results.values())
+        return [self._public(result) for result in results]
+
+    def healthy(self, server: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the services that are up, fastest first."""
+        live = [
+            result
+            for result in self.services()
+            if result["status"] == "up"
+            and (server is None or result["server"] == server)
+        ]
+        return sorted(live, key=lambda result: result["latency_ms"])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results = {}
+
+
+service_health = ServiceHealthPoller(
+    timeout=health_settings.service_health_timeout_seconds,
+    concurrency=health_settings.service_health_concurrency,
+    private_servers=health_settings.service_health_private_servers,
+)
@@ -2,4 +2,11 @@
 from .check_api_status import get_status  # noqa: F401
 from .check_ckan_status import check_ckan_status  # noqa: F401
 from .full_metrics import get_full_metrics  # noqa: F401
-from .system_metrics import get_public_ip, get_system_metrics  # noqa: F401
+from .health_monitor import health_monitor  # noqa: F401
+from .metrics_publisher import metrics_publisher  # noqa: F401
+from .metrics_sampler import metrics_sampler  # noqa: F401
+from .system_metrics import (  # noqa: F401
+    get_public_ip,
+    get_system_metrics,
+    refresh_public_ip,
+)
@@ -5,13 +5,46 @@ import logging
 from api.config.ckan_settings import ckan_settings
 from api.services import status_services
 from api.services.keycloak_services.introspect_user_token import get_client_token
+from api.services.telemetry_services import circuit_breakers
+
+from .health_monitor import health_monitor
 
 logger = logging.getLogger(__name__)
 
 
+def check_local_ckan():
+    """Check local CKAN, or return None if it is disabled."""
+    if not ckan_settings.ckan_local_enabled:
+        return None
+    # Defaults to checking local CKAN if no arguments are passed
+    return status_services.check_ckan_status()
+
+
+def check_global_ckan():
+    """Check global CKAN."""
+    return status_services.check_ckan_status(local=False)
+
+
+def check_keycloak():
+    """Check Keycloak by requesting a client token."""
+    get_client_token()
+    return True
+
+
+health_monitor.register("ckan_local", check_local_ckan)
+health_monitor.register("ckan_global", check_global_ckan)
+health_monitor.register("keycloak", check_keycloak)
+
+
 def get_status():
     """
-    Checks if local/global CKAN and Keycloak are active and reachable.
+    Report whether local/global CKAN and Keycloak are active and reachable.
+
+    The checks run concurrently on a background interval (see
+    ``health_monitor``); this returns the last snapshot without calling
+    any dependency. Only the very first call, before any round has
+    finished, runs the checks, bounded by ``health_check_timeout_seconds``;
+    async callers therefore call it through ``asyncio.to_thread``.
 
     Returns
     -------
@@ -23,43 +56,27 @@ def get_status():
           reachable (if enabled).
           - ckan_is_active_global (bool): Whether global CKAN is reachable.
           - keycloak_is_active (bool): Whether Keycloak is active.
+          - checks (dict): Per check result, latency in milliseconds, time
+          of the check, age in seconds and error, if any.
+          - circuit_breakers (list): State of the circuit breaker of each
+          CKAN server and Keycloak, with the error and slow-call rates of
+          its window.
 
     Note
     ----
     If local CKAN is disabled, 'ckan_is_active_local' will be None by default
     and no check will be performed for local CKAN.
     """
-    status_dict = {
+    checks = health_monitor.results()
+    if checks is None:
+        health_monitor.run()
+        checks = health_monitor.results()
+
+    return {
         "ckan_local_enabled": ckan_settings.ckan_local_enabled,
-        "ckan_is_active_local": None,
-        "ckan_is_active_global": False,
-        "keycloak_is_active": False,
+        "ckan_is_active_local": checks["ckan_local"]["ok"],
+        "ckan_is_active_global": bool(checks["ckan_global"]["ok"]),
+        "keycloak_is_active": bool(checks["keycloak"]["ok"]),
+        "checks": checks,
+        "circuit_breakers": circuit_breakers.snapshot(),
     }
-
-    # 1. Check local CKAN if enabled
-    if ckan_settings.ckan_local_enabled:
-        logger.info("Local CKAN is enabled, checking status...")
-        try:
-            # Defaults to checking local CKAN if no arguments are passed
-            status_dict["ckan_is_active_local"] = status_services.check_ckan_status()
-        except Exception:
-            status_dict["ckan_is_active_local"] = False
-
-    # 2. Check global CKAN
-    try:
-        status_dict["ckan_is_active_global"] = status_services.check_ckan_status(
-            local=False
-        )
-    except Exception:
-        status_dict["ckan_is_active_global"] = False
-
-    # 3. Check Keycloak status
-    try:
-        get_client_token()
-        status_dict["keycloak_is_active"] = True
-        print("Keycloak is active")
-    except Exception:
-        status_dict["keycloak_is_active"] = False
-        print("Keycloak is not active")
-
-    return status_dict
@@ -27,9 +27,7 @@ def check_ckan_status(local=True) -> bool:
     Exception
         If there is an error connecting to CKAN.
     """
-    logger.info(f"Checking CKAN status, local={local}")
-    logger.info(f"CKAN URL: {ckan_settings.ckan_url}")
-    logger.info(f"CKAN API Key: {ckan_settings.ckan_api_key}")
+    logger.debug("Checking CKAN status, local=%s", local)
 
     if local:
         ckan = ckan_settings.ckan
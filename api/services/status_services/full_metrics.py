@@ -1,4 +1,6 @@
 # api\services\status_services\full_metrics.py
+from api.services.telemetry_services import loop_monitor
+
 from .check_api_status import get_status
 from .system_metrics import get_public_ip, get_system_metrics
 
@@ -6,7 +8,7 @@ from .system_metrics import get_public_ip, get_system_metrics
 def get_full_metrics():
     """
     Retrieve full system metrics including public IP, CPU, memory, disk,
-    and the current status of all integrated services.
+    the current status of all integrated services and the event-loop lag.
     """
     public_ip = get_public_ip()
     cpu, mem, disk = get_system_metrics()
@@ -19,6 +21,10 @@ def get_full_metrics():
         "memory": f"{mem}%",
         "disk": f"{disk}%",
         "services": services_status,
+        "event_loop": {
+            **loop_monitor.lag_summary(),
+            "blocking_calls": len(loop_monitor.blocking_calls()),
+        },
     }
 
     return metrics
@@ -0,0 +1,113 @@
+# api/services/status_services/health_monitor.py
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from api.config.health_settings import health_settings
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """
+    Runs dependency health checks concurrently and keeps the last result.
+
+    Every check of a round runs in its own thread and the round waits at
+    most ``timeout`` seconds; a check still running by then is reported
+    as failed. A check that is still hung from an earlier round is not
+    started again until it returns, so a dead dependency never piles up
+    threads. Readers get the stored snapshot without waiting on anything.
+    """
+
+    def __init__(self, timeout: float, max_workers: int = 8):
+        self.timeout = timeout
+        self._checks: Dict[str, Callable[[], Optional[bool]]] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="health-check"
+        )
+        self._running: Dict[str, Future] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, check: Callable[[], Optional[bool]]) -> None:
+        """
+        Add a check. It returns True when the dependency is healthy, False
+        when it is not, None when it is not checked, or raises.
+        """
+        self._checks[name] = check
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """Run every registered check once and store the results."""
+        started: Dict[str, float] = {}
+        futures: Dict[str, Future] = {}
+        for name, check in self._checks.items():
+            previous = self._running.get(name)
+            if previous is not None and not previous.done():
+                futures[name] = previous
+                continue
+            started[name] = time.monotonic()
+            futures[name] = self._running[name] = self._executor.submit(check)
+
+        wait(futures.values(), timeout=self.timeout)
+
+        results = {}
+        for name, future in futures.items():
+            checked_at = time.time()
+            latency = (
+                round((time.monotonic() - started[name]) * 1000, 1)
+                if name in started
+                else None
+            )
+            result = {
+                "ok": False,
+                "latency_ms": latency,
+                "checked_at": checked_at,
+                "error": None,
+            }
+            if not future.done():
+                result["error"] = f"Timed out after {self.timeout:g}s"
+            elif future.exception() is not None:
+                result["error"] = str(future.exception())
+            else:
+                result["ok"] = future.result()
+            if result["error"]:
+                logger.warning(f"Health check {name} failed: {result['error']}")
+            results[name] = result
+
+        with self._lock:
+            self._results = results
+        return results
+
+    def results(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Return the last results with the age of each check in seconds, or
+        None before the first round.
+        """
+        with self._lock:
+            results = self._results
+        if not results:
+            return None
+        now = time.time()
+        return {
+            name: {
+                "ok": result["ok"],
+                "latency_ms": result["latency_ms"],
+                "checked_at": datetime.fromtimestamp(
+                    result["checked_at"], timezone.utc
+                ).isoformat(),
+                "age_seconds": round(now - result["checked_at"], 1),
+                "error": result["error"],
+            }
+            for name, result in results.items()
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results = {}
+
+
+health_monitor = HealthMonitor(timeout=health_settings.health_check_timeout_seconds)
@@ -0,0 +1,242 @@
+# api/services/status_services/metrics_publisher.py
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+import uuid
+from typing import List, Optional
+
+import httpx
+
+from api.config.metrics_settings import metrics_settings
+from api.config.swagger_settings import swagger_settings
+
+logger = logging.getLogger(__name__)
+
+# Suffix of a report a worker is posting; see MetricsPublisher._claim
+CLAIM_SUFFIX = ".sending"
+
+
+class MetricsPublisher:
+    """
+    Posts metrics reports to the federation endpoint.
+
+    Every report is first written to an on-disk spool, then the spool is
+    flushed oldest first over one long-lived HTTP client. When a post
+    fails the remaining reports stay spooled and the next flush is
+    delayed with exponential backoff, from ``retry_initial`` up to
+    ``retry_max`` seconds. The spool keeps at most ``max_spooled``
+    reports, dropping the oldest, and survives restarts.
+
+    Several workers may share the spool. A worker renames a report to
+    ``<name>.<worker>.sending`` before posting it, so no other worker
+    posts it too. Claims older than three times ``timeout``, left by a
+    worker that died while posting, are put back in the spool.
+
+    Reports carry the CKAN API keys and Keycloak client secret of the
+    instance, so the spool directory is created with mode 0700 and each
+    report file with mode 0600. The mode of an existing directory is
+    reset to 0700 as well.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        spool_dir: str,
+        max_spooled: int = 1000,
+        timeout: float = 10,
+        compress: bool = True,
+        retry_initial: float = 30,
+        retry_max: float = 3600,
+    ):
+        self.endpoint = endpoint
+        self.spool_dir = spool_dir
+        self.max_spooled = max_spooled
+        self.timeout = timeout
+        self.compress = compress
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self.next_attempt_at = 0.0
+        self._failures = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._worker = uuid.uuid4().hex[:8]
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def pending(self) -> List[str]:
+        """Return the spooled report files, oldest first."""
+        try:
+            names = os.listdir(self.spool_dir)
+        except FileNotFoundError:
+            return []
+        return sorted(n for n in names if n.endswith((".json", ".json.gz")))
+
+    def spool(self, payload: dict) -> None:
+        """Write a report to the spool, dropping the oldest beyond the limit."""
+        os.makedirs(self.spool_dir, mode=0o700, exist_ok=True)
+        # makedirs leaves the mode of an existing directory alone
+        os.chmod(self.spool_dir, 0o700)
+        body = json.dumps(payload).encode()
+        name = f"{time.time_ns()}.json"
+        if self.compress:
+            body = gzip.compress(body)
+            name += ".gz"
+        path = os.path.join(self.spool_dir, name)
+        # Only the API's own user may read the secrets in a report
+        fd = os.open(path + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(path + ".tmp", path)
+
+        pending = self.pending()
+        overflow = pending[: max(len(pending) - self.max_spooled, 0)]
+        for name in overflow:
+            self._remove(name)
+        if overflow:
+            logger.warning(
+                f"Metrics spool full, dropped the {len(overflow)} oldest report(s)"
+            )
+
+    def seconds_until_retry(self) -> Optional[float]:
+        """Seconds until the spool should be flushed again, None if empty."""
+        if not self.pending():
+            return None
+        return max(self.next_attempt_at - time.monotonic(), 0.0)
+
+    def _remove(self, name: str) -> None:
+        try:
+            os.remove(os.path.join(self.spool_dir, name))
+        except FileNotFoundError:
+            pass
+
+    def _read(self, name: str) -> bytes:
+        with open(os.path.join(self.spool_dir, name), "rb") as f:
+            return f.read()
+
+    def _claim(self, name: str) -> Optional[str]:
+        """
+        Take a spooled report for this worker by renaming it, returning the
+        claimed name, or None if another worker took it first.
+        """
+        path = os.path.join(self.spool_dir, name)
+        claimed = f"{name}.{self._worker}{CLAIM_SUFFIX}"
+        try:
+            # A claim's age is its modification time, set before the rename
+            # so the claim never looks stale to _recover_claims
+            os.utime(path)
+            os.rename(path, os.path.join(self.spool_dir, claimed))
+        except FileNotFoundError:
+            return None
+        return claimed
+
+    def _unclaim(self, claimed: str) -> None:
+        """Put a claimed report back in the spool."""
+        name = claimed.rsplit(".", 2)[0]
+        try:
+            os.rename(
+                os.path.join(self.spool_dir, claimed),
+                os.path.join(self.spool_dir, name),
+            )
+        except FileNotFoundError:
+            pass
+
+    def _recover_claims(self) -> None:
+        """Put back the reports claimed by a worker that died posting them."""
+        try:
+            names = os.listdir(self.spool_dir)
+        except FileNotFoundError:
+            return
+        cutoff = time.time() - 3 * self.timeout
+        for name in names:
+            if not name.endswith(CLAIM_SUFFIX):
+                continue
+            try:
+                claimed_at = os.path.getmtime(os.path.join(self.spool_dir, name))
+            except FileNotFoundError:
+                continue
+            if claimed_at < cutoff:
+                logger.warning(f"Recovering metrics report {name} left unsent")
+                self._unclaim(name)
+
+    async def flush(self) -> int:
+        """
+        Post the spooled reports oldest first and return how many were sent.
+
+        Does nothing while backing off. Stops at the first failure; a report
+        the endpoint rejects as invalid (4xx other than 408/429) is dropped
+        instead, since resending it would never succeed. Reports claimed
+        by another worker are skipped.
+        """
+        if time.monotonic() < self.next_attempt_at:
+            return 0
+        await asyncio.to_thread(self._recover_claims)
+        pending = await asyncio.to_thread(self.pending)
+        sent = 0
+        for name in pending:
+            claimed = await asyncio.to_thread(self._claim, name)
+            if claimed is None:
+                continue
+            headers = {"Content-Type": "application/json"}
+            if name.endswith(".gz"):
+                headers["Content-Encoding"] = "gzip"
+            try:
+                body = await asyncio.to_thread(self._read, claimed)
+                response = await self.client.post(
+                    self.endpoint, content=body, headers=headers
+                )
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if 400 <= status < 500 and status not in (408, 429):
+                    logger.error(f"Metrics report rejected, dropping it: {e}")
+                    await asyncio.to_thread(self._remove, claimed)
+                    continue
+                await asyncio.to_thread(self._unclaim, claimed)
+                self._back_off(e, len(pending) - sent)
+                return sent
+            except Exception as e:
+                await asyncio.to_thread(self._unclaim, claimed)
+                self._back_off(e, len(pending) - sent)
+                return sent
+            await asyncio.to_thread(self._remove, claimed)
+            sent += 1
+
+        self._failures = 0
+        self.next_attempt_at = 0.0
+        if sent:
+            logger.info(
+                f"Successfully posted {sent} metrics report(s) to {self.endpoint}"
+            )
+        return sent
+
+    def _back_off(self, error: Exception, remaining: int) -> None:
+        self._failures += 1
+        delay = min(self.retry_initial * 2 ** (self._failures - 1), self.retry_max)
+        self.next_attempt_at = time.monotonic() + delay
+        logger.error(
+            f"Error posting metrics: {error}; {remaining} report(s) spooled, "
+            f"retrying in {delay:g}s"
+        )
+
+
+metrics_publisher = MetricsPublisher(
+    endpoint=swagger_settings.metrics_endpoint,
+    spool_dir=metrics_settings.metrics_spool_dir,
+    max_spooled=metrics_settings.metrics_spool_max_files,
+    timeout=metrics_settings.metrics_publish_timeout_seconds,
+    compress=metrics_settings.metrics_publish_compress,
+    retry_initial=metrics_settings.metrics_retry_initial_seconds,
+    retry_max=metrics_settings.metrics_retry_max_seconds,
+)
@@ -0,0 +1,98 @@
+# api/services/status_services/metrics_sampler.py
+
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from api.config.metrics_settings import metrics_settings
+
+
+class MetricsSampler:
+    """
+    Fixed-size ring buffer of system metrics samples.
+
+    ``sample`` is meant to be called every few seconds by a background
+    task. CPU usage is measured by psutil over the time since the
+    previous sample, so taking a sample never sleeps, and network
+    counters are turned into per-second rates the same way. Readers get
+    the latest sample or the recent series without measuring anything.
+    """
+
+    def __init__(self, history_size: int):
+        self._samples: deque = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._process = psutil.Process(os.getpid())
+        self._previous_net = None
+        self._previous_time = None
+        # Start the CPU measurement windows of the first sample
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+
+    def sample(self) -> Dict[str, Any]:
+        """Measure the system now and append the sample to the buffer."""
+        now = time.monotonic()
+        net = psutil.net_io_counters()
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage("/")
+        with self._process.oneshot():
+            process = {
+                "cpu_percent": self._process.cpu_percent(interval=None),
+                "memory_rss_bytes": self._process.memory_info().rss,
+                "threads": self._process.num_threads(),
+                "open_files": (
+                    self._process.num_fds()
+                    if hasattr(self._process, "num_fds")
+                    else self._process.num_handles()
+                ),
+            }
+
+        sent_rate = recv_rate = None
+        with self._lock:
+            if self._previous_net is not None and now > self._previous_time:
+                elapsed = now - self._previous_time
+                sent_rate = (net.bytes_sent - self._previous_net.bytes_sent) / elapsed
+                recv_rate = (net.bytes_recv - self._previous_net.bytes_recv) / elapsed
+            self._previous_net = net
+            self._previous_time = now
+
+            sample = {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "cpu_percent": psutil.cpu_percent(interval=None),
+                "memory_percent": memory.percent,
+                "memory_used_bytes": memory.used,
+                "disk_percent": disk.percent,
+                "network": {
+                    "bytes_sent": net.bytes_sent,
+                    "bytes_recv": net.bytes_recv,
+                    "sent_bytes_per_second": sent_rate,
+                    "recv_bytes_per_second": recv_rate,
+                },
+                "process": process,
+            }
+            self._samples.append(sample)
+        return sample
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Return the most recent sample, or None before the first one."""
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the buffered samples, oldest first, at most ``limit``."""
+        with self._lock:
+            samples = list(self._samples)
+        return samples[-limit:] if limit else samples
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._previous_net = None
+            self._previous_time = None
+
+
+metrics_sampler = MetricsSampler(history_size=metrics_settings.metrics_history_size)
@@ -1,22 +1,73 @@
 # api/utils/system_metrics.py
 
-import psutil
+import logging
+import threading
+import time
+
 import requests
 
+from api.config.metrics_settings import metrics_settings
 
-def get_public_ip():
-    """Retrieve the public IP address using external API."""
+from .metrics_sampler import metrics_sampler
+
+logger = logging.getLogger(__name__)
+
+# Last known public IP, shared by /status/metrics and the metrics task
+_public_ip = {"ip": None, "resolved_at": None, "error": None}
+_public_ip_lock = threading.Lock()
+
+
+def refresh_public_ip():
+    """
+    Look up the public IP address using external API and cache it.
+
+    The request is bounded by ``public_ip_timeout_seconds``. On failure
+    the previously resolved address is kept.
+
+    Returns
+    -------
+    str or None
+        The cached public IP after the refresh, if any.
+    """
     try:
-        response = requests.get("https://api.ipify.org?format=json")
+        response = requests.get(
+            metrics_settings.public_ip_url,
+            timeout=metrics_settings.public_ip_timeout_seconds,
+        )
         response.raise_for_status()
-        return response.json().get("ip")
-    except requests.RequestException as e:
-        return f"Error retrieving IP: {e}"
+        ip = response.json().get("ip")
+    except (requests.RequestException, ValueError) as e:
+        logger.warning(f"Error retrieving public IP: {e}")
+        with _public_ip_lock:
+            _public_ip["error"] = str(e)
+            return _public_ip["ip"]
+
+    with _public_ip_lock:
+        _public_ip.update(ip=ip, resolved_at=time.time(), error=None)
+    return ip
+
+
+def get_public_ip():
+    """
+    Return the cached public IP address without any network call.
+
+    Falls back to the last lookup error, or 'Unknown' before the first
+    lookup has finished.
+    """
+    with _public_ip_lock:
+        if _public_ip["ip"]:
+            return _public_ip["ip"]
+        if _public_ip["error"]:
+            return f"Error retrieving IP: {_public_ip['error']}"
+    return "Unknown"
 
 
 def get_system_metrics():
-    """Get system metrics: CPU, memory, and disk usage percentages."""
-    cpu_percent = psutil.cpu_percent(interval=1)
-    memory_percent = psutil.virtual_memory().percent
-    disk_usage_percent = psutil.disk_usage("/").percent
-    return cpu_percent, memory_percent, disk_usage_percent
+    """
+    Get system metrics: CPU, memory, and disk usage percentages.
+
+    Values come from the latest background sample, so this returns
+    immediately. A sample is taken on the spot if none exists yet.
+    """
+    sample = metrics_sampler.latest() or metrics_sampler.sample()
+    return sample["cpu_percent"], sample["memory_percent"], sample["disk_percent"]
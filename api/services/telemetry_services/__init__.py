@@ -0,0 +1,23 @@
+from .circuit_breaker import (  # noqa: F401
+    CircuitBreaker,
+    CircuitOpenError,
+    circuit_breakers,
+    retry_read,
+)
+from .loop_monitor import loop_monitor  # noqa: F401
+from .metrics_registry import MetricsRegistry, metrics_registry  # noqa: F401
+from .profiler import (  # noqa: F401
+    ProfilerBusy,
+    StackProfiler,
+    collapsed_text,
+    profiler,
+)
+from .request_context import set_request_user  # noqa: F401
+from .server_timing import timed_phase  # noqa: F401
+from .slow_requests import SlowRequestLog, slow_requests  # noqa: F401
+from .upstream_calls import (  # noqa: F401
+    InstrumentedRemoteCKAN,
+    slow_calls,
+    upstream_call,
+    upstream_summary,
+)
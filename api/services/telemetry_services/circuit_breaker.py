@@ -0,0 +1,322 @@
+# api/services/telemetry_services/circuit_breaker.py
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+import httpx
+import requests
+from ckanapi.errors import CKANAPIError, ServerIncompatibleError
+
+from api.config.upstream_settings import upstream_settings
+
+from .metrics_registry import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BREAKER_TRANSITIONS = "pop_circuit_breaker_transitions_total"
+BREAKER_REJECTED = "pop_circuit_breaker_rejected_total"
+
+metrics_registry.describe(
+    BREAKER_TRANSITIONS,
+    "counter",
+    "Circuit breaker state changes by service, server and new state.",
+)
+metrics_registry.describe(
+    BREAKER_REJECTED,
+    "counter",
+    "Calls failed at once because the circuit of their upstream was open.",
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, service: str, server: str, retry_after: float):
+        self.service = service
+        self.server = server
+        self.retry_after = retry_after
+        super().__init__(
+            f"{service} ({server}) is unavailable: circuit open, "
+            f"retrying in {retry_after:.0f}s"
+        )
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """
+    True when an exception means the upstream is unavailable (connection
+    error, timeout, 5xx or unparseable answer) rather than that it
+    answered with an error about the request (404, validation, auth).
+    """
+    if isinstance(exc, requests.HTTPError):
+        response = exc.response
+        return response is None or response.status_code >= 500
+    if isinstance(exc, requests.RequestException):
+        return True
+    # ckanapi raises the base class only for answers it could not read,
+    # e.g. an HTML error page from a proxy in front of a down CKAN
+    return type(exc) in (CKANAPIError, ServerIncompatibleError)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one upstream server.
+
+    Closed, it records the outcome and latency of every call over a
+    rolling window and opens when, with at least ``min_calls`` calls in
+    the window, the failure rate reaches ``error_rate`` or the rate of
+    calls slower than ``slow_call_seconds`` reaches ``slow_call_rate``.
+    It also opens after ``consecutive_failures`` failed calls in a row
+    (0 disables this), which catches a hanging server whose calls each
+    take a full timeout and so never fill the window. Open, ``acquire`` raises ``CircuitOpenError`` without calling the
+    upstream. After ``open_seconds`` it is half-open: up to
+    ``half_open_probes`` calls at a time go through; the first probe that
+    succeeds closes it and one that fails opens it again.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        server: str,
+        window: float,
+        min_calls: int,
+        error_rate: float,
+        slow_call_seconds: float,
+        slow_call_rate: float,
+        open_seconds: float,
+        half_open_probes: int = 1,
+        consecutive_failures: int = 0,
+    ):
+        self.service = service
+        self.server = server
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.consecutive_failures = consecutive_failures
+        self.state = CLOSED
+        # (time, failed, slow) of the calls in the window, with running
+        # totals so each call costs O(1)
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+        self._failures = 0
+        self._slow = 0
+        self._streak = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window:
+            _, failed, slow = self._calls.popleft()
+            self._failures -= failed
+            self._slow -= slow
+
+    def _reset_window(self) -> None:
+        self._calls.clear()
+        self._failures = 0
+        self._slow = 0
+        self._streak = 0
+
+    def _transition(self, state: str, now: float, reason: str = "") -> None:
+        self.state = state
+        if state == OPEN:
+            self._opened_at = now
+            self._reset_window()
+            logger.warning(f"Circuit of {self.service} ({self.server}) opened{reason}")
+        elif state == CLOSED:
+            logger.info(f"Circuit of {self.service} ({self.server}) closed")
+        metrics_registry.inc(
+            BREAKER_TRANSITIONS,
+            (("service", self.service), ("server", self.server), ("state", state)),
+        )
+
+    def acquire(self) -> bool:
+        """
+        Ask to call the upstream. Returns True when the call is a half-open
+        probe; pass it back to ``release``.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the circuit is open, or half-open with every probe in use.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN:
+                retry_after = self._opened_at + self.open_seconds - now
+                if retry_after <= 0:
+                    self._transition(HALF_OPEN, now)
+                    self._probes = 0
+            if self.state == CLOSED:
+                return False
+            if self.state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return True
+            retry_after = max(self._opened_at + self.open_seconds - now, 0.0)
+        metrics_registry.inc(
+            BREAKER_REJECTED, (("service", self.service), ("server", self.server))
+        )
+        raise CircuitOpenError(self.service, self.server, retry_after)
+
+    def release(self, duration: float, failed: bool, probe: bool = False) -> None:
+        """Record the outcome of a call allowed by ``acquire``."""
+        now = time.monotonic()
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if probe:
+                self._probes -= 1
+                if self.state != HALF_OPEN:
+                    return
+                if failed or slow:
+                    self._transition(OPEN, now, " again after a failed probe")
+                else:
+                    self._reset_window()
+                    self._transition(CLOSED, now)
+                return
+            if self.state != CLOSED:
+                # Started before the circuit opened
+                return
+            self._calls.append((now, failed, slow))
+            self._failures += failed
+            self._slow += slow
+            self._streak = self._streak + 1 if failed else 0
+            self._prune(now)
+            if self.consecutive_failures and self._streak >= self.consecutive_failures:
+                self._transition(OPEN, now, f": {self._streak} calls in a row failed")
+                return
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            if self._failures / total >= self.error_rate:
+                self._transition(
+                    OPEN, now, f": {self._failures} of {total} calls failed"
+                )
+            elif self._slow / total >= self.slow_call_rate:
+                self._transition(
+                    OPEN,
+                    now,
+                    f": {self._slow} of {total} calls took over "
+                    f"{self.slow_call_seconds:g}s",
+                )
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            total = len(self._calls)
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(self._opened_at + self.open_seconds - now, 0), 1)
+            return {
+                "service": self.service,
+                "server": self.server,
+                "state": self.state,
+                "calls": total,
+                "error_rate": round(self._failures / total, 3) if total else None,
+                "slow_call_rate": round(self._slow / total, 3) if total else None,
+                "retry_in_seconds": retry_in,
+            }
+
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per (service, server), created on first use."""
+
+    def __init__(self, **breaker_settings):
+        self.breaker_settings = breaker_settings
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, service: str, server: str) -> CircuitBreaker:
+        key = (service, server)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = CircuitBreaker(service, server, **self.breaker_settings)
+                    self._breakers[key] = breaker
+        return breaker
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """State of every breaker, sorted by service and server."""
+        return [self._breakers[key].snapshot() for key in sorted(list(self._breakers))]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._breakers = {}
+
+
+circuit_breakers = CircuitBreakerRegistry(
+    window=upstream_settings.circuit_breaker_window_seconds,
+    min_calls=upstream_settings.circuit_breaker_min_calls,
+    error_rate=upstream_settings.circuit_breaker_error_rate,
+    slow_call_seconds=upstream_settings.circuit_breaker_slow_call_seconds,
+    slow_call_rate=upstream_settings.circuit_breaker_slow_call_rate,
+    open_seconds=upstream_settings.circuit_breaker_open_seconds,
+    half_open_probes=upstream_settings.circuit_breaker_half_open_probes,
+    consecutive_failures=upstream_settings.circuit_breaker_consecutive_failures,
+)
+
+
+def retry_read(
+    call: Callable[[], T],
+    retries: Optional[int] = None,
+    backoff: Optional[float] = None,
+) -> T:
+    """
+    Run an idempotent read, retrying it when the upstream could not be
+    reached.
+
+    Before attempt n (from 1) it sleeps a random time of up to
+    ``backoff * 2^(n-1)`` seconds ("full jitter"), so clients retrying
+    together do not hit a recovering server at the same moment. Errors
+    about the request itself and open circuits are raised at once, and
+    so are timeouts: a server that let one call time out is unlikely to
+    answer the next, and retrying would multiply the wait.
+
+    A read made on the event loop thread is never retried, since
+    sleeping there would stall every other request of the worker.
+    """
+    if retries is None:
+        retries = upstream_settings.upstream_read_retries
+    if backoff is None:
+        backoff = upstream_settings.upstream_retry_backoff_seconds
+    if retries and _on_event_loop():
+        retries = 0
+    attempt = 0
+    while True:
+        try:
+            return call()
+        except CircuitOpenError:
+            raise
+        except Exception as exc:
+            if attempt >= retries or not is_upstream_failure(exc) or is_timeout(exc):
+                raise
+        time.sleep(random.uniform(0, backoff * 2**attempt))
+        attempt += 1
+
+
+def is_timeout(exc: BaseException) -> bool:
+    """True when a call failed because the upstream did not answer in time."""
+    return isinstance(exc, (requests.Timeout, httpx.TimeoutException))
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
@@ -0,0 +1,177 @@
+# api/services/telemetry_services/logging_pipeline.py
+
+import copy
+import json
+import logging
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+from .metrics_registry import metrics_registry
+
+LOG_RECORDS_DROPPED = "pop_log_records_dropped_total"
+
+metrics_registry.describe(
+    LOG_RECORDS_DROPPED,
+    "counter",
+    "Log records dropped because the logging queue was full.",
+)
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+TEXT_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object, including its extra= fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the INFO and DEBUG records of some loggers.
+
+    The rate of the most specific configured logger applies, so a rate set
+    on 'api.services' covers 'api.services.status_services' unless that
+    one has its own. Warnings and errors always pass.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+
+    def rate_for(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return self.rates.get("", 1.0)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never waits: when the queue is full the record is
+    dropped and counted instead of blocking the caller.
+
+    The message is rendered here, on the caller's thread, so the listener
+    never touches arguments that may change afterwards; the traceback is
+    kept apart from the message for the JSON output.
+    """
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics_registry.inc(LOG_RECORDS_DROPPED)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def build_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATEFMT)
+
+
+def configure_logging(
+    level: str = "INFO",
+    log_format: str = "text",
+    log_file: Optional[str] = None,
+    max_bytes: int = 5 * 1024 * 1024,
+    backup_count: int = 3,
+    queue_size: int = 10000,
+    sampling: Optional[Dict[str, float]] = None,
+) -> QueueListener:
+    """
+    Route the root logger through a queue to a background writer thread.
+
+    Log calls only render the message and enqueue it; the file and console
+    handlers run on the listener thread. Returns the started listener,
+    which the caller stops on shutdown to flush pending records.
+    """
+    formatter = build_formatter(log_format)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        handlers.append(
+            RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+        )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    if sampling:
+        queue_handler.addFilter(SamplingFilter(sampling))
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(queue_handler)
+
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def configure_file_logger(
+    name: str,
+    log_file: str,
+    max_bytes: int = 5 * 1024 * 1024,
+    backup_count: int = 3,
+    queue_size: int = 10000,
+) -> QueueListener:
+    """
+    Send the records of one logger only to its own rotating file of JSON
+    lines, through a queue like the root logger. Returns the started
+    listener.
+    """
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    handler = RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count
+    )
+    handler.setFormatter(JsonFormatter())
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    logger = logging.getLogger(name)
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+
+    listener = QueueListener(queue_handler.queue, handler)
+    listener.start()
+    return listener
@@ -0,0 +1,154 @@
+# api/services/telemetry_services/loop_monitor.py
+
+import asyncio
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from api.config.metrics_settings import metrics_settings
+
+from .metrics_registry import metrics_registry
+
+LOOP_LAG = "pop_event_loop_lag_seconds"
+LOOP_BLOCKED = "pop_event_loop_blocked_total"
+
+metrics_registry.describe(
+    LOOP_LAG,
+    "histogram",
+    "Delay between when a timer was due on the event loop and when it ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+metrics_registry.describe(
+    LOOP_BLOCKED,
+    "counter",
+    "Times a callback blocked the event loop longer than the threshold.",
+)
+
+
+def percentile(values: List[float], quantile: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values``, None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(math.ceil(quantile * len(ordered)) - 1, 0)]
+
+
+class LoopMonitor:
+    """
+    Measures event-loop scheduling lag and, optionally, captures what
+    blocks the loop.
+
+    Lag samples come from a task that sleeps for a fixed interval and
+    records how late it woke up; they feed a histogram and a ring buffer
+    of recent samples for percentiles.
+
+    The blocking watchdog is a thread that posts a no-op callback to the
+    loop every ``threshold`` seconds. When the callback has not run after
+    ``threshold`` seconds, the loop is stuck in some callback: the
+    watchdog records the stack of the loop thread at that moment, then
+    waits for the loop to answer and records how long it was blocked.
+    """
+
+    def __init__(
+        self,
+        history_size: int,
+        blocking_threshold: float,
+        blocking_history_size: int,
+    ):
+        self.blocking_threshold = blocking_threshold
+        self._lags: Deque[float] = deque(maxlen=history_size)
+        self._blocking: Deque[Dict[str, Any]] = deque(maxlen=blocking_history_size)
+        self._lock = threading.Lock()
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def record_lag(self, lag: float) -> None:
+        lag = max(lag, 0.0)
+        metrics_registry.observe(LOOP_LAG, (), lag)
+        with self._lock:
+            self._lags.append(lag)
+
+    def lag_summary(self) -> Dict[str, Any]:
+        """Percentiles in ms of the recent lag samples."""
+        with self._lock:
+            lags = list(self._lags)
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            "samples": len(lags),
+            "p50_ms": ms(percentile(lags, 0.5)),
+            "p90_ms": ms(percentile(lags, 0.9)),
+            "p99_ms": ms(percentile(lags, 0.99)),
+            "max_ms": ms(max(lags) if lags else None),
+        }
+
+    def blocking_calls(self) -> List[Dict[str, Any]]:
+        """Captured blocking callbacks, most recent first."""
+        with self._lock:
+            return list(reversed(self._blocking))
+
+    def start_watchdog(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start capturing callbacks that block ``loop``, from another thread."""
+        if self._watchdog is not None and self._watchdog.is_alive():
+            return
+        self._stop.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch,
+            args=(loop, threading.get_ident()),
+            name="event-loop-watchdog",
+            daemon=True,
+        )
+        self._watchdog.start()
+
+    def stop_watchdog(self) -> None:
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.blocking_threshold * 2 + 1)
+            self._watchdog = None
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        while not self._stop.wait(self.blocking_threshold):
+            answered = threading.Event()
+            sent = time.monotonic()
+            try:
+                loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                # The loop is closed
+                return
+            if answered.wait(self.blocking_threshold):
+                continue
+
+            frame = sys._current_frames().get(loop_thread_id)
+            stack = traceback.format_stack(frame) if frame is not None else []
+            # Wait for the loop to get through the blocking callback
+            while not answered.wait(0.05):
+                if self._stop.is_set():
+                    return
+            metrics_registry.inc(LOOP_BLOCKED)
+            with self._lock:
+                self._blocking.append(
+                    {
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                        "blocked_ms": round((time.monotonic() - sent) * 1000, 1),
+                        "stack": [line.rstrip("\n") for line in stack],
+                    }
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lags.clear()
+            self._blocking.clear()
+
+
+loop_monitor = LoopMonitor(
+    history_size=metrics_settings.loop_lag_history_size,
+    blocking_threshold=metrics_settings.loop_blocking_threshold_seconds,
+    blocking_history_size=metrics_settings.loop_blocking_history_size,
+)
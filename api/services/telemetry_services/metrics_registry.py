@@ -0,0 +1,185 @@
+# api/services/telemetry_services/metrics_registry.py
+
+import bisect
+import math
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from 5 ms to 30 s
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Shard:
+    """Counters and histograms written by a single thread."""
+
+    def __init__(self):
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        # (name, labels) -> [bucket counts..., sum, count]
+        self.histograms: Dict[Tuple[str, Labels], List[float]] = {}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """
+    Process-local counters and histograms rendered in the Prometheus text
+    exposition format.
+
+    Every thread records into its own shard, so the request and upstream
+    paths never take a lock; ``render`` sums the shards when scraped. With
+    several uvicorn workers each worker exposes its own series, which is
+    how Prometheus expects multi-process targets to be scraped.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._metadata: Dict[str, Tuple[str, str]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()
+
+    def describe(
+        self,
+        name: str,
+        kind: str,
+        help_text: str,
+        buckets: Optional[Sequence[float]] = None,
+    ) -> None:
+        """
+        Declare the type ('counter' or 'histogram') and help of a metric,
+        and the buckets of a histogram that does not measure latency.
+        """
+        self._metadata[name] = (kind, help_text)
+        if buckets is not None:
+            self._buckets[name] = tuple(buckets)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        """Add ``value`` to a counter."""
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """Record one observation in a histogram."""
+        histograms = self._shard().histograms
+        key = (name, labels)
+        buckets = self._buckets.get(name, self.buckets)
+        series = histograms.get(key)
+        if series is None:
+            series = histograms[key] = [0] * (len(buckets) + 3)
+        series[bisect.bisect_left(buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def _merged(self):
+        with self._shards_lock:
+            shards = list(self._shards)
+        counters: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        for shard in shards:
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0) + value
+            for key, series in list(shard.histograms.items()):
+                merged = histograms.setdefault(key, [0] * len(series))
+                for index, value in enumerate(list(series)):
+                    merged[index] += value
+        return counters, histograms
+
+    def histogram(self, name: str) -> Dict[Labels, Dict[str, object]]:
+        """
+        Return every series of a histogram as its bucket upper bounds with
+        non-cumulative counts, sum and count.
+        """
+        _, histograms = self._merged()
+        bounds = self._buckets.get(name, self.buckets) + (math.inf,)
+        return {
+            labels: {
+                "buckets": list(zip(bounds, series[:-2])),
+                "sum": series[-2],
+                "count": series[-1],
+            }
+            for (metric, labels), series in histograms.items()
+            if metric == name
+        }
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        counters, histograms = self._merged()
+        lines: List[str] = []
+        names = sorted({name for name, _ in counters} | {n for n, _ in histograms})
+        for name in names:
+            kind, help_text = self._metadata.get(name, ("untyped", ""))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(
+                        f"{name}{_format_labels(labels)} {_format_value(value)}"
+                    )
+            for (metric, labels), series in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                bounds = self._buckets.get(name, self.buckets) + (math.inf,)
+                for bound, count in zip(bounds, series[:-2]):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else repr(float(bound))
+                    bucket_labels = labels + (("le", le),)
+                    lines.append(
+                        f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+                    )
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {_format_value(series[-2])}"
+                )
+                lines.append(
+                    f"{name}_count{_format_labels(labels)} {_format_value(series[-1])}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+
+metrics_registry = MetricsRegistry()
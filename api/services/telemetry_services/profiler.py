@@ -0,0 +1,141 @@
+# api/services/telemetry_services/profiler.py
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from api.config.profiler_settings import profiler_settings
+
+# Root of the repository, stripped from the paths of the API's own frames
+_REPO_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+
+def _frame_label(frame) -> str:
+    """'function (path:first line)', paths relative to site-packages or the repo."""
+    code = frame.f_code
+    filename = code.co_filename
+    for marker in ("site-packages" + os.sep, _REPO_ROOT + os.sep):
+        index = filename.rfind(marker)
+        if index != -1:
+            filename = filename[index + len(marker) :]
+            break
+    # ';' separates frames in the collapsed format
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+class StackProfiler:
+    """
+    Sampling profiler over every thread of the process.
+
+    Every ``interval`` seconds it reads the current frame of each thread
+    (``sys._current_frames``) and counts identical stacks. Nothing is
+    installed in the interpreter, so there is no cost outside a profile
+    and, during one, the cost is one stack walk per thread per sample.
+    Stacks are returned in the collapsed format read by flamegraph.pl and
+    speedscope: ``thread;outer;...;inner count``.
+
+    With ``memory``, tracemalloc traces allocations during the profile and
+    the largest growths between the start and the end are returned.
+    Only one profile runs at a time.
+    """
+
+    def __init__(self, interval: float, memory_top: int = 25):
+        self.interval = interval
+        self.memory_top = memory_top
+        self._running = threading.Lock()
+
+    def _sample(self, counts: Counter, own_thread: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            counts[";".join(reversed(stack))] += 1
+
+    def _memory_diff(self, before, after) -> List[Dict[str, Any]]:
+        stats = after.compare_to(before, "lineno")
+        return [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size_bytes": stat.size,
+            }
+            for stat in stats[: self.memory_top]
+        ]
+
+    def profile(self, seconds: float, memory: bool = False) -> Dict[str, Any]:
+        """
+        Sample every thread for ``seconds`` and return the collapsed stacks,
+        and the tracemalloc diff when ``memory`` is set.
+
+        Raises
+        ------
+        ProfilerBusy
+            If another profile is running.
+        """
+        if not self._running.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running.")
+        started_tracing = False
+        try:
+            before = None
+            if memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    started_tracing = True
+                before = tracemalloc.take_snapshot()
+
+            counts: Counter = Counter()
+            samples = 0
+            own_thread = threading.get_ident()
+            started = time.monotonic()
+            deadline = started + seconds
+            while time.monotonic() < deadline:
+                self._sample(counts, own_thread)
+                samples += 1
+                time.sleep(self.interval)
+            elapsed = time.monotonic() - started
+
+            result: Dict[str, Any] = {
+                "seconds": round(elapsed, 3),
+                "interval_ms": self.interval * 1000,
+                "samples": samples,
+                "collapsed": [
+                    f"{stack} {count}" for stack, count in counts.most_common()
+                ],
+            }
+            if before is not None:
+                result["memory"] = self._memory_diff(
+                    before, tracemalloc.take_snapshot()
+                )
+            return result
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            self._running.release()
+
+
+def collapsed_text(profile: Dict[str, Any]) -> str:
+    """Return the stacks of a profile as a collapsed-stack file."""
+    lines: Optional[List[str]] = profile.get("collapsed")
+    return "\n".join(lines or []) + "\n"
+
+
+profiler = StackProfiler(
+    interval=profiler_settings.profiler_interval_ms / 1000,
+    memory_top=profiler_settings.profiler_memory_top,
+)
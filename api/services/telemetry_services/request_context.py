@@ -0,0 +1,65 @@
+# api/services/telemetry_services/request_context.py
+
+from contextvars import ContextVar, Token
+from typing import Dict, Optional, Tuple
+
+
+class RequestContext:
+    """
+    What the code serving a request reports about it: Server-Timing phase
+    durations, upstream calls per (service, server, action) and the user.
+
+    It is a mutable object stored in a context variable, so threads started
+    from the request (to_thread and sync dependencies copy the context)
+    report into the same object.
+    """
+
+    __slots__ = ("phases", "upstream", "user_id")
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        # (service, server, action) -> [calls, seconds, bytes]
+        self.upstream: Dict[Tuple[str, str, str], list] = {}
+        self.user_id: Optional[str] = None
+
+    def add_upstream_call(
+        self, service: str, server: str, action: str, seconds: float, size
+    ) -> None:
+        entry = self.upstream.setdefault((service, server, action), [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += size or 0
+
+
+_current: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+
+def open_request_context() -> Tuple[RequestContext, Optional[Token]]:
+    """
+    Return the context of the current request, creating it if needed. The
+    token is None when the context already existed (an outer middleware
+    owns it), otherwise pass it to ``close_request_context``.
+    """
+    context = _current.get()
+    if context is not None:
+        return context, None
+    context = RequestContext()
+    return context, _current.set(context)
+
+
+def close_request_context(token: Optional[Token]) -> None:
+    if token is not None:
+        _current.reset(token)
+
+
+def current_request() -> Optional[RequestContext]:
+    return _current.get()
+
+
+def set_request_user(user_id: Optional[str]) -> None:
+    """Record the authenticated user of the current request, if any."""
+    context = _current.get()
+    if context is not None:
+        context.user_id = user_id
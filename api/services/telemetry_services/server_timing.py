@@ -0,0 +1,39 @@
+# api/services/telemetry_services/server_timing.py
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from .request_context import current_request
+
+
+def add_phase(name: str, seconds: float) -> None:
+    """Add ``seconds`` to a phase of the current request, if any."""
+    context = current_request()
+    if context is not None:
+        context.phases[name] = context.phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed_phase(name: str) -> Iterator[None]:
+    """Time the block as a phase of the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase(name, time.perf_counter() - started)
+
+
+def current_phases() -> Dict[str, float]:
+    context = current_request()
+    return dict(context.phases) if context is not None else {}
+
+
+def format_server_timing(phases: Dict[str, float], total: float) -> str:
+    """
+    Format phases and the total time, in seconds, as a Server-Timing header
+    value with durations in milliseconds.
+    """
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in phases.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
@@ -0,0 +1,111 @@
+# api/services/telemetry_services/slow_requests.py
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from api.config.metrics_settings import metrics_settings
+
+from .metrics_registry import metrics_registry
+
+SLOW_REQUESTS = "pop_slow_requests_total"
+
+metrics_registry.describe(
+    SLOW_REQUESTS,
+    "counter",
+    "Requests slower than the slow-request threshold, by method and route.",
+)
+
+# Has its own rotating file (SLOW_REQUEST_LOG_FILE) when configured
+# in main.py, otherwise it propagates to the application log
+logger = logging.getLogger("api.slow_requests")
+
+# Parameter names containing one of these are redacted
+SENSITIVE_KEYS = (
+    "password",
+    "token",
+    "secret",
+    "api_key",
+    "apikey",
+    "authorization",
+    "credential",
+)
+REDACTED = "***"
+MAX_STRING_LENGTH = 1000
+
+
+def sanitize(value: Any) -> Any:
+    """
+    Return a copy of a decoded request parameter with the values of
+    sensitive keys redacted and long strings truncated, at any depth.
+    """
+    if isinstance(value, dict):
+        return {
+            key: (
+                REDACTED
+                if any(word in str(key).lower() for word in SENSITIVE_KEYS)
+                else sanitize(item)
+            )
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    if isinstance(value, str) and len(value) > MAX_STRING_LENGTH:
+        return value[:MAX_STRING_LENGTH] + "..."
+    return value
+
+
+class SlowRequestLog:
+    """
+    Ring buffer of the most recent requests slower than ``threshold``
+    seconds, each also written to the slow-request log.
+    """
+
+    def __init__(self, threshold: float, size: int):
+        self.threshold = threshold
+        self._requests: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        metrics_registry.inc(
+            SLOW_REQUESTS, (("method", entry["method"]), ("route", entry["route"]))
+        )
+        with self._lock:
+            self._requests.append(entry)
+        logger.warning(
+            "Slow request: %s %s took %.0f ms",
+            entry["method"],
+            entry["route"],
+            entry["duration_ms"],
+            extra={"slow_request": entry},
+        )
+
+    def recent(
+        self,
+        route: Optional[str] = None,
+        user_id: Optional[str] = None,
+        min_duration_ms: float = 0,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Recorded requests matching the filters, most recent first."""
+        with self._lock:
+            requests = list(reversed(self._requests))
+        matching = [
+            entry
+            for entry in requests
+            if (route is None or entry["route"] == route)
+            and (user_id is None or entry["user_id"] == user_id)
+            and entry["duration_ms"] >= min_duration_ms
+        ]
+        return matching[:limit] if limit is not None else matching
+
+    def clear(self) -> None:
+        with self._lock:
+            self._requests.clear()
+
+
+slow_requests = SlowRequestLog(
+    threshold=metrics_settings.slow_request_threshold_seconds,
+    size=metrics_settings.slow_request_history_size,
+)
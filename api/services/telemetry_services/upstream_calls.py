@@ -0,0 +1,265 @@
+# api/services/telemetry_services/upstream_calls.py
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from ckanapi import RemoteCKAN
+
+from api.config.metrics_settings import metrics_settings
+from api.config.upstream_settings import upstream_settings
+
+from .circuit_breaker import circuit_breakers, is_upstream_failure, retry_read
+from .metrics_registry import metrics_registry
+from .request_context import current_request
+from .server_timing import add_phase
+
+UPSTREAM_DURATION = "pop_upstream_call_duration_seconds"
+UPSTREAM_RESPONSE_BYTES = "pop_upstream_response_bytes"
+
+metrics_registry.describe(
+    UPSTREAM_DURATION,
+    "histogram",
+    "Latency in seconds of calls to CKAN and Keycloak by service, server, "
+    "action and outcome.",
+)
+metrics_registry.describe(
+    UPSTREAM_RESPONSE_BYTES,
+    "histogram",
+    "Size in bytes of CKAN and Keycloak responses by service, server and action.",
+    buckets=(1e3, 1e4, 1e5, 1e6, 1e7, 1e8),
+)
+
+
+class SlowCallLog:
+    """
+    The ``size`` slowest upstream calls of the last ``window`` seconds.
+
+    Kept as a small list: inserting drops expired calls and, when full,
+    replaces the fastest call if the new one is slower.
+    """
+
+    def __init__(self, size: int, window: float):
+        self.size = size
+        self.window = window
+        self._calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        self._calls = [c for c in self._calls if now - c["_at"] <= self.window]
+
+    def add(self, call: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = {**call, "_at": now}
+            if len(self._calls) < self.size:
+                self._calls.append(entry)
+                return
+            fastest = min(self._calls, key=lambda c: c["duration_ms"])
+            if call["duration_ms"] > fastest["duration_ms"]:
+                self._calls.remove(fastest)
+                self._calls.append(entry)
+
+    def slowest(self) -> List[Dict[str, Any]]:
+        """Return the retained calls, slowest first."""
+        with self._lock:
+            self._expire(time.monotonic())
+            calls = sorted(self._calls, key=lambda c: -c["duration_ms"])
+        return [{k: v for k, v in c.items() if k != "_at"} for c in calls]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._calls = []
+
+
+slow_calls = SlowCallLog(
+    size=metrics_settings.upstream_slow_calls_size,
+    window=metrics_settings.upstream_slow_calls_window_seconds,
+)
+
+
+# CKAN actions that only read, and can be retried
+READ_ACTION_SUFFIXES = ("_show", "_list", "_search", "_autocomplete")
+
+
+class UpstreamCall:
+    """Details of an in-progress upstream call, filled in by the caller."""
+
+    def __init__(self):
+        self.size: Optional[int] = None
+        self.outcome = "ok"
+        self.failed = False
+
+    def response(self, response) -> None:
+        """Take size and outcome from a ``requests`` response."""
+        self.size = len(response.content)
+        if response.status_code >= 400:
+            self.outcome = f"http_{response.status_code}"
+        if response.status_code >= 500:
+            self.failed = True
+
+
+@contextmanager
+def upstream_call(service: str, server: str, action: str) -> Iterator[UpstreamCall]:
+    """
+    Time a call to an upstream service and record it.
+
+    The latency goes to the upstream histogram, the response size, when
+    the caller sets it, to the size histogram, and the call to the
+    slow-call log, and it counts toward the 'upstream' Server-Timing
+    phase and the upstream breakdown of the current request. An
+    exception leaving the block is recorded as the outcome under its
+    class name and re-raised.
+
+    The call goes through the circuit breaker of the server: when it is
+    open, ``CircuitOpenError`` is raised before the block runs.
+    """
+    breaker = None
+    probe = False
+    if upstream_settings.circuit_breaker_enabled:
+        breaker = circuit_breakers.get(service, server)
+        probe = breaker.acquire()
+    call = UpstreamCall()
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception as exc:
+        call.outcome = type(exc).__name__
+        call.failed = is_upstream_failure(exc)
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        if breaker is not None:
+            breaker.release(duration, call.failed, probe)
+        add_phase("upstream", duration)
+        context = current_request()
+        if context is not None:
+            context.add_upstream_call(service, server, action, duration, call.size)
+        metrics_registry.observe(
+            UPSTREAM_DURATION,
+            (
+                ("service", service),
+                ("server", server),
+                ("action", action),
+                ("outcome", call.outcome),
+            ),
+            duration,
+        )
+        if call.size is not None:
+            metrics_registry.observe(
+                UPSTREAM_RESPONSE_BYTES,
+                (("service", service), ("server", server), ("action", action)),
+                call.size,
+            )
+        slow_calls.add(
+            {
+                "service": service,
+                "server": server,
+                "action": action,
+                "duration_ms": round(duration * 1000, 1),
+                "size_bytes": call.size,
+                "outcome": call.outcome,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+
+
+class InstrumentedRemoteCKAN(RemoteCKAN):
+    """
+    RemoteCKAN that records every action call as an upstream call of
+    the given server ('local', 'global' or 'pre_ckan').
+
+    Calls time out after UPSTREAM_TIMEOUT_SECONDS instead of waiting
+    forever, and read actions that fail because the server is unavailable
+    are retried with jittered backoff.
+    """
+
+    # Size of the last raw response, per thread, since one client may be
+    # shared by concurrent calls
+    _last_size = threading.local()
+
+    def __init__(self, address, server: str = "local", **kwargs):
+        super().__init__(address, **kwargs)
+        self.server = server
+
+    def call_action(
+        self,
+        action,
+        data_dict=None,
+        context=None,
+        apikey=None,
+        files=None,
+        requests_kwargs=None,
+    ):
+        requests_kwargs = dict(requests_kwargs or {})
+        requests_kwargs.setdefault(
+            "timeout", upstream_settings.upstream_timeout_seconds
+        )
+
+        def attempt():
+            with upstream_call("ckan", self.server, action) as call:
+                self._last_size.value = None
+                try:
+                    return super(InstrumentedRemoteCKAN, self).call_action(
+                        action, data_dict, context, apikey, files, requests_kwargs
+                    )
+                finally:
+                    call.size = self._last_size.value
+
+        if not files and action.endswith(READ_ACTION_SUFFIXES):
+            return retry_read(attempt)
+        return attempt()
+
+    @property
+    def last_response_size(self) -> Optional[int]:
+        """Size in bytes of the last response received by this thread."""
+        return getattr(self._last_size, "value", None)
+
+    def _request_fn(self, url, data, headers, files, requests_kwargs):
+        status, response = super()._request_fn(
+            url, data, headers, files, requests_kwargs
+        )
+        self._last_size.value = len(response)
+        return status, response
+
+    def _request_fn_get(self, url, data_dict, headers, requests_kwargs):
+        status, response = super()._request_fn_get(
+            url, data_dict, headers, requests_kwargs
+        )
+        self._last_size.value = len(response)
+        return status, response
+
+
+def percentile_from_buckets(buckets, count: int, quantile: float) -> Optional[float]:
+    """Estimate a quantile as the upper bound of the bucket reaching it."""
+    if not count:
+        return None
+    target = math.ceil(count * quantile)
+    seen = 0
+    for bound, bucket_count in buckets:
+        seen += bucket_count
+        if seen >= target:
+            return bound
+    return math.inf
+
+
+def upstream_summary() -> List[Dict[str, Any]]:
+    """
+    Summarize the upstream latency histogram per service, server, action
+    and outcome: call count, mean and bucket-based p50/p95 in ms.
+    """
+    summary = []
+    for labels, series in metrics_registry.histogram(UPSTREAM_DURATION).items():
+        count = series["count"]
+        entry = dict(labels)
+        entry["count"] = count
+        entry["mean_ms"] = round(series["sum"] / count * 1000, 1) if count else None
+        for name, quantile in (("p50_ms", 0.5), ("p95_ms", 0.95)):
+            bound = percentile_from_buckets(series["buckets"], count, quantile)
+            entry[name] = None if bound is None or bound == math.inf else bound * 1000
+        summary.append(entry)
+    return sorted(summary, key=lambda e: -(e["mean_ms"] or 0))
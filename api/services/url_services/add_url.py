@@ -2,6 +2,7 @@
 import json
 
 from api.config import ckan_settings, dxspaces_settings
+from api.services.dataset_services.create_package import create_package
 
 RESERVED_KEYS = {
     "name",
@@ -101,33 +102,30 @@ def add_url(
     extras_cleaned = extras.copy() if extras else {}
     extras_cleaned.update(url_extras)
 
+    resource_package_dict = {
+        "name": resource_name,
+        "title": resource_title,
+        "owner_org": owner_org,
+        "notes": notes,
+        "extras": [{"key": k, "value": v} for k, v in extras_cleaned.items()],
+    }
+    resource_dict = {
+        "url": resource_url,
+        "name": resource_name,
+        "description": f"Resource pointing to {resource_url}",
+        "format": "url",
+    }
+
+    # Create the package and its resource in a single package_create call
     try:
-        resource_package_dict = {
-            "name": resource_name,
-            "title": resource_title,
-            "owner_org": owner_org,
-            "notes": notes,
-            "extras": [{"key": k, "value": v} for k, v in extras_cleaned.items()],
-        }
-
-        resource_package = ckan_instance.action.package_create(**resource_package_dict)
+        resource_package = create_package(
+            ckan_instance, resource_package_dict, [resource_dict]
+        )
         resource_package_id = resource_package["id"]
-
     except Exception as e:
         raise Exception(f"Error creating resource package: {str(e)}")
 
     if resource_package_id:
-        try:
-            ckan_instance.action.resource_create(
-                package_id=resource_package_id,
-                url=resource_url,
-                name=resource_name,
-                description=f"Resource pointing to {resource_url}",
-                format="url",
-            )
-        except Exception as e:
-            raise Exception(f"Error creating resource: {str(e)}")
-
         return resource_package_id
     else:
         raise Exception("Unknown error occurred")
@@ -1,18 +1,29 @@
 # api/services/url_services/update_dataset.py
+from typing import Optional
+
 from api.config import ckan_settings
 from api.models.update_dataset_model import DatasetUpdateRequest
+from api.services.dataset_services.dataset_cache import dataset_cache
 
 
 async def update_dataset(
-    dataset_id: str, data: DatasetUpdateRequest, ckan_instance=None
+    dataset_id: str,
+    data: DatasetUpdateRequest,
+    ckan_instance=None,
+    if_match: Optional[str] = None,
 ):
     if ckan_instance is None:
         ckan_instance = ckan_settings.ckan
 
-    try:
-        dataset = ckan_instance.action.package_show(id=dataset_id)
-    except Exception as e:
-        raise Exception(f"Cannot fetch dataset {dataset_id}: {e}")
+    dataset = dataset_cache.match(ckan_instance, dataset_id, if_match)
+    if dataset is None:
+        try:
+            dataset = dataset_cache.show(
+                ckan_instance, dataset_id, refresh=bool(if_match)
+            )
+        except Exception as e:
+            raise Exception(f"Cannot fetch dataset {dataset_id}: {e}")
+        dataset_cache.check(dataset, if_match)
 
     existing_tags = {tag["name"] for tag in dataset.get("tags", [])}
     new_tags = set(data.tags or [])
@@ -38,10 +49,17 @@ async def update_dataset(
     }
 
     try:
-        ckan_instance.action.package_patch(**patch_fields)
+        patched = ckan_instance.action.package_patch(**patch_fields)
     except Exception as e:
+        dataset_cache.forget(ckan_instance, dataset_id)
         raise Exception(f"Failed to patch dataset {dataset_id}: {e}")
 
+    if data.resources:
+        # New resources bump the package version without returning it
+        dataset_cache.forget(ckan_instance, dataset_id)
+    else:
+        dataset_cache.remember(ckan_instance, patched)
+
     if data.resources:
         for res in data.resources:
             try:
@@ -5,6 +5,8 @@ import logging
 from typing import Any, Dict, Optional
 
 from api.config.ckan_settings import ckan_settings
+from api.services.dataset_services.dataset_cache import dataset_cache
+from api.services.dataset_services.name_index import dataset_names
 
 logger = logging.getLogger(__name__)
 
@@ -35,20 +37,28 @@ async def update_url(
     mapping: Optional[Dict[str, str]] = None,
     processing: Optional[Dict[str, Any]] = None,
     ckan_instance=None,  # new optional param for server selection
+    if_match: Optional[str] = None,
 ):
     """
     Update an existing URL resource in CKAN, allowing a custom ckan_instance.
     If ckan_instance is None, defaults to ckan_settings.ckan.
+    If if_match is given, it must name the current dataset version.
     """
 
     if ckan_instance is None:
         ckan_instance = ckan_settings.ckan
 
-    # Fetch the existing resource data
-    try:
-        resource = ckan_instance.action.package_show(id=resource_id)
-    except Exception as e:
-        raise Exception(f"Error fetching resource with ID {resource_id}: {str(e)}")
+    # Reuse the version the client last saw when it is still current
+    resource = dataset_cache.match(ckan_instance, resource_id, if_match)
+    if resource is None:
+        # Fetch the existing resource data
+        try:
+            resource = dataset_cache.show(
+                ckan_instance, resource_id, refresh=bool(if_match)
+            )
+        except Exception as e:
+            raise Exception(f"Error fetching resource with ID {resource_id}: {str(e)}")
+        dataset_cache.check(resource, if_match)
 
     # Extract current file type and processing from the resource
     current_extras = {
@@ -96,7 +106,9 @@ async def update_url(
 
     # Perform the update
     try:
-        ckan_instance.action.package_update(id=resource_id, **updated_data)
+        updated_resource = ckan_instance.action.package_update(
+            id=resource_id, **updated_data
+        )
 
         # Update the resource URL if it has changed
         if resource_url:
@@ -107,8 +119,15 @@ async def update_url(
                     )
                     break
     except Exception as e:
+        dataset_cache.forget(ckan_instance, resource_id)
         raise Exception(f"Error updating resource with ID {resource_id}: {str(e)}")
 
+    # A resource URL change bumps the package version without returning it
+    if resource_url:
+        dataset_cache.forget(ckan_instance, resource_id)
+    else:
+        dataset_cache.remember(ckan_instance, updated_resource)
+    dataset_names.rename(ckan_instance, resource["name"], updated_data["name"])
     return {"message": "Resource updated successfully"}
 
 
@@ -0,0 +1,22 @@
+# api/tasks/health_task.py
+
+import asyncio
+import logging
+
+from api.config.health_settings import health_settings
+from api.services.status_services import health_monitor
+
+logger = logging.getLogger(__name__)
+
+
+async def run_health_checks():
+    """
+    Check CKAN and Keycloak every ``health_check_interval_seconds`` and
+    store the snapshot served by /status/ and the dashboard.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(health_monitor.run)
+        except Exception as e:
+            logger.error(f"Error running health checks: {e}")
+        await asyncio.sleep(health_settings.health_check_interval_seconds)
@@ -0,0 +1,25 @@
+# api/tasks/loop_lag_task.py
+
+import asyncio
+
+from api.config.metrics_settings import metrics_settings
+from api.services.telemetry_services import loop_monitor
+
+
+async def monitor_event_loop():
+    """
+    Measure how late the event loop runs a timer every
+    ``loop_lag_interval_seconds`` and, when enabled, watch for callbacks
+    blocking the loop longer than ``loop_blocking_threshold_seconds``.
+    """
+    loop = asyncio.get_running_loop()
+    interval = metrics_settings.loop_lag_interval_seconds
+    if metrics_settings.loop_blocking_capture_enabled:
+        loop_monitor.start_watchdog(loop)
+    try:
+        while True:
+            due = loop.time() + interval
+            await asyncio.sleep(interval)
+            loop_monitor.record_lag(loop.time() - due)
+    finally:
+        loop_monitor.stop_watchdog()
@@ -0,0 +1,22 @@
+# api/tasks/metrics_sampler_task.py
+
+import asyncio
+import logging
+
+from api.config.metrics_settings import metrics_settings
+from api.services.status_services import metrics_sampler
+
+logger = logging.getLogger(__name__)
+
+
+async def sample_system_metrics():
+    """
+    Record a system metrics sample every ``metrics_sample_interval_seconds``
+    into the ring buffer read by /status/metrics.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(metrics_sampler.sample)
+        except Exception as e:
+            logger.error(f"Error sampling system metrics: {e}")
+        await asyncio.sleep(metrics_settings.metrics_sample_interval_seconds)
@@ -0,0 +1,31 @@
+# api/tasks/name_index_task.py
+
+import asyncio
+import logging
+
+from api.config.cache_settings import cache_settings
+from api.config.ckan_settings import ckan_settings
+from api.services.dataset_services import dataset_names
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_dataset_names():
+    """
+    Periodically rebuild the dataset name index of every CKAN server the
+    API registers datasets on (local and, if enabled, pre-CKAN).
+    """
+    while True:
+        servers = []
+        if ckan_settings.ckan_local_enabled:
+            servers.append(("local", ckan_settings.ckan))
+        if ckan_settings.pre_ckan_enabled:
+            servers.append(("pre_ckan", ckan_settings.pre_ckan))
+
+        for label, ckan_instance in servers:
+            try:
+                await asyncio.to_thread(dataset_names.refresh, ckan_instance)
+            except Exception as e:
+                logger.error(f"Failed to refresh {label} dataset names: {e}")
+
+        await asyncio.sleep(cache_settings.dataset_name_refresh_seconds)
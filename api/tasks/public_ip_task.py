@@ -0,0 +1,16 @@
+# api/tasks/public_ip_task.py
+
+import asyncio
+
+from api.config.metrics_settings import metrics_settings
+from api.services.status_services import refresh_public_ip
+
+
+async def refresh_public_ip_periodically():
+    """
+    Refresh the public IP resolved at startup every
+    ``public_ip_refresh_seconds``, so metrics reads never wait on it.
+    """
+    while True:
+        await asyncio.sleep(metrics_settings.public_ip_refresh_seconds)
+        await asyncio.to_thread(refresh_public_ip)
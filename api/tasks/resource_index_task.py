@@ -0,0 +1,48 @@
+# api/tasks/resource_index_task.py
+
+import asyncio
+import logging
+import time
+
+from api.config.cache_settings import cache_settings
+from api.config.ckan_settings import ckan_settings
+from api.services.dataset_services import resource_index
+
+logger = logging.getLogger(__name__)
+
+
+def indexed_servers():
+    """Return the (label, CKAN instance) pairs covered by the resource index."""
+    servers = [("global", ckan_settings.ckan_global)]
+    if ckan_settings.ckan_local_enabled:
+        servers.append(("local", ckan_settings.ckan_no_api_key))
+    if ckan_settings.pre_ckan_enabled:
+        servers.append(("pre_ckan", ckan_settings.pre_ckan_no_api_key))
+    return servers
+
+
+async def refresh_resource_index():
+    """
+    Rebuild the resource index of every server periodically, and re-read
+    datasets changed by resource writes in between.
+    """
+    last_refresh = None
+    while True:
+        full = (
+            last_refresh is None
+            or time.monotonic() - last_refresh
+            >= cache_settings.resource_index_refresh_seconds
+        )
+        if full:
+            last_refresh = time.monotonic()
+
+        for label, ckan_instance in indexed_servers():
+            try:
+                if full:
+                    await asyncio.to_thread(resource_index.refresh, ckan_instance)
+                else:
+                    await asyncio.to_thread(resource_index.resolve, ckan_instance)
+            except Exception as e:
+                logger.error(f"Failed to update {label} resource index: {e}")
+
+        await asyncio.sleep(cache_settings.resource_index_stale_seconds)
@@ -0,0 +1,31 @@
+# api/tasks/service_health_task.py
+
+import asyncio
+import logging
+
+from api.config.health_settings import health_settings
+from api.services.service_services import discover_services, service_health
+from api.tasks.resource_index_task import indexed_servers
+
+logger = logging.getLogger(__name__)
+
+
+async def poll_service_health():
+    """
+    Every ``service_health_interval_seconds``, list the services registered
+    on each catalog and probe their health check URLs.
+    """
+    while True:
+        services = []
+        for label, ckan_instance in indexed_servers():
+            try:
+                services.extend(
+                    await asyncio.to_thread(discover_services, ckan_instance, label)
+                )
+            except Exception as e:
+                logger.error(f"Failed to list {label} services: {e}")
+        try:
+            await service_health.poll(services)
+        except Exception as e:
+            logger.error(f"Error probing service health: {e}")
+        await asyncio.sleep(health_settings.service_health_interval_seconds)
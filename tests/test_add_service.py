@@ -45,7 +45,7 @@ class TestAddService:
 
         assert result == "service-123"
         mock_ckan.action.package_create.assert_called_once()
-        mock_ckan.action.resource_create.assert_called_once()
+        mock_ckan.action.resource_create.assert_not_called()
 
     def test_add_service_all_parameters(self, mock_ckan_settings):
         """Test add_service with all parameters provided."""
@@ -86,11 +86,10 @@ class TestAddService:
         assert extras_dict["version"] == "1.0"
         assert extras_dict["environment"] == "production"
 
-        # Verify resource_create call
-        resource_call = mock_ckan.action.resource_create.call_args
-        resource_data = resource_call[1]
+        # Verify the resource was embedded in the package_create call
+        assert len(package_data["resources"]) == 1
+        resource_data = package_data["resources"][0]
 
-        assert resource_data["package_id"] == "service-456"
         assert resource_data["url"] == "http://api.example.com/v1"
         assert resource_data["name"] == "full_service"
         assert resource_data["format"] == "service"
@@ -114,7 +113,7 @@ class TestAddService:
 
         assert result == "custom-789"
         custom_ckan.action.package_create.assert_called_once()
-        custom_ckan.action.resource_create.assert_called_once()
+        custom_ckan.action.resource_create.assert_not_called()
         # Default CKAN should not be called
         mock_ckan_settings.ckan.action.package_create.assert_not_called()
 
@@ -167,17 +166,17 @@ class TestAddService:
                 service_url="http://api.example.com",
             )
 
-    def test_add_service_resource_create_error(self, mock_ckan_settings):
-        """Test add_service when resource creation fails."""
-        # Setup mock where package creation succeeds but resource creation fails
+    def test_add_service_resource_rollback(self, mock_ckan_settings):
+        """Test add_service purges the package if its resource is missing."""
+        # Setup mock where the package comes back without its resource
         mock_ckan = MagicMock()
-        mock_ckan.action.package_create.return_value = {"id": "service-123"}
-        mock_ckan.action.resource_create.side_effect = Exception(
-            "Resource creation failed"
-        )
+        mock_ckan.action.package_create.return_value = {
+            "id": "service-123",
+            "resources": [],
+        }
         mock_ckan_settings.ckan = mock_ckan
 
-        with pytest.raises(Exception, match="Error creating service resource"):
+        with pytest.raises(Exception, match="rolled back"):
             add_service(
                 service_name="failing_resource_service",
                 service_title="Failing Resource Service",
@@ -185,6 +184,8 @@ class TestAddService:
                 service_url="http://api.example.com",
             )
 
+        mock_ckan.action.dataset_purge.assert_called_once_with(id="service-123")
+
     def test_add_service_no_package_id_returned(self, mock_ckan_settings):
         """Test add_service when package creation returns no ID."""
         # Setup mock to return empty dict
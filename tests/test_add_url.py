@@ -50,7 +50,7 @@ class TestAddUrl:
 
         assert result == "package-123"
         mock_ckan.action.package_create.assert_called_once()
-        mock_ckan.action.resource_create.assert_called_once()
+        mock_ckan.action.resource_create.assert_not_called()
 
     def test_add_url_all_parameters(self, mock_dxspaces_settings, mock_ckan_settings):
         """Test add_url with all parameters provided."""
@@ -91,11 +91,10 @@ class TestAddUrl:
         assert '"field1": "col1"' in extras_dict["mapping"]
         assert '"delimiter": ","' in extras_dict["processing"]
 
-        # Verify resource_create call
-        resource_call = mock_ckan.action.resource_create.call_args
-        resource_data = resource_call[1]
+        # Verify the resource was embedded in the package_create call
+        assert len(package_data["resources"]) == 1
+        resource_data = package_data["resources"][0]
 
-        assert resource_data["package_id"] == "package-456"
         assert resource_data["url"] == "http://example.com/data.csv"
         assert resource_data["name"] == "full_resource"
         assert resource_data["format"] == "url"
@@ -120,7 +119,7 @@ class TestAddUrl:
 
         assert result == "custom-789"
         custom_ckan.action.package_create.assert_called_once()
-        custom_ckan.action.resource_create.assert_called_once()
+        custom_ckan.action.resource_create.assert_not_called()
         # Default CKAN should not be called
         mock_ckan_settings.ckan.action.package_create.assert_not_called()
 
@@ -257,20 +256,20 @@ class TestAddUrl:
                 resource_url="http://example.com/data",
             )
 
-    def test_add_url_resource_create_error(
+    def test_add_url_resource_rollback(
         self, mock_dxspaces_settings, mock_ckan_settings
     ):
-        """Test add_url when resource creation fails."""
-        # Setup mock where package creation succeeds but resource creation fails
+        """Test add_url purges the package if its resource is missing."""
+        # Setup mock where the package comes back without its resource
         mock_ckan = MagicMock()
-        mock_ckan.action.package_create.return_value = {"id": "package-123"}
-        mock_ckan.action.resource_create.side_effect = Exception(
-            "Resource creation failed"
-        )
+        mock_ckan.action.package_create.return_value = {
+            "id": "package-123",
+            "resources": [],
+        }
         mock_ckan_settings.ckan = mock_ckan
         mock_dxspaces_settings.registration_methods = {"url": False}
 
-        with pytest.raises(Exception, match="Error creating resource"):
+        with pytest.raises(Exception, match="rolled back"):
             add_url(
                 resource_name="failing_resource",
                 resource_title="Failing Resource",
@@ -278,6 +277,8 @@ class TestAddUrl:
                 resource_url="http://example.com/data",
             )
 
+        mock_ckan.action.dataset_purge.assert_called_once_with(id="package-123")
+
     def test_add_url_no_package_id_returned(
         self, mock_dxspaces_settings, mock_ckan_settings
     ):
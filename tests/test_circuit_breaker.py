@@ -0,0 +1,216 @@
+# tests/test_circuit_breaker.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from ckanapi import CKANAPIError, NotFound
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.status_services import health_monitor
+from api.services.telemetry_services import (
+    CircuitBreaker,
+    CircuitOpenError,
+    circuit_breakers,
+    retry_read,
+)
+from api.services.telemetry_services.circuit_breaker import is_upstream_failure
+from api.services.telemetry_services.upstream_calls import (
+    InstrumentedRemoteCKAN,
+    upstream_call,
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_breakers():
+    circuit_breakers.clear()
+    yield
+    circuit_breakers.clear()
+
+
+def make_breaker(**overrides):
+    settings = {
+        "window": 60,
+        "min_calls": 4,
+        "error_rate": 0.5,
+        "slow_call_seconds": 1,
+        "slow_call_rate": 0.75,
+        "open_seconds": 30,
+        "half_open_probes": 1,
+    }
+    settings.update(overrides)
+    return CircuitBreaker("ckan", "global", **settings)
+
+
+def test_breaker_opens_on_error_rate_and_fails_fast():
+    breaker = make_breaker()
+    for failed in (False, True, False):
+        breaker.release(0.1, failed)
+    assert breaker.state == "closed"
+
+    breaker.release(0.1, True)
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError, match="ckan \\(global\\) is unavailable"):
+        breaker.acquire()
+
+
+def test_breaker_opens_on_slow_call_rate():
+    breaker = make_breaker()
+    for duration in (2, 2, 0.1, 2):
+        breaker.release(duration, False)
+
+    assert breaker.state == "open"
+
+
+def test_breaker_window_forgets_old_calls():
+    breaker = make_breaker(window=10)
+    with patch("time.monotonic", return_value=100.0):
+        for _ in range(3):
+            breaker.release(0.1, True)
+    with patch("time.monotonic", return_value=200.0):
+        breaker.release(0.1, True)
+        assert breaker.state == "closed"
+        assert breaker.snapshot()["calls"] == 1
+
+
+def test_half_open_probe_closes_or_reopens_the_breaker():
+    breaker = make_breaker(min_calls=1)
+    with patch("time.monotonic", return_value=100.0):
+        breaker.release(0.1, True)
+    assert breaker.state == "open"
+
+    with patch("time.monotonic", return_value=131.0):
+        assert breaker.acquire() is True
+        assert breaker.state == "half_open"
+        # Only one probe at a time
+        with pytest.raises(CircuitOpenError):
+            breaker.acquire()
+        breaker.release(0.1, True, probe=True)
+        assert breaker.state == "open"
+
+    with patch("time.monotonic", return_value=162.0):
+        probe = breaker.acquire()
+        breaker.release(0.1, False, probe=probe)
+        assert breaker.state == "closed"
+        assert breaker.acquire() is False
+
+
+def test_only_unavailability_counts_as_failure():
+    server_error = requests.HTTPError(response=MagicMock(status_code=503))
+    client_error = requests.HTTPError(response=MagicMock(status_code=401))
+
+    assert is_upstream_failure(requests.ConnectionError())
+    assert is_upstream_failure(requests.Timeout())
+    assert is_upstream_failure(server_error)
+    assert is_upstream_failure(CKANAPIError("<html>Bad Gateway</html>"))
+    assert not is_upstream_failure(client_error)
+    assert not is_upstream_failure(NotFound("missing"))
+    assert not is_upstream_failure(ValueError())
+
+
+def test_retry_read_retries_failures_with_jitter():
+    server_error = requests.HTTPError(response=MagicMock(status_code=502))
+    read = MagicMock(side_effect=[requests.ConnectionError(), server_error, 42])
+
+    with patch("time.sleep") as sleep, patch("random.uniform", return_value=0.01):
+        assert retry_read(read, retries=2, backoff=0.5) == 42
+
+    assert read.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_retry_read_does_not_retry_request_errors():
+    read = MagicMock(side_effect=NotFound("missing"))
+
+    with patch("time.sleep"), pytest.raises(NotFound):
+        retry_read(read, retries=2, backoff=0)
+
+    assert read.call_count == 1
+
+
+def test_retry_read_does_not_retry_timeouts():
+    read = MagicMock(side_effect=requests.Timeout())
+
+    with patch("time.sleep") as sleep, pytest.raises(requests.Timeout):
+        retry_read(read, retries=2, backoff=0.5)
+
+    assert read.call_count == 1
+    sleep.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_retry_read_does_not_sleep_on_the_event_loop():
+    read = MagicMock(side_effect=requests.ConnectionError())
+
+    with patch("time.sleep") as sleep, pytest.raises(requests.ConnectionError):
+        retry_read(read, retries=2, backoff=0.5)
+
+    assert read.call_count == 1
+    sleep.assert_not_called()
+
+
+def test_breaker_opens_on_consecutive_failures():
+    # A hanging server: each call times out, so the window never fills
+    breaker = make_breaker(min_calls=10, consecutive_failures=3)
+    for failed in (True, True, False, True, True):
+        breaker.release(30, failed)
+    assert breaker.state == "closed"
+
+    breaker.release(30, True)
+
+    assert breaker.state == "open"
+
+
+def test_ckan_reads_are_retried_with_a_timeout_and_writes_are_not():
+    ckan = InstrumentedRemoteCKAN("http://ckan.test", server="global")
+    ckan.session = MagicMock()
+    ckan.session.post.side_effect = [
+        requests.ConnectionError(),
+        MagicMock(status_code=200, text='{"success": true, "result": {"count": 0}}'),
+    ]
+
+    with patch("time.sleep"):
+        assert ckan.action.package_search(q="*:*") == {"count": 0}
+
+    assert ckan.session.post.call_count == 2
+    assert ckan.session.post.call_args.kwargs["timeout"] > 0
+
+    ckan.session.post.reset_mock()
+    ckan.session.post.side_effect = requests.ConnectionError()
+    with patch("time.sleep"), pytest.raises(requests.ConnectionError):
+        ckan.action.package_create(name="x")
+    assert ckan.session.post.call_count == 1
+
+
+def test_open_circuit_skips_the_upstream_and_shows_on_status():
+    breaker = circuit_breakers.get("ckan", "global")
+    breaker.min_calls = 1
+    with pytest.raises(requests.ConnectionError):
+        with upstream_call("ckan", "global", "package_search"):
+            raise requests.ConnectionError()
+
+    ckan = InstrumentedRemoteCKAN("http://ckan.test", server="global")
+    ckan.session = MagicMock()
+    with pytest.raises(CircuitOpenError):
+        ckan.action.package_search(q="*:*")
+    ckan.session.post.assert_not_called()
+
+    health_monitor.clear()
+    with (
+        patch("api.services.status_services.check_ckan_status", return_value=True),
+        patch(
+            "api.services.status_services.check_api_status.get_client_token",
+            return_value="token",
+        ),
+    ):
+        body = client.get("/status/").json()
+    health_monitor.clear()
+
+    [state] = [b for b in body["circuit_breakers"] if b["server"] == "global"]
+    assert state["service"] == "ckan"
+    assert state["state"] == "open"
+    assert state["retry_in_seconds"] > 0
@@ -0,0 +1,227 @@
+# tests/test_dataset_cache.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ckanapi import NotFound
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.dataset_services.create_package import create_package
+from api.services.dataset_services.dataset_cache import (
+    DatasetCache,
+    PreconditionFailed,
+    dataset_cache,
+    dataset_etag,
+    etag_matches,
+)
+from api.services.dataset_services.general_dataset import (
+    patch_general_dataset,
+    update_general_dataset,
+)
+from api.services.kafka_services.update_kafka import update_kafka
+
+client = TestClient(app)
+
+
+def make_dataset(modified="2024-01-01T00:00:00"):
+    return {
+        "id": "ds-1",
+        "name": "dataset_one",
+        "title": "Dataset One",
+        "owner_org": "org",
+        "metadata_modified": modified,
+        "extras": [],
+        "resources": [],
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_versions():
+    dataset_cache.clear()
+    yield
+    dataset_cache.clear()
+
+
+def test_etag_changes_with_metadata_modified():
+    first = dataset_etag(make_dataset("2024-01-01T00:00:00"))
+    second = dataset_etag(make_dataset("2024-01-02T00:00:00"))
+
+    assert first.startswith('"') and first.endswith('"')
+    assert first != second
+    assert dataset_etag({"id": "ds-1"}) is None
+
+
+def test_etag_matches_lists_wildcards_and_weak_tags():
+    etag = dataset_etag(make_dataset())
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_store_is_keyed_by_id_and_name_and_expires():
+    ckan = MagicMock()
+    store = DatasetCache(max_entries=10, ttl=60, negative_ttl=60)
+    store.remember(ckan, make_dataset())
+
+    assert store.get(ckan, "ds-1")["name"] == "dataset_one"
+    assert store.get(ckan, "dataset_one")["id"] == "ds-1"
+    assert store.get(MagicMock(), "ds-1") is None
+
+    store.forget(ckan, "dataset_one")
+    assert store.get(ckan, "ds-1") is None
+
+    expired = DatasetCache(max_entries=10, ttl=-1, negative_ttl=-1)
+    expired.remember(ckan, make_dataset())
+    assert expired.get(ckan, "ds-1") is None
+
+
+def test_store_drops_old_name_on_rename():
+    ckan = MagicMock()
+    store = DatasetCache(max_entries=10, ttl=60, negative_ttl=60)
+    store.remember(ckan, make_dataset())
+    renamed = dict(make_dataset("2024-01-02T00:00:00"), name="renamed")
+    store.remember(ckan, renamed)
+
+    assert store.get(ckan, "dataset_one") is None
+    assert store.get(ckan, "renamed")["metadata_modified"] == "2024-01-02T00:00:00"
+
+
+def test_show_reads_through_and_reuses_result():
+    ckan = MagicMock()
+    ckan.action.package_show.return_value = make_dataset()
+
+    first = dataset_cache.show(ckan, "dataset_one")
+    first["title"] = "changed by caller"
+    second = dataset_cache.show(ckan, "ds-1")
+
+    ckan.action.package_show.assert_called_once_with(id="dataset_one")
+    assert second["title"] == "Dataset One"
+
+    dataset_cache.show(ckan, "ds-1", refresh=True)
+    assert ckan.action.package_show.call_count == 2
+
+
+def test_show_caches_not_found_until_created():
+    ckan = MagicMock()
+    ckan.action.package_show.side_effect = NotFound("Not found")
+
+    for _ in range(2):
+        with pytest.raises(NotFound):
+            dataset_cache.show(ckan, "dataset_one")
+    ckan.action.package_show.assert_called_once()
+
+    ckan.action.package_create.return_value = make_dataset()
+    create_package(ckan, {"name": "dataset_one"})
+    assert dataset_cache.show(ckan, "dataset_one")["id"] == "ds-1"
+
+
+def test_repeated_updates_fetch_once():
+    ckan = MagicMock()
+    ckan.action.package_show.return_value = make_dataset()
+    ckan.action.package_update.side_effect = lambda **kw: dict(
+        kw, metadata_modified="2024-01-02T00:00:00"
+    )
+
+    update_kafka(dataset_id="dataset_one", dataset_title="One", ckan_instance=ckan)
+    update_kafka(dataset_id="dataset_one", dataset_title="Two", ckan_instance=ckan)
+
+    ckan.action.package_show.assert_called_once()
+    assert ckan.action.package_update.call_count == 2
+
+
+def test_update_with_current_etag_skips_fetch():
+    ckan = MagicMock()
+    dataset = make_dataset()
+    dataset_cache.remember(ckan, dataset)
+    ckan.action.package_update.return_value = make_dataset("2024-01-02T00:00:00")
+
+    update_general_dataset(
+        dataset_id="ds-1",
+        title="New",
+        ckan_instance=ckan,
+        if_match=dataset_etag(dataset),
+    )
+
+    ckan.action.package_show.assert_not_called()
+    assert ckan.action.package_update.call_args[1]["title"] == "New"
+    assert dataset_cache.etag(ckan, "ds-1") == dataset_etag(
+        make_dataset("2024-01-02T00:00:00")
+    )
+
+
+def test_stale_local_version_is_rechecked_against_ckan():
+    ckan = MagicMock()
+    old = make_dataset()
+    dataset_cache.remember(ckan, old)
+    current = make_dataset("2024-01-02T00:00:00")
+    ckan.action.package_show.return_value = current
+    ckan.action.package_update.return_value = current
+
+    # Another worker already wrote the version the client holds
+    update_kafka(
+        dataset_id="ds-1",
+        dataset_title="New",
+        ckan_instance=ckan,
+        if_match=dataset_etag(current),
+    )
+
+    ckan.action.package_show.assert_called_once_with(id="ds-1")
+    ckan.action.package_update.assert_called_once()
+
+
+def test_outdated_etag_raises_precondition_failed():
+    ckan = MagicMock()
+    ckan.action.package_show.return_value = make_dataset("2024-01-02T00:00:00")
+
+    with pytest.raises(PreconditionFailed):
+        patch_general_dataset(
+            dataset_id="ds-1",
+            title="New",
+            ckan_instance=ckan,
+            if_match=dataset_etag(make_dataset()),
+        )
+
+    ckan.action.package_patch.assert_not_called()
+
+
+def test_patch_with_resources_forgets_version():
+    ckan = MagicMock()
+    dataset = make_dataset()
+    dataset_cache.remember(ckan, dataset)
+
+    patch_general_dataset(
+        dataset_id="ds-1",
+        resources=[{"url": "http://new", "name": "new"}],
+        ckan_instance=ckan,
+        if_match=dataset_etag(dataset),
+    )
+
+    ckan.action.package_show.assert_not_called()
+    ckan.action.resource_create.assert_called_once()
+    assert dataset_cache.get(ckan, "ds-1") is None
+
+
+@patch("api.routes.search_routes.get_dataset_route.ckan_settings")
+def test_get_dataset_route_returns_etag(mock_settings):
+    mock_settings.ckan_local_enabled = True
+    mock_settings.ckan.action.package_show.return_value = make_dataset()
+    etag = dataset_etag(make_dataset())
+
+    response = client.get("/dataset/ds-1")
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+    assert response.json()["name"] == "dataset_one"
+
+    response = client.get("/dataset/ds-1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@patch("api.routes.search_routes.get_dataset_route.ckan_settings")
+def test_get_dataset_route_not_found(mock_settings):
+    mock_settings.ckan_local_enabled = True
+    mock_settings.ckan.action.package_show.side_effect = Exception("Not found")
+
+    response = client.get("/dataset/missing")
+    assert response.status_code == 404
@@ -0,0 +1,174 @@
+# tests/test_dataset_name_index.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ckanapi import NotFound
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.dataset_services.create_package import create_package
+from api.services.dataset_services.dataset_cache import dataset_cache
+from api.services.dataset_services.delete_dataset import delete_dataset
+from api.services.dataset_services.general_dataset import update_general_dataset
+from api.services.dataset_services.name_index import (
+    BloomFilter,
+    DatasetNameIndex,
+    dataset_names,
+)
+from api.services.organization_services.purge_organization_datasets import (
+    purge_organization_datasets,
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_indexes():
+    dataset_names.clear()
+    dataset_cache.clear()
+    yield
+    dataset_names.clear()
+    dataset_cache.clear()
+
+
+def make_ckan(names, page_size=2):
+    ckan = MagicMock()
+
+    def package_search(start, rows, **kwargs):
+        page = names[start : start + min(rows, page_size)]
+        return {"count": len(names), "results": [{"name": n} for n in page]}
+
+    ckan.action.package_search.side_effect = package_search
+    return ckan
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    names = [f"dataset-{n}" for n in range(1000)]
+    for name in names:
+        bloom.add(name)
+
+    assert all(bloom.might_contain(name) for name in names)
+    false_positives = sum(bloom.might_contain(f"other-{n}") for n in range(1000))
+    assert false_positives < 50
+
+
+def test_refresh_pages_through_all_names():
+    ckan = make_ckan(["a", "b", "c", "d", "e"])
+    index = DatasetNameIndex(error_rate=0.01)
+
+    assert index.contains(ckan, "a") is None
+    assert index.refresh(ckan) == 5
+    assert index.contains(ckan, "e") is True
+    assert index.contains(ckan, "z") is False
+    assert ckan.action.package_search.call_count == 3
+
+
+def test_own_writes_update_the_index():
+    ckan = make_ckan(["a"])
+    index = DatasetNameIndex(error_rate=0.01)
+    index.refresh(ckan)
+
+    index.add(ckan, "b")
+    index.discard(ckan, "a")
+
+    assert index.contains(ckan, "b") is True
+    assert index.contains(ckan, "a") is False
+
+
+def test_writes_during_refresh_survive_the_swap():
+    index = DatasetNameIndex(error_rate=0.01)
+    ckan = MagicMock()
+
+    def package_search(**kwargs):
+        # A dataset is created and another deleted while scanning
+        index.add(ckan, "created")
+        index.discard(ckan, "deleted")
+        return {"count": 2, "results": [{"name": "deleted"}, {"name": "kept"}]}
+
+    ckan.action.package_search.side_effect = package_search
+    index.refresh(ckan)
+
+    assert index.contains(ckan, "created") is True
+    assert index.contains(ckan, "deleted") is False
+    assert index.contains(ckan, "kept") is True
+
+
+def test_create_package_rejects_known_duplicate():
+    ckan = make_ckan(["taken"])
+    dataset_names.refresh(ckan)
+
+    with pytest.raises(Exception, match="That name is already in use"):
+        create_package(ckan, {"name": "taken"})
+    ckan.action.package_create.assert_not_called()
+    ckan.action.package_show.assert_not_called()
+
+    ckan.action.package_create.return_value = {"id": "1", "name": "fresh"}
+    create_package(ckan, {"name": "fresh"})
+    assert dataset_names.contains(ckan, "fresh") is True
+
+
+def test_delete_dataset_frees_the_name():
+    ckan = make_ckan(["gone"])
+    dataset_names.refresh(ckan)
+    ckan.action.package_show.return_value = {"id": "1", "name": "gone"}
+
+    delete_dataset(dataset_name="gone", ckan_instance=ckan)
+
+    assert dataset_names.contains(ckan, "gone") is False
+
+
+def test_delete_by_id_frees_the_name():
+    ckan = make_ckan(["gone"])
+    dataset_names.refresh(ckan)
+    ckan.action.package_show.return_value = {"id": "1", "name": "gone"}
+
+    delete_dataset(resource_id="1", ckan_instance=ckan)
+
+    ckan.action.dataset_purge.assert_called_once_with(id="1")
+    assert dataset_names.contains(ckan, "gone") is False
+
+
+def test_purge_and_rename_update_the_index():
+    ckan = make_ckan(["old", "purged"])
+    dataset_names.refresh(ckan)
+    ckan.action.package_search.side_effect = [
+        {"count": 1, "results": [{"id": "1", "name": "purged"}]},
+        {"count": 0, "results": []},
+    ]
+    ckan.action.package_show.return_value = {"id": "2", "name": "old", "extras": []}
+    ckan.action.package_update.return_value = {"id": "2", "name": "new"}
+
+    purge_organization_datasets(ckan, "org")
+    update_general_dataset(dataset_id="2", name="new", ckan_instance=ckan)
+
+    assert dataset_names.contains(ckan, "purged") is False
+    assert dataset_names.contains(ckan, "old") is False
+    assert dataset_names.contains(ckan, "new") is True
+
+
+@patch("api.routes.search_routes.get_dataset_exists_route.ckan_settings")
+def test_exists_route_uses_index(mock_settings):
+    mock_settings.ckan_local_enabled = True
+    ckan = make_ckan(["taken"])
+    mock_settings.ckan = ckan
+    dataset_names.refresh(ckan)
+
+    response = client.get("/dataset/exists", params={"name": "taken"})
+    assert response.json() == {"name": "taken", "exists": True}
+
+    response = client.get("/dataset/exists", params={"name": "free"})
+    assert response.json() == {"name": "free", "exists": False}
+    ckan.action.package_show.assert_not_called()
+
+
+@patch("api.routes.search_routes.get_dataset_exists_route.ckan_settings")
+def test_exists_route_falls_back_to_ckan(mock_settings):
+    mock_settings.ckan_local_enabled = True
+    mock_settings.ckan.action.package_show.side_effect = NotFound("Not found")
+
+    response = client.get("/dataset/exists", params={"name": "free"})
+
+    assert response.status_code == 200
+    assert response.json()["exists"] is False
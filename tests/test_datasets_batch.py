@@ -0,0 +1,119 @@
+# tests/test_datasets_batch.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.dataset_services.dataset_cache import dataset_cache
+
+client = TestClient(app)
+
+
+def make_dataset(n, **fields):
+    return dict(
+        {
+            "id": f"id-{n}",
+            "name": f"name-{n}",
+            "title": f"Dataset {n}",
+            "metadata_modified": "2024-01-01T00:00:00",
+            "resources": [],
+            "extras": [],
+        },
+        **fields,
+    )
+
+
+@pytest.fixture
+def ckan():
+    dataset_cache.clear()
+    with patch(
+        "api.services.datasource_services.get_datasets_batch.ckan_settings"
+    ) as settings:
+        ckan = MagicMock()
+        settings.ckan_global = ckan
+        yield ckan
+    dataset_cache.clear()
+
+
+def fake_search(catalog):
+    def package_search(q, fq, rows):
+        return {
+            "results": [
+                dataset
+                for dataset in catalog
+                if f'"{dataset["id"]}"' in fq or f'"{dataset["name"]}"' in fq
+            ]
+        }
+
+    return package_search
+
+
+def test_batch_returns_results_in_request_order(ckan):
+    catalog = [make_dataset(n) for n in range(3)]
+    ckan.action.package_search.side_effect = fake_search(catalog)
+
+    response = client.post(
+        "/datasets/batch", json={"ids": ["name-2", "missing", "id-0", "name-2"]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [d and d["id"] for d in body["datasets"]] == [
+        "id-2",
+        None,
+        "id-0",
+        "id-2",
+    ]
+    assert body["not_found"] == ["missing"]
+    ckan.action.package_search.assert_called_once()
+
+
+def test_batch_chunks_searches(ckan):
+    catalog = [make_dataset(n) for n in range(250)]
+    ckan.action.package_search.side_effect = fake_search(catalog)
+
+    response = client.post(
+        "/datasets/batch", json={"ids": [f"id-{n}" for n in range(250)]}
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["not_found"]) == 0
+    assert ckan.action.package_search.call_count == 3
+
+
+def test_batch_serves_cache_hits_locally(ckan):
+    dataset_cache.remember(ckan, make_dataset(1))
+    dataset_cache.remember(ckan, make_dataset(2, private=True))
+    ckan.action.package_search.side_effect = fake_search([make_dataset(2)])
+
+    response = client.post("/datasets/batch", json={"ids": ["name-1", "name-2"]})
+
+    assert response.status_code == 200
+    fq = ckan.action.package_search.call_args[1]["fq"]
+    assert "name-1" not in fq
+    assert "name-2" in fq
+
+
+def test_batch_quotes_search_values(ckan):
+    ckan.action.package_search.return_value = {"results": []}
+
+    client.post("/datasets/batch", json={"ids": ['bad" OR *:*']})
+
+    fq = ckan.action.package_search.call_args[1]["fq"]
+    assert 'id:("bad\\" OR *:*")' in fq
+
+
+def test_batch_rejects_disabled_pre_ckan(ckan):
+    response = client.post("/datasets/batch", json={"ids": ["a"], "server": "pre_ckan"})
+    assert response.status_code == 400
+
+
+def test_batch_search_error(ckan):
+    ckan.action.package_search.side_effect = Exception("Solr down")
+
+    response = client.post("/datasets/batch", json={"ids": ["a"]})
+
+    assert response.status_code == 400
+    assert "Solr down" in response.json()["detail"]
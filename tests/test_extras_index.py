@@ -0,0 +1,172 @@
+# tests/test_extras_index.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.config.ckan_settings import ckan_settings
+from api.main import app
+from api.services.dataset_services.resource_index import (
+    DatasetResourceIndex,
+    resource_index,
+)
+from api.services.datasource_services.search_datasource import (
+    extras_filter_to_fq,
+    parse_extras_filters,
+    search_datasource,
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_index():
+    resource_index.clear()
+    yield
+    resource_index.clear()
+
+
+def make_dataset(dataset_id, **extras):
+    return {
+        "id": dataset_id,
+        "name": f"name-{dataset_id}",
+        "title": f"Title {dataset_id}",
+        "resources": [
+            {"id": f"{dataset_id}-r", "name": "r", "url": "u", "format": "CSV"}
+        ],
+        "extras": [{"key": k, "value": v} for k, v in extras.items()],
+    }
+
+
+def make_ckan(datasets, address):
+    ckan = MagicMock()
+    ckan.address = address
+    ckan.action.package_search.return_value = {
+        "count": len(datasets),
+        "results": datasets,
+    }
+    return ckan
+
+
+CATALOG = [
+    make_dataset("a", file_type="NetCDF", host="kafka.one"),
+    make_dataset("b", file_type="CSV", host="kafka.two"),
+    make_dataset("c", file_type="NetCDF", host="other"),
+]
+
+
+def test_parse_extras_filters():
+    assert parse_extras_filters(["extras.file_type=NetCDF", "host=kafka*"]) == [
+        ("file_type", "NetCDF", False),
+        ("host", "kafka", True),
+    ]
+    with pytest.raises(ValueError, match="Invalid extras filter"):
+        parse_extras_filters(["file_type"])
+    with pytest.raises(ValueError, match="Invalid extras key"):
+        parse_extras_filters(["extras.a:x OR *:*=v"])
+
+
+def test_extras_filter_to_fq():
+    assert extras_filter_to_fq("file_type", "NetCDF", False) == (
+        'extras_file_type:"NetCDF"'
+    )
+    assert extras_filter_to_fq("host", "kafka:1", True) == "extras_host:kafka\\:1*"
+    with pytest.raises(ValueError, match="Invalid extras key"):
+        extras_filter_to_fq("a:x OR *:*", "v", False)
+
+
+def test_equality_and_prefix_filters():
+    ckan = make_ckan(CATALOG, "http://ckan.test")
+    index = DatasetResourceIndex()
+    index.refresh(ckan)
+
+    def ids(filters):
+        return [d["id"] for d in index.by_extras(ckan, filters)]
+
+    assert ids([("file_type", "NetCDF", False)]) == ["a", "c"]
+    assert ids([("host", "kafka", True)]) == ["a", "b"]
+    assert ids([("file_type", "NetCDF", False), ("host", "kafka", True)]) == ["a"]
+    assert ids([("file_type", "HDF5", False)]) == []
+
+    index.dataset_changed(ckan, make_dataset("b", file_type="NetCDF", host="x"))
+    assert ids([("file_type", "NetCDF", False)]) == ["a", "b", "c"]
+    assert ids([("host", "kafka", True)]) == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_search_answers_extras_filters_from_the_index():
+    resource_index.refresh(make_ckan(CATALOG, ckan_settings.ckan_global_url))
+    ckan = make_ckan([], ckan_settings.ckan_global_url)
+
+    with patch(
+        "api.services.datasource_services.search_datasource.ckan_settings"
+    ) as mock_settings:
+        mock_settings.ckan_global = ckan
+        results = await search_datasource(
+            server="global", extras_filters=["extras.file_type=NetCDF"]
+        )
+
+    assert [result.id for result in results] == ["a", "c"]
+    ckan.action.package_search.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_sends_extras_filters_to_ckan_with_other_parameters():
+    resource_index.refresh(make_ckan(CATALOG, ckan_settings.ckan_global_url))
+    ckan = make_ckan([], ckan_settings.ckan_global_url)
+
+    with patch(
+        "api.services.datasource_services.search_datasource.ckan_settings"
+    ) as mock_settings:
+        mock_settings.ckan_global = ckan
+        await search_datasource(
+            server="global",
+            owner_org="org",
+            extras_filters=["extras.file_type=NetCDF"],
+        )
+
+    kwargs = ckan.action.package_search.call_args.kwargs
+    assert kwargs["fq_list"] == ['extras_file_type:"NetCDF"']
+
+
+@pytest.mark.asyncio
+async def test_ckan_results_match_extras_like_the_index():
+    ckan = make_ckan([], ckan_settings.ckan_global_url)
+    ckan.action.package_search.side_effect = [
+        {
+            "count": 3,
+            "results": [
+                make_dataset("a", file_type="NetCDF"),
+                make_dataset("b", file_type="netcdf"),
+                make_dataset("c", file_type="NetCDF extended"),
+            ],
+        },
+        {"count": 3, "results": []},
+    ]
+    explanation = {}
+
+    with patch(
+        "api.services.datasource_services.search_datasource.ckan_settings"
+    ) as mock_settings:
+        mock_settings.ckan_global = ckan
+        results = await search_datasource(
+            server="global",
+            owner_org="org",
+            extras_filters=["extras.file_type=NetCDF"],
+            explain=explanation,
+        )
+
+    assert [result.id for result in results] == ["a"]
+    assert explanation["dropped_by_extras_filters"] == 2
+
+
+def test_post_search_rejects_malformed_extras_filters():
+    response = client.post("/search", json={"extras_filters": ["file_type"]})
+    assert response.status_code == 422
+
+
+def test_post_search_rejects_extras_keys_that_are_not_field_names():
+    response = client.post("/search", json={"extras_filters": ["extras.a:x OR *:*=v"]})
+    assert response.status_code == 400
+    assert "Invalid extras key" in response.json()["detail"]
@@ -1,5 +1,5 @@
 # tests/test_general_dataset.py
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 
@@ -92,11 +92,11 @@ class TestCreateGeneralDataset:
         assert len(package_call["extras"]) == 1
         assert package_call["extras"][0]["key"] == "custom_field"
 
-        # Verify resource_create was called
-        mock_ckan.action.resource_create.assert_called_once()
-        resource_call = mock_ckan.action.resource_create.call_args[1]
-        assert resource_call["package_id"] == "dataset-456"
-        assert resource_call["url"] == "http://example.com/data.csv"
+        # Verify resources were embedded in the package_create call
+        mock_ckan.action.resource_create.assert_not_called()
+        assert package_call["resources"] == [
+            {"url": "http://example.com/data.csv", "name": "data"}
+        ]
 
     def test_create_custom_ckan_instance(self, mock_ckan_settings):
         """Test creating dataset with custom CKAN instance."""
@@ -148,21 +148,44 @@ class TestCreateGeneralDataset:
                 name="error_dataset", title="Error Dataset", owner_org="test_org"
             )
 
-    def test_create_resource_creation_error(self, mock_ckan_settings):
-        """Test handling resource creation errors."""
+    def test_create_resource_rollback(self, mock_ckan_settings):
+        """Test the package is purged when resources were not all created."""
         mock_ckan = MagicMock()
-        mock_ckan.action.package_create.return_value = {"id": "dataset-123"}
-        mock_ckan.action.resource_create.side_effect = Exception(
-            "Resource creation failed"
-        )
+        mock_ckan.action.package_create.return_value = {
+            "id": "dataset-123",
+            "resources": [{"id": "res-1", "url": "http://example.com/a.csv"}],
+        }
+        mock_ckan_settings.ckan = mock_ckan
+
+        with pytest.raises(Exception, match="Error creating general dataset"):
+            create_general_dataset(
+                name="resource_error_dataset",
+                title="Resource Error Dataset",
+                owner_org="test_org",
+                resources=[
+                    {"url": "http://example.com/a.csv"},
+                    {"url": "http://example.com/b.csv"},
+                ],
+            )
+
+        mock_ckan.action.dataset_purge.assert_called_once_with(id="dataset-123")
+
+    def test_create_rollback_failure_keeps_original_error(self, mock_ckan_settings):
+        """Test a failing rollback does not mask the creation error."""
+        mock_ckan = MagicMock()
+        mock_ckan.action.package_create.return_value = {
+            "id": "dataset-123",
+            "resources": [],
+        }
+        mock_ckan.action.dataset_purge.side_effect = Exception("Purge failed")
         mock_ckan_settings.ckan = mock_ckan
 
-        with pytest.raises(Exception, match="Error creating dataset resources"):
+        with pytest.raises(Exception, match="0 of 1 resources were created"):
             create_general_dataset(
                 name="resource_error_dataset",
                 title="Resource Error Dataset",
                 owner_org="test_org",
-                resources=[{"url": "http://example.com/data.csv"}],
+                resources=[{"url": "http://example.com/a.csv"}],
             )
 
     def test_create_without_optional_fields(self, mock_ckan_settings):
@@ -306,24 +329,113 @@ class TestUpdateGeneralDataset:
 class TestPatchGeneralDataset:
     """Test cases for patch_general_dataset function."""
 
-    def test_patch_dataset(self, mock_ckan_settings):
-        """Test patch_general_dataset delegates to update_general_dataset."""
-        mock_ckan = MagicMock()
-        mock_ckan.action.package_show.return_value = {
+    @pytest.fixture
+    def existing_dataset(self):
+        """Existing dataset with resources for patch tests."""
+        return {
             "id": "patch-123",
             "name": "patch_dataset",
             "title": "Patch Dataset",
             "owner_org": "patch_org",
+            "tags": [{"name": "a"}],
+            "extras": [{"key": "k", "value": "v"}],
+            "resources": [
+                {"id": "r1", "url": "http://a", "name": "A", "format": "CSV"},
+                {"id": "r2", "url": "http://b", "name": "B", "format": "CSV"},
+            ],
         }
-        mock_ckan.action.package_update.return_value = {"id": "patch-123"}
+
+    def test_patch_dataset(self, mock_ckan_settings, existing_dataset):
+        """Only changed package fields are sent through package_patch."""
+        mock_ckan = MagicMock()
+        mock_ckan.action.package_show.return_value = existing_dataset
+        mock_ckan.action.package_patch.return_value = {"id": "patch-123"}
         mock_ckan_settings.ckan = mock_ckan
 
-        # Patch should work exactly like update
-        result = patch_general_dataset(dataset_id="patch-123", title="Patched Title")
+        result = patch_general_dataset(
+            dataset_id="patch-123",
+            title="Patched Title",
+            owner_org="patch_org",
+            tags=["a"],
+        )
 
         assert result == "patch-123"
         mock_ckan.action.package_show.assert_called_once()
-        mock_ckan.action.package_update.assert_called_once()
+        mock_ckan.action.package_patch.assert_called_once_with(
+            id="patch-123", title="Patched Title"
+        )
+        mock_ckan.action.package_update.assert_not_called()
+        mock_ckan.action.resource_patch.assert_not_called()
+        mock_ckan.action.resource_create.assert_not_called()
+
+    def test_patch_without_changes_makes_no_write(
+        self, mock_ckan_settings, existing_dataset
+    ):
+        """A patch matching the stored dataset does not write to CKAN."""
+        mock_ckan = MagicMock()
+        mock_ckan.action.package_show.return_value = existing_dataset
+        mock_ckan_settings.ckan = mock_ckan
+
+        result = patch_general_dataset(
+            dataset_id="patch_dataset",
+            title="Patch Dataset",
+            extras={"k": "v"},
+            resources=[{"url": "http://a", "name": "A", "format": None}],
+        )
+
+        assert result == "patch-123"
+        mock_ckan.action.package_patch.assert_not_called()
+        mock_ckan.action.resource_patch.assert_not_called()
+        mock_ckan.action.resource_create.assert_not_called()
+
+    def test_patch_merges_extras(self, mock_ckan_settings, existing_dataset):
+        """Extras are merged and the full merged list is sent."""
+        mock_ckan = MagicMock()
+        mock_ckan.action.package_show.return_value = existing_dataset
+        mock_ckan.action.package_patch.return_value = {"id": "patch-123"}
+        mock_ckan_settings.ckan = mock_ckan
+
+        patch_general_dataset(dataset_id="patch-123", extras={"new": "x"})
+
+        mock_ckan.action.package_patch.assert_called_once_with(
+            id="patch-123",
+            extras=[{"key": "k", "value": "v"}, {"key": "new", "value": "x"}],
+        )
+
+    def test_patch_resources_diff(self, mock_ckan_settings, existing_dataset):
+        """Resources are matched by URL or name and only diffs are sent."""
+        mock_ckan = MagicMock()
+        mock_ckan.action.package_show.return_value = existing_dataset
+        mock_ckan_settings.ckan = mock_ckan
+
+        patch_general_dataset(
+            dataset_id="patch-123",
+            resources=[
+                {"url": "http://a", "name": "A", "format": "JSON"},
+                {"url": "http://b2", "name": "B", "description": None},
+                {"url": "http://c", "name": "C"},
+                {"url": "http://c", "name": "C", "format": "TXT"},
+            ],
+        )
+
+        mock_ckan.action.package_patch.assert_not_called()
+        assert mock_ckan.action.resource_patch.call_args_list == [
+            call(id="r1", format="JSON"),
+            call(id="r2", url="http://b2"),
+        ]
+        mock_ckan.action.resource_create.assert_called_once_with(
+            package_id="patch-123", url="http://c", name="C", format="TXT"
+        )
+
+    def test_patch_error(self, mock_ckan_settings, existing_dataset):
+        """CKAN write errors are wrapped."""
+        mock_ckan = MagicMock()
+        mock_ckan.action.package_show.return_value = existing_dataset
+        mock_ckan.action.package_patch.side_effect = Exception("Patch failed")
+        mock_ckan_settings.ckan = mock_ckan
+
+        with pytest.raises(Exception, match="Error updating general dataset"):
+            patch_general_dataset(dataset_id="patch-123", title="New")
 
     def test_patch_with_custom_ckan_instance(self, mock_ckan_settings):
         """Test patch with custom CKAN instance."""
@@ -334,7 +446,7 @@ class TestPatchGeneralDataset:
             "title": "Custom Patch Dataset",
             "owner_org": "custom_org",
         }
-        custom_ckan.action.package_update.return_value = {"id": "custom-patch-123"}
+        custom_ckan.action.package_patch.return_value = {"id": "custom-patch-123"}
 
         result = patch_general_dataset(
             dataset_id="custom-patch-123",
@@ -344,6 +456,6 @@ class TestPatchGeneralDataset:
 
         assert result == "custom-patch-123"
         custom_ckan.action.package_show.assert_called_once()
-        custom_ckan.action.package_update.assert_called_once()
+        custom_ckan.action.package_patch.assert_called_once()
         # Default CKAN should not be called
         mock_ckan_settings.ckan.action.package_show.assert_not_called()
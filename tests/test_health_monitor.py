@@ -0,0 +1,116 @@
+# tests/test_health_monitor.py
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.status_services import health_monitor
+from api.services.status_services.health_monitor import HealthMonitor
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_snapshot():
+    health_monitor.clear()
+    yield
+    health_monitor.clear()
+
+
+def test_checks_run_concurrently_with_a_timeout():
+    release = threading.Event()
+    monitor = HealthMonitor(timeout=0.2)
+    monitor.register("fast", lambda: True)
+    monitor.register("down", lambda: False)
+    monitor.register("hung", lambda: release.wait(5))
+    monitor.register("broken", lambda: 1 / 0)
+
+    started = time.monotonic()
+    monitor.run()
+    elapsed = time.monotonic() - started
+    results = monitor.results()
+    release.set()
+
+    assert elapsed < 1
+    assert results["fast"]["ok"] is True
+    assert results["down"]["ok"] is False
+    assert results["hung"]["ok"] is False
+    assert "Timed out" in results["hung"]["error"]
+    assert "division by zero" in results["broken"]["error"]
+    assert results["fast"]["latency_ms"] is not None
+    assert results["fast"]["age_seconds"] >= 0
+
+
+def test_hung_check_is_not_started_twice():
+    release = threading.Event()
+    calls = []
+
+    def hung():
+        calls.append(1)
+        return release.wait(5)
+
+    monitor = HealthMonitor(timeout=0.05)
+    monitor.register("hung", hung)
+    monitor.run()
+    monitor.run()
+    release.set()
+
+    assert len(calls) == 1
+
+
+def test_status_endpoint_serves_the_snapshot():
+    with (
+        patch(
+            "api.services.status_services.check_ckan_status", return_value=True
+        ) as check_ckan,
+        patch(
+            "api.services.status_services.check_api_status.get_client_token",
+            side_effect=Exception("Keycloak down"),
+        ),
+    ):
+        first = client.get("/status/").json()
+        second = client.get("/status/").json()
+
+    # Only the first request, before any background round, runs the checks
+    assert check_ckan.call_count == 1
+    assert first["ckan_is_active_global"] is True
+    assert first["keycloak_is_active"] is False
+    assert second["checks"]["keycloak"]["error"] == "Keycloak down"
+    assert set(second["checks"]["ckan_global"]) == {
+        "ok",
+        "latency_ms",
+        "checked_at",
+        "age_seconds",
+        "error",
+    }
+
+
+def test_first_status_check_runs_off_the_event_loop():
+    on_loop = []
+    run = health_monitor.run
+
+    def record_run():
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return run()
+
+    with (
+        patch.object(health_monitor, "run", side_effect=record_run),
+        patch("api.services.status_services.check_ckan_status", return_value=True),
+        patch(
+            "api.services.status_services.check_api_status.get_client_token",
+            return_value="token",
+        ),
+    ):
+        response = client.get("/status/")
+
+    assert response.status_code == 200
+    assert on_loop == [False]
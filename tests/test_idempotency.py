@@ -0,0 +1,137 @@
+# tests/test_idempotency.py
+
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from api.middleware.idempotency_middleware import (
+    IdempotencyMiddleware,
+    IdempotencyStore,
+    StoredResponse,
+)
+
+
+@pytest.fixture
+def store():
+    return IdempotencyStore(max_entries=10, ttl=60)
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def client(store, calls):
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, store=store)
+
+    @app.post("/url", status_code=201)
+    def create(payload: dict):
+        calls.append(payload)
+        if payload.get("fail"):
+            raise HTTPException(status_code=400, detail="CKAN rejected it")
+        return {"id": f"dataset-{len(calls)}"}
+
+    @app.post("/other")
+    def other(payload: dict):
+        calls.append(payload)
+        return {"id": f"dataset-{len(calls)}"}
+
+    return TestClient(app)
+
+
+def test_retry_with_same_key_replays_response(client, calls):
+    headers = {"Idempotency-Key": "abc"}
+    first = client.post("/url", json={"name": "a"}, headers=headers)
+    second = client.post("/url", json={"name": "a"}, headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert first.json() == second.json() == {"id": "dataset-1"}
+    assert second.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert len(calls) == 1
+
+
+def test_requests_without_key_are_not_deduplicated(client, calls):
+    client.post("/url", json={"name": "a"})
+    client.post("/url", json={"name": "a"})
+    assert len(calls) == 2
+
+
+def test_key_reused_with_different_body_is_rejected(client, calls):
+    headers = {"Idempotency-Key": "abc"}
+    client.post("/url", json={"name": "a"}, headers=headers)
+    response = client.post("/url", json={"name": "b"}, headers=headers)
+
+    assert response.status_code == 422
+    assert len(calls) == 1
+
+
+def test_keys_are_scoped_per_caller(client, calls):
+    client.post(
+        "/url",
+        json={"name": "a"},
+        headers={"Idempotency-Key": "abc", "Authorization": "Bearer one"},
+    )
+    client.post(
+        "/url",
+        json={"name": "a"},
+        headers={"Idempotency-Key": "abc", "Authorization": "Bearer two"},
+    )
+    assert len(calls) == 2
+
+
+def test_failed_responses_are_not_stored(client, calls):
+    headers = {"Idempotency-Key": "abc"}
+    first = client.post("/url", json={"fail": True}, headers=headers)
+    second = client.post("/url", json={"fail": True}, headers=headers)
+
+    assert first.status_code == second.status_code == 400
+    assert len(calls) == 2
+
+
+def test_other_routes_are_untouched(client, calls):
+    headers = {"Idempotency-Key": "abc"}
+    client.post("/other", json={"name": "a"}, headers=headers)
+    client.post("/other", json={"name": "a"}, headers=headers)
+    assert len(calls) == 2
+
+
+def test_overlong_key_is_rejected(client, calls):
+    response = client.post(
+        "/url", json={"name": "a"}, headers={"Idempotency-Key": "k" * 256}
+    )
+    assert response.status_code == 400
+    assert calls == []
+
+
+def test_store_reports_in_flight_duplicates(store):
+    assert store.begin("key", "fp") is None
+    assert store.begin("key", "fp") == "in_flight"
+    assert store.begin("key", "other") == "mismatch"
+
+    store.release("key")
+    assert store.begin("key", "fp") is None
+
+
+def test_store_evicts_least_recently_used():
+    store = IdempotencyStore(max_entries=2, ttl=60)
+    for key in ("a", "b", "c"):
+        store.begin(key, "fp")
+        store.complete(key, StoredResponse("fp", 200, [], b"{}"))
+
+    assert store.begin("a", "fp") is None
+    assert isinstance(store.begin("c", "fp"), StoredResponse)
+
+
+def test_store_expires_entries():
+    store = IdempotencyStore(max_entries=10, ttl=60)
+    store.begin("a", "fp")
+    response = StoredResponse("fp", 200, [], b"{}")
+    response.created_at = time.monotonic() - 120
+    store.complete("a", response)
+
+    assert store.begin("a", "fp") is None
@@ -0,0 +1,264 @@
+# tests/test_jobs.py
+import json
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.config.keycloak_settings import keycloak_settings
+from api.main import app
+from api.services.job_services.job_manager import COMPLETED, FAILED, Job, JobManager
+from api.services.organization_services.retag_organization import retag_organization
+
+client = TestClient(app)
+
+HEADERS = {"Authorization": f"Bearer {keycloak_settings.test_username}"}
+
+
+def wait_for(job, timeout=5):
+    """Wait until a job reaches a final state."""
+    deadline = time.time() + timeout
+    while job.status not in (COMPLETED, FAILED) and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def wait_for_release(store_dir, job_id, timeout=1):
+    """Wait until a job's lease is released, right after its final save."""
+    lease = os.path.join(store_dir, f"{job_id}.lease")
+    deadline = time.time() + timeout
+    while os.path.exists(lease) and time.time() < deadline:
+        time.sleep(0.01)
+    return not os.path.exists(lease)
+
+
+def test_job_runs_and_reports_progress(tmp_path):
+    """Test a job runs in the background and records its progress."""
+    manager = JobManager(store_dir=str(tmp_path), max_workers=2)
+
+    def handler(job, items):
+        job.set_total(len(items))
+        for item in items:
+            job.advance(ok=item != "bad", error=f"{item} failed")
+        return {"done": True}
+
+    manager.register("demo", handler)
+    job = wait_for(manager.submit("demo", items=["a", "b", "bad"]))
+
+    assert job.status == COMPLETED
+    assert job.total == 3
+    assert job.succeeded == 2
+    assert job.failed == 1
+    assert job.errors == ["bad failed"]
+    assert job.result == {"done": True}
+    assert job.throughput is None or job.throughput > 0
+
+    assert wait_for_release(tmp_path, job.id)
+    with open(os.path.join(tmp_path, f"{job.id}.json")) as f:
+        assert json.load(f)["status"] == COMPLETED
+    manager.shutdown()
+
+
+def test_job_failure_is_recorded(tmp_path):
+    """Test a failing handler marks the job as failed."""
+    manager = JobManager(store_dir=str(tmp_path), max_workers=1)
+
+    def handler(job):
+        raise Exception("boom")
+
+    manager.register("demo", handler)
+    job = wait_for(manager.submit("demo"))
+
+    assert job.status == FAILED
+    assert job.error == "boom"
+    manager.shutdown()
+
+
+def test_unknown_job_type_rejected(tmp_path):
+    """Test submitting an unregistered job type raises ValueError."""
+    manager = JobManager(store_dir=str(tmp_path), max_workers=1)
+    with pytest.raises(ValueError, match="Unknown job type"):
+        manager.submit("missing")
+
+
+def test_unfinished_jobs_resume_on_start(tmp_path):
+    """Test jobs left running by a previous worker are resumed."""
+    interrupted = Job("demo", {"value": 42})
+    interrupted.status = "running"
+    with open(os.path.join(tmp_path, f"{interrupted.id}.json"), "w") as f:
+        json.dump(interrupted.to_dict(), f)
+
+    manager = JobManager(store_dir=str(tmp_path), max_workers=1)
+    manager.register("demo", lambda job, value: {"value": value})
+    manager.start()
+
+    job = wait_for(manager.get(interrupted.id))
+    assert job.status == COMPLETED
+    assert job.result == {"value": 42}
+    assert job.attempts == 1
+    manager.shutdown()
+
+
+def write_running_job(store_dir, lease=None):
+    """Persist a running job, optionally with a lease held by another worker."""
+    job = Job("demo", {"value": 7})
+    job.status = "running"
+    with open(os.path.join(store_dir, f"{job.id}.json"), "w") as f:
+        json.dump(job.to_dict(), f)
+    if lease is not None:
+        with open(os.path.join(store_dir, f"{job.id}.lease"), "w") as f:
+            json.dump(lease, f)
+    return job
+
+
+def test_jobs_leased_by_a_live_worker_are_not_resumed(tmp_path):
+    """Test a job whose lease is held by another worker is left alone."""
+    held = write_running_job(
+        tmp_path, {"owner": "other:1:abc", "expires_at": time.time() + 60}
+    )
+    handler = MagicMock(return_value={})
+    manager = JobManager(store_dir=str(tmp_path), max_workers=1)
+    manager.register("demo", handler)
+    manager.start()
+    time.sleep(0.1)
+
+    handler.assert_not_called()
+    assert manager.get(held.id).status == "running"
+    manager.shutdown()
+
+
+def test_jobs_with_expired_lease_are_taken_over(tmp_path):
+    """Test a job whose worker stopped renewing its lease is resumed."""
+    orphan = write_running_job(
+        tmp_path, {"owner": "other:1:abc", "expires_at": time.time() - 1}
+    )
+    manager = JobManager(store_dir=str(tmp_path), max_workers=1)
+    manager.register("demo", lambda job, value: {"value": value})
+    manager.start()
+
+    job = wait_for(manager.get(orphan.id))
+    assert job.status == COMPLETED
+    assert wait_for_release(tmp_path, orphan.id)
+    manager.shutdown()
+
+
+def test_only_one_worker_claims_a_job(tmp_path):
+    """Test two workers sharing a store never both run the same job."""
+    write_running_job(tmp_path)
+    handler = MagicMock(side_effect=lambda job, value: time.sleep(0.2))
+    managers = [JobManager(store_dir=str(tmp_path), max_workers=1) for _ in range(2)]
+    for manager in managers:
+        manager.register("demo", handler)
+        manager.start()
+
+    time.sleep(0.5)
+    assert handler.call_count == 1
+    for manager in managers:
+        manager.shutdown()
+
+
+def test_get_reads_jobs_from_other_workers(tmp_path):
+    """Test jobs persisted by another process are found in the store."""
+    other = Job("demo", {})
+    other.status = COMPLETED
+    with open(os.path.join(tmp_path, f"{other.id}.json"), "w") as f:
+        json.dump(other.to_dict(), f)
+
+    manager = JobManager(store_dir=str(tmp_path), max_workers=1)
+    assert manager.get(other.id).status == COMPLETED
+    assert [job.id for job in manager.list()] == [other.id]
+
+
+def test_retag_organization_pages_and_patches():
+    """Test retagging patches only datasets whose tags change."""
+    ckan = MagicMock()
+    ckan.action.organization_show.return_value = {"id": "org-1"}
+    ckan.action.package_search.return_value = {
+        "count": 2,
+        "results": [
+            {"id": "d1", "name": "d1", "tags": [{"name": "old"}]},
+            {"id": "d2", "name": "d2", "tags": [{"name": "new"}]},
+        ],
+    }
+    progress = MagicMock()
+
+    result = retag_organization(
+        "org",
+        add_tags=["new"],
+        remove_tags=["old"],
+        ckan_instance=ckan,
+        progress=progress,
+    )
+
+    assert result == {"updated": 1, "unchanged": 1}
+    ckan.action.package_patch.assert_called_once_with(id="d1", tags=[{"name": "new"}])
+    progress.set_total.assert_called_once_with(2)
+    assert progress.advance.call_count == 2
+
+
+def test_retag_organization_requires_tags():
+    """Test retagging without tags is rejected."""
+    with pytest.raises(ValueError, match="at least one tag"):
+        retag_organization("org", ckan_instance=MagicMock())
+
+
+def test_job_routes_require_a_user():
+    """Test the job routes reject anonymous requests."""
+    for path in ("/jobs", "/jobs/some-job", "/jobs/some-job/download"):
+        assert client.get(path).status_code == 401
+
+
+def test_get_job_route_not_found():
+    """Test polling an unknown job returns 404."""
+    response = client.get("/jobs/does-not-exist", headers=HEADERS)
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Job not found"}
+
+
+def test_get_job_route_returns_progress():
+    """Test polling a known job returns its progress."""
+    job = Job("organization_deletion", {"organization_name": "org"}, user_id="1234")
+    job.total = 10
+    job.succeeded = 4
+    with patch("api.routes.job_routes.get.job_manager") as mock_manager:
+        mock_manager.get.return_value = job
+        response = client.get(f"/jobs/{job.id}", headers=HEADERS)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["id"] == job.id
+    assert body["total"] == 10
+    assert body["processed"] == 4
+    assert body["user_id"] == "1234"
+
+
+def test_other_users_jobs_are_not_found():
+    """Test a user cannot poll, download or list another user's job."""
+    job = Job("catalog_export", {"server": "global"}, user_id="5678")
+    job.result = {"file": __file__}
+    with patch("api.routes.job_routes.get.job_manager") as mock_manager:
+        mock_manager.get.return_value = job
+        assert client.get(f"/jobs/{job.id}", headers=HEADERS).status_code == 404
+        response = client.get(f"/jobs/{job.id}/download", headers=HEADERS)
+        assert response.status_code == 404
+
+        mock_manager.list.return_value = []
+        assert client.get("/jobs", headers=HEADERS).json() == []
+        mock_manager.list.assert_called_once_with(status=None, user_id="1234")
+
+
+def test_jobs_are_listed_by_submitting_user(tmp_path):
+    """Test the submitting user is persisted and filters the job list."""
+    manager = JobManager(store_dir=str(tmp_path), max_workers=1)
+    manager.register("demo", lambda job: {})
+    mine = wait_for(manager.submit("demo", user_id="1234"))
+    wait_for(manager.submit("demo", user_id="5678"))
+
+    assert [job.id for job in manager.list(user_id="1234")] == [mine.id]
+    assert (
+        JobManager(store_dir=str(tmp_path), max_workers=1).get(mine.id).user_id
+        == "1234"
+    )
+    manager.shutdown()
@@ -0,0 +1,98 @@
+# tests/test_logging_pipeline.py
+
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueListener
+from unittest.mock import MagicMock, patch
+
+from api.services.status_services.check_ckan_status import check_ckan_status
+from api.services.telemetry_services import metrics_registry
+from api.services.telemetry_services.logging_pipeline import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+)
+
+
+def make_record(name="api.test", level=logging.INFO, msg="hello %s", args=("x",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_includes_extra_fields():
+    record = make_record()
+    record.dataset_id = "abc"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "hello x"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "api.test"
+    assert entry["dataset_id"] == "abc"
+
+
+def test_sampling_uses_the_most_specific_logger():
+    sampler = SamplingFilter({"api": 1.0, "api.services.status": 0.0})
+
+    assert sampler.filter(make_record("api.routes"))
+    assert not sampler.filter(make_record("api.services.status.check"))
+    assert sampler.filter(make_record("api.services.status", logging.WARNING))
+
+
+def test_sampling_keeps_a_fraction():
+    sampler = SamplingFilter({"noisy": 0.25})
+
+    with patch("random.random", side_effect=[0.1, 0.5, 0.2, 0.9]):
+        kept = [sampler.filter(make_record("noisy")) for _ in range(4)]
+
+    assert kept == [True, False, True, False]
+
+
+def test_full_queue_drops_records_without_blocking():
+    metrics_registry.clear()
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+    handler.handle(make_record())
+    handler.handle(make_record())
+
+    assert handler.queue.qsize() == 1
+    assert "pop_log_records_dropped_total 1" in metrics_registry.render()
+
+
+def test_listener_writes_rendered_records_with_tracebacks():
+    records = queue.Queue()
+    handler = NonBlockingQueueHandler(records)
+    target = MagicMock(level=logging.NOTSET)
+    listener = QueueListener(records, target)
+    listener.start()
+
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        record = make_record()
+        record.exc_info = sys.exc_info()
+        handler.handle(record)
+    listener.stop()
+
+    written = target.handle.call_args[0][0]
+    assert written.getMessage() == "hello x"
+    assert "ZeroDivisionError" in written.exc_text
+    assert written.exc_info is None
+
+
+def test_check_ckan_status_does_not_log_the_api_key(caplog):
+    ckan = MagicMock()
+    ckan.action.status_show.return_value = {"ckan_version": "2.10"}
+
+    with (
+        caplog.at_level(logging.DEBUG),
+        patch(
+            "api.services.status_services.check_ckan_status.ckan_settings"
+        ) as settings,
+    ):
+        settings.ckan = ckan
+        settings.ckan_api_key = "secret-api-key"
+        assert check_ckan_status(local=True) is True
+
+    assert "secret-api-key" not in caplog.text
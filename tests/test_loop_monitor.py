@@ -0,0 +1,87 @@
+# tests/test_loop_monitor.py
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.config.metrics_settings import metrics_settings
+from api.main import app
+from api.services.telemetry_services import loop_monitor, metrics_registry
+from api.services.telemetry_services.loop_monitor import LoopMonitor, percentile
+from api.tasks.loop_lag_task import monitor_event_loop
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_monitor():
+    loop_monitor.clear()
+    yield
+    loop_monitor.clear()
+
+
+def test_lag_summary_reports_percentiles_in_ms():
+    monitor = LoopMonitor(
+        history_size=100, blocking_threshold=0.1, blocking_history_size=10
+    )
+    for lag in range(1, 101):
+        monitor.record_lag(lag / 1000)
+
+    summary = monitor.lag_summary()
+
+    assert summary["samples"] == 100
+    assert summary["p50_ms"] == 50
+    assert summary["p99_ms"] == 99
+    assert summary["max_ms"] == 100
+    assert percentile([], 0.5) is None
+
+
+def block_the_loop(seconds):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_captures_the_blocking_callback():
+    monitor = LoopMonitor(
+        history_size=10, blocking_threshold=0.05, blocking_history_size=10
+    )
+    monitor.start_watchdog(asyncio.get_running_loop())
+    try:
+        await asyncio.sleep(0.1)
+        block_the_loop(0.3)
+        await asyncio.sleep(0.1)
+    finally:
+        monitor.stop_watchdog()
+
+    captured = monitor.blocking_calls()
+    assert len(captured) == 1
+    assert captured[0]["blocked_ms"] >= 200
+    assert any("block_the_loop" in line for line in captured[0]["stack"])
+
+
+@pytest.mark.asyncio
+async def test_task_records_lag_samples():
+    metrics_registry.clear()
+    with patch.object(metrics_settings, "loop_lag_interval_seconds", 0.01):
+        task = asyncio.create_task(monitor_event_loop())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert loop_monitor.lag_summary()["samples"] > 0
+    assert "pop_event_loop_lag_seconds_count" in metrics_registry.render()
+
+
+def test_event_loop_endpoint():
+    loop_monitor.record_lag(0.02)
+
+    body = client.get("/status/event-loop").json()
+
+    assert body["lag"]["samples"] == 1
+    assert body["lag"]["p99_ms"] == 20
+    assert body["blocking_capture_enabled"] is False
+    assert body["blocking_calls"] == []
@@ -1,4 +1,5 @@
 import asyncio
+import gzip
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -65,20 +66,24 @@ async def test_metrics_payload_includes_organization():
 
         assert "organization" in metrics_payload
         assert metrics_payload["organization"] == test_organization
+        assert metrics_payload["timestamp"].endswith("+00:00")
 
 
 @pytest.mark.asyncio
-async def test_organization_sent_to_metrics_endpoint():
+async def test_organization_sent_to_metrics_endpoint(tmp_path):
     """Test organization is sent to endpoint when public=True."""
+    from api.services.status_services.metrics_publisher import MetricsPublisher
     from api.tasks.metrics_task import record_system_metrics
 
     test_organization = "Public University"
+    publisher = MetricsPublisher("http://federation.test", str(tmp_path))
 
     with (
         patch("api.services.status_services.get_public_ip") as mock_ip,
         patch("api.services.status_services.get_system_metrics") as mock_sys,
         patch.object(swagger_settings, "organization", test_organization),
         patch.object(swagger_settings, "is_public", True),
+        patch("api.tasks.metrics_task.metrics_publisher", publisher),
         patch("httpx.AsyncClient") as mock_client,
         patch("asyncio.sleep") as mock_sleep,
         patch("logging.getLogger"),
@@ -93,7 +98,7 @@ async def test_organization_sent_to_metrics_endpoint():
         mock_response.raise_for_status.return_value = None
         mock_client_instance = MagicMock()
         mock_client_instance.post = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client.return_value = mock_client_instance
 
         try:
             await record_system_metrics()
@@ -103,7 +108,8 @@ async def test_organization_sent_to_metrics_endpoint():
         # Verify POST request was made with organization in payload
         assert mock_client_instance.post.called
         post_call = mock_client_instance.post.call_args
-        posted_payload = post_call[1]["json"]
+        assert post_call[1]["headers"]["Content-Encoding"] == "gzip"
+        posted_payload = json.loads(gzip.decompress(post_call[1]["content"]))
 
         assert "organization" in posted_payload
         assert posted_payload["organization"] == test_organization
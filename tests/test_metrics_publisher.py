@@ -0,0 +1,163 @@
+# tests/test_metrics_publisher.py
+
+import gzip
+import json
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from api.services.status_services.metrics_publisher import (
+    CLAIM_SUFFIX,
+    MetricsPublisher,
+)
+
+
+def make_publisher(tmp_path, **kwargs):
+    publisher = MetricsPublisher("http://federation.test", str(tmp_path), **kwargs)
+    publisher._client = MagicMock()
+    publisher._client.post = AsyncMock()
+    return publisher
+
+
+def response(status):
+    request = httpx.Request("POST", "http://federation.test")
+    return httpx.Response(status, request=request)
+
+
+def test_spool_is_bounded_and_compressed(tmp_path):
+    publisher = MetricsPublisher("http://federation.test", str(tmp_path), max_spooled=2)
+    for index in range(3):
+        publisher.spool({"index": index})
+
+    pending = publisher.pending()
+    assert len(pending) == 2
+    with open(tmp_path / pending[0], "rb") as f:
+        assert json.loads(gzip.decompress(f.read())) == {"index": 1}
+
+
+@pytest.mark.asyncio
+async def test_flush_sends_oldest_first_over_one_client(tmp_path):
+    publisher = make_publisher(tmp_path)
+    publisher._client.post.return_value = response(200)
+    publisher.spool({"index": 0})
+    publisher.spool({"index": 1})
+
+    assert await publisher.flush() == 2
+
+    bodies = [
+        json.loads(gzip.decompress(call.kwargs["content"]))
+        for call in publisher._client.post.call_args_list
+    ]
+    assert bodies == [{"index": 0}, {"index": 1}]
+    assert publisher.pending() == []
+    assert publisher.seconds_until_retry() is None
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_exponentially(tmp_path):
+    publisher = make_publisher(tmp_path, retry_initial=10, retry_max=25)
+    publisher._client.post.side_effect = httpx.ConnectError("down")
+    publisher.spool({"index": 0})
+
+    with patch("time.monotonic", return_value=1000.0):
+        assert await publisher.flush() == 0
+        assert publisher.next_attempt_at == 1010.0
+        # Still backing off: nothing is attempted
+        assert await publisher.flush() == 0
+        assert publisher._client.post.await_count == 1
+
+    with patch("time.monotonic", return_value=1010.0):
+        await publisher.flush()
+        assert publisher.next_attempt_at == 1030.0
+    with patch("time.monotonic", return_value=1030.0):
+        await publisher.flush()
+        assert publisher.next_attempt_at == 1055.0
+
+    assert len(publisher.pending()) == 1
+
+    publisher._client.post.side_effect = None
+    publisher._client.post.return_value = response(200)
+    with patch("time.monotonic", return_value=1055.0):
+        assert await publisher.flush() == 1
+    assert publisher.next_attempt_at == 0.0
+
+
+@pytest.mark.asyncio
+async def test_rejected_report_is_dropped(tmp_path):
+    publisher = make_publisher(tmp_path)
+    publisher._client.post.side_effect = [response(422), response(200)]
+    publisher.spool({"index": 0})
+    publisher.spool({"index": 1})
+
+    assert await publisher.flush() == 1
+    assert publisher.pending() == []
+
+
+def test_spooled_reports_are_private(tmp_path):
+    spool_dir = tmp_path / "spool"
+    publisher = MetricsPublisher("http://federation.test", str(spool_dir))
+    publisher.spool({"services": {"local_ckan": {"api_key": "secret"}}})
+
+    (name,) = publisher.pending()
+    assert os.stat(spool_dir).st_mode & 0o777 == 0o700
+    assert os.stat(spool_dir / name).st_mode & 0o777 == 0o600
+
+
+def test_existing_spool_directory_is_made_private(tmp_path):
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir(mode=0o755)
+    os.chmod(spool_dir, 0o755)
+    publisher = MetricsPublisher("http://federation.test", str(spool_dir))
+    publisher.spool({"index": 0})
+
+    assert os.stat(spool_dir).st_mode & 0o777 == 0o700
+
+
+@pytest.mark.asyncio
+async def test_workers_sharing_a_spool_post_each_report_once(tmp_path):
+    first = make_publisher(tmp_path)
+    second = make_publisher(tmp_path)
+    first.spool({"index": 0})
+    first.spool({"index": 1})
+
+    async def post_and_flush_the_other(*args, **kwargs):
+        # While the first worker posts a report, the second one flushes
+        second._client.post.return_value = response(200)
+        await second.flush()
+        return response(200)
+
+    first._client.post.side_effect = post_and_flush_the_other
+    await first.flush()
+
+    posted = [
+        json.loads(gzip.decompress(call.kwargs["content"]))["index"]
+        for publisher in (first, second)
+        for call in publisher._client.post.call_args_list
+    ]
+    assert sorted(posted) == [0, 1]
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_and_abandoned_claims_return_to_the_spool(tmp_path):
+    publisher = make_publisher(tmp_path, timeout=1)
+    publisher._client.post.side_effect = httpx.ConnectError("down")
+    publisher.spool({"index": 0})
+
+    assert await publisher.flush() == 0
+    (name,) = publisher.pending()
+
+    # A worker died after claiming the report
+    os.rename(tmp_path / name, tmp_path / f"{name}.dead{CLAIM_SUFFIX}")
+    publisher.next_attempt_at = 0.0
+    publisher._client.post.side_effect = None
+    publisher._client.post.return_value = response(200)
+    assert await publisher.flush() == 0
+
+    stale = time.time() - 10
+    os.utime(tmp_path / f"{name}.dead{CLAIM_SUFFIX}", (stale, stale))
+    assert await publisher.flush() == 1
+    assert os.listdir(tmp_path) == []
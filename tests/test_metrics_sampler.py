@@ -0,0 +1,78 @@
+# tests/test_metrics_sampler.py
+
+from collections import namedtuple
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.status_services.metrics_sampler import MetricsSampler, metrics_sampler
+from api.services.status_services.system_metrics import get_system_metrics
+
+client = TestClient(app)
+
+NetIO = namedtuple("NetIO", "bytes_sent bytes_recv")
+
+
+@pytest.fixture(autouse=True)
+def clear_sampler():
+    metrics_sampler.clear()
+    yield
+    metrics_sampler.clear()
+
+
+def test_ring_buffer_keeps_the_most_recent_samples():
+    sampler = MetricsSampler(history_size=3)
+    for _ in range(5):
+        sampler.sample()
+
+    history = sampler.history()
+    assert len(history) == 3
+    assert sampler.latest() is history[-1]
+    assert sampler.history(limit=2) == history[-2:]
+
+
+def test_network_rates_are_computed_between_samples():
+    sampler = MetricsSampler(history_size=10)
+    counters = iter([NetIO(1000, 5000), NetIO(3000, 9000)])
+    clock = iter([100.0, 102.0])
+
+    with (
+        patch("psutil.net_io_counters", side_effect=lambda: next(counters)),
+        patch("time.monotonic", side_effect=lambda: next(clock)),
+    ):
+        first = sampler.sample()
+        second = sampler.sample()
+
+    assert first["network"]["sent_bytes_per_second"] is None
+    assert second["network"]["sent_bytes_per_second"] == 1000
+    assert second["network"]["recv_bytes_per_second"] == 2000
+
+
+def test_get_system_metrics_reads_the_latest_sample_without_blocking():
+    metrics_sampler.sample()
+    latest = metrics_sampler.latest()
+
+    with patch("psutil.cpu_percent") as cpu_percent:
+        cpu, memory, disk = get_system_metrics()
+
+    cpu_percent.assert_not_called()
+    assert (cpu, memory, disk) == (
+        latest["cpu_percent"],
+        latest["memory_percent"],
+        latest["disk_percent"],
+    )
+
+
+def test_history_endpoint_returns_the_series():
+    for _ in range(3):
+        metrics_sampler.sample()
+
+    response = client.get("/status/metrics/history", params={"limit": 2})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["samples"]) == 2
+    assert body["samples"][-1]["timestamp"] == metrics_sampler.latest()["timestamp"]
+    assert "process" in body["samples"][0]
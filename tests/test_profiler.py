@@ -0,0 +1,107 @@
+# tests/test_profiler.py
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.config.keycloak_settings import keycloak_settings
+from api.config.profiler_settings import profiler_settings
+from api.main import app
+from api.services.telemetry_services import ProfilerBusy, StackProfiler
+
+client = TestClient(app)
+
+HEADERS = {"Authorization": f"Bearer {keycloak_settings.test_username}"}
+
+
+def busy_worker(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_samples_every_thread():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_worker, args=(stop,), name="busy")
+    worker.start()
+    try:
+        profile = StackProfiler(interval=0.005).profile(0.1)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert profile["samples"] > 1
+    busy = [line for line in profile["collapsed"] if line.startswith("busy;")]
+    assert busy
+    assert "busy_worker (tests/test_profiler.py:" in busy[0]
+    assert int(busy[0].rsplit(" ", 1)[1]) >= 1
+
+
+def test_memory_diff_reports_allocation_sites():
+    profiler = StackProfiler(interval=0.01, memory_top=5)
+    kept = []
+
+    def allocate():
+        time.sleep(0.02)
+        kept.append(bytearray(2_000_000))
+
+    thread = threading.Thread(target=allocate)
+    thread.start()
+    profile = profiler.profile(0.1, memory=True)
+    thread.join()
+
+    assert len(profile["memory"]) <= 5
+    assert any(
+        "test_profiler.py" in entry["location"] and entry["size_diff_bytes"] > 0
+        for entry in profile["memory"]
+    )
+
+
+def test_only_one_profile_runs_at_a_time():
+    profiler = StackProfiler(interval=0.01)
+    thread = threading.Thread(target=profiler.profile, args=(0.2,))
+    thread.start()
+    time.sleep(0.05)
+    with pytest.raises(ProfilerBusy):
+        profiler.profile(0.01)
+    thread.join()
+
+
+def test_endpoint_is_disabled_by_default():
+    response = client.post("/status/profile", headers=HEADERS)
+
+    assert response.status_code == 404
+
+
+def test_endpoint_is_limited_to_admins():
+    with (
+        patch.object(profiler_settings, "profiler_enabled", True),
+        patch.object(profiler_settings, "profiler_admin_users", ["someone-else"]),
+    ):
+        response = client.post("/status/profile", headers=HEADERS)
+
+    assert response.status_code == 403
+
+
+def test_admin_gets_a_collapsed_profile():
+    with (
+        patch.object(profiler_settings, "profiler_enabled", True),
+        patch.object(
+            profiler_settings, "profiler_admin_users", [keycloak_settings.test_username]
+        ),
+    ):
+        too_long = client.post(
+            "/status/profile", params={"seconds": 3600}, headers=HEADERS
+        )
+        response = client.post(
+            "/status/profile",
+            params={"seconds": 0.05, "format": "collapsed"},
+            headers=HEADERS,
+        )
+
+    assert too_long.status_code == 400
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text.strip()
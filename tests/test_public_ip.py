@@ -0,0 +1,57 @@
+# tests/test_public_ip.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from api.services.status_services import system_metrics
+from api.services.status_services.system_metrics import (
+    get_public_ip,
+    refresh_public_ip,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_public_ip():
+    system_metrics._public_ip.update(ip=None, resolved_at=None, error=None)
+    yield
+    system_metrics._public_ip.update(ip=None, resolved_at=None, error=None)
+
+
+def ip_response(ip):
+    response = MagicMock()
+    response.json.return_value = {"ip": ip}
+    return response
+
+
+def test_get_public_ip_never_calls_out():
+    with patch("requests.get") as mock_get:
+        assert get_public_ip() == "Unknown"
+    mock_get.assert_not_called()
+
+
+def test_refresh_caches_the_ip_and_uses_a_timeout():
+    with patch("requests.get", return_value=ip_response("203.0.113.1")) as mock_get:
+        assert refresh_public_ip() == "203.0.113.1"
+
+    assert mock_get.call_args.kwargs["timeout"] > 0
+    with patch("requests.get") as mock_get:
+        assert get_public_ip() == "203.0.113.1"
+    mock_get.assert_not_called()
+
+
+def test_failed_refresh_keeps_the_cached_ip():
+    with patch("requests.get", return_value=ip_response("203.0.113.1")):
+        refresh_public_ip()
+    with patch("requests.get", side_effect=requests.Timeout("timed out")):
+        assert refresh_public_ip() == "203.0.113.1"
+
+    assert get_public_ip() == "203.0.113.1"
+
+
+def test_failed_first_lookup_reports_the_error():
+    with patch("requests.get", side_effect=requests.ConnectionError("offline")):
+        assert refresh_public_ip() is None
+
+    assert get_public_ip() == "Error retrieving IP: offline"
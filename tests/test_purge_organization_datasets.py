@@ -0,0 +1,122 @@
+# tests/test_purge_organization_datasets.py
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api.services.job_services.job_manager import Job
+from api.services.job_services.progress_stream import stream_progress
+from api.services.organization_services.delete_organization import (
+    delete_organization,
+)
+from api.services.organization_services.purge_organization_datasets import (
+    purge_organization_datasets,
+)
+
+
+class FakeCatalog:
+    """Minimal stand-in for the CKAN package_search/purge actions."""
+
+    def __init__(self, count, fail_ids=()):
+        self.ids = [f"ds-{i:04d}" for i in range(count)]
+        self.fail_ids = set(fail_ids)
+
+    def package_search(self, rows, start=0, **kwargs):
+        return {
+            "count": len(self.ids),
+            "results": [{"id": i} for i in self.ids[start : start + rows]],
+        }
+
+    def dataset_purge(self, id):
+        if id in self.fail_ids:
+            raise Exception("purge failed")
+        self.ids.remove(id)
+
+
+def make_ckan(catalog):
+    ckan = MagicMock()
+    ckan.action.package_search.side_effect = catalog.package_search
+    ckan.action.dataset_purge.side_effect = catalog.dataset_purge
+    ckan.action.organization_show.return_value = {"id": "org-1"}
+    return ckan
+
+
+@patch("api.services.organization_services.purge_organization_datasets.job_settings")
+def test_purges_more_than_one_page(mock_job_settings):
+    """Test datasets beyond the first page are purged too."""
+    mock_job_settings.job_page_size = 100
+    mock_job_settings.job_item_workers = 4
+    catalog = FakeCatalog(2500)
+    # A Job is a thread-safe progress tracker, unlike a MagicMock
+    progress = Job("organization_deletion", {})
+
+    removed = purge_organization_datasets(
+        make_ckan(catalog), "org-1", progress=progress
+    )
+
+    assert removed == 2500
+    assert catalog.ids == []
+    assert progress.total == 2500
+    assert progress.succeeded == 2500
+
+
+@patch("api.services.organization_services.purge_organization_datasets.job_settings")
+def test_org_is_kept_when_not_empty(mock_job_settings):
+    """Test the organization is not deleted while datasets remain."""
+    mock_job_settings.job_page_size = 100
+    mock_job_settings.job_item_workers = 4
+    catalog = FakeCatalog(10, fail_ids={"ds-0003"})
+    ckan = make_ckan(catalog)
+
+    with pytest.raises(Exception, match="still has 1 datasets"):
+        delete_organization("org", ckan_instance=ckan)
+
+    ckan.action.organization_delete.assert_not_called()
+    ckan.action.organization_purge.assert_not_called()
+
+
+@patch("api.services.organization_services.purge_organization_datasets.job_settings")
+def test_org_deleted_once_empty(mock_job_settings):
+    """Test the organization is deleted and purged once empty."""
+    mock_job_settings.job_page_size = 100
+    mock_job_settings.job_item_workers = 4
+    catalog = FakeCatalog(150)
+    ckan = make_ckan(catalog)
+
+    delete_organization("org", ckan_instance=ckan)
+
+    assert catalog.ids == []
+    ckan.action.organization_delete.assert_called_once_with(id="org-1")
+    ckan.action.organization_purge.assert_called_once_with(id="org-1")
+
+
+def test_stream_progress_yields_events():
+    """Test progress is streamed as JSON lines ending with 'done'."""
+
+    def work(progress):
+        progress.set_total(2)
+        progress.advance()
+        progress.advance(ok=False, error="bad")
+        return "ok"
+
+    events = [json.loads(line) for line in stream_progress(work)]
+
+    assert events[0] == {
+        "event": "progress",
+        "total": 2,
+        "succeeded": 0,
+        "failed": 0,
+        "processed": 0,
+    }
+    assert events[-2]["processed"] == 2
+    assert events[-1] == {"event": "done", "result": "ok"}
+
+
+def test_stream_progress_reports_errors():
+    """Test a failing operation ends the stream with an 'error' event."""
+
+    def work(progress):
+        raise Exception("boom")
+
+    events = [json.loads(line) for line in stream_progress(work)]
+    assert events[-1] == {"event": "error", "detail": "boom"}
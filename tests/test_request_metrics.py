@@ -0,0 +1,73 @@
+# tests/test_request_metrics.py
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.telemetry_services import MetricsRegistry, metrics_registry
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    metrics_registry.clear()
+    yield
+    metrics_registry.clear()
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.describe("latency_seconds", "histogram", "Latency.")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        registry.observe("latency_seconds", (("route", "/x"),), value)
+
+    text = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/x",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{route="/x"} 4' in text
+    assert 'latency_seconds_sum{route="/x"} 3.65' in text
+
+
+def test_counters_from_every_thread_are_summed():
+    registry = MetricsRegistry()
+    registry.describe("calls_total", "counter", "Calls.")
+
+    def work():
+        for _ in range(1000):
+            registry.inc("calls_total", (("kind", "a"),))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 'calls_total{kind="a"} 4000' in registry.render()
+
+
+def test_requests_are_recorded_per_route_template():
+    client.get("/dataset/exists", params={"name": "x", "server": "pre_ckan"})
+    client.get("/does-not-exist")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert (
+        'pop_http_requests_total{method="GET",route="/dataset/exists",status="400"} 1'
+        in text
+    )
+    assert (
+        'pop_http_requests_total{method="GET",route="unmatched",status="404"} 1' in text
+    )
+    assert (
+        'pop_http_request_duration_seconds_count{method="GET",'
+        'route="/dataset/exists"} 1' in text
+    )
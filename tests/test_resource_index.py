@@ -0,0 +1,200 @@
+# tests/test_resource_index.py
+
+from unittest.mock import MagicMock
+
+import pytest
+from ckanapi import CKANAPIError, NotAuthorized, NotFound
+from fastapi.testclient import TestClient
+
+from api.config.ckan_settings import ckan_settings
+from api.main import app
+from api.services.dataset_services.dataset_cache import dataset_cache
+from api.services.dataset_services.resource_index import (
+    MAX_RESOLVE_ATTEMPTS,
+    DatasetResourceIndex,
+    resource_index,
+    s3_prefixes,
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_indexes():
+    resource_index.clear()
+    dataset_cache.clear()
+    yield
+    resource_index.clear()
+    dataset_cache.clear()
+
+
+def make_dataset(dataset_id, urls=(), s3=(), kafka=None, private=False):
+    resources = [
+        {"id": f"{dataset_id}-r{n}", "name": "r", "url": url, "format": "CSV"}
+        for n, url in enumerate(urls)
+    ] + [
+        {"id": f"{dataset_id}-s{n}", "name": "s", "url": url, "format": "s3"}
+        for n, url in enumerate(s3)
+    ]
+    extras = []
+    if kafka:
+        extras = [
+            {"key": k, "value": v} for k, v in zip(("host", "port", "topic"), kafka)
+        ]
+    return {
+        "id": dataset_id,
+        "name": f"name-{dataset_id}",
+        "title": f"Title {dataset_id}",
+        "private": private,
+        "resources": resources,
+        "extras": extras,
+    }
+
+
+def make_ckan(datasets, address="http://ckan.test", page_size=2):
+    ckan = MagicMock()
+    ckan.address = address
+
+    def package_search(start, rows, **kwargs):
+        page = datasets[start : start + min(rows, page_size)]
+        return {"count": len(datasets), "results": page}
+
+    ckan.action.package_search.side_effect = package_search
+    return ckan
+
+
+def test_s3_prefixes_follow_path_segments():
+    assert s3_prefixes("s3://bucket/a/b.nc") == [
+        "s3://bucket",
+        "s3://bucket/a",
+        "s3://bucket/a/b.nc",
+    ]
+    assert s3_prefixes("bucket/a/") == ["bucket", "bucket/a"]
+
+
+def test_refresh_indexes_urls_topics_and_s3_prefixes():
+    ckan = make_ckan(
+        [
+            make_dataset("a", urls=["http://x/data.csv"]),
+            make_dataset("b", kafka=("kafka.test", "9092", "sensors")),
+            make_dataset("c", s3=["s3://bucket/climate/2024/t.nc"]),
+            make_dataset("d", s3=["s3://bucket/climate-old/t.nc"]),
+            make_dataset("e", urls=["http://x/data.csv"], private=True),
+        ]
+    )
+    index = DatasetResourceIndex()
+
+    assert index.by_url(ckan, "http://x/data.csv") is None
+    assert index.refresh(ckan) == 4
+
+    assert [d["id"] for d in index.by_url(ckan, "http://x/data.csv")] == ["a"]
+    assert [d["id"] for d in index.by_kafka(ckan, "kafka.test", 9092, "sensors")] == [
+        "b"
+    ]
+    assert index.by_kafka(ckan, "kafka.test", 9093, "sensors") == []
+    assert [d["id"] for d in index.by_s3_prefix(ckan, "s3://bucket/climate/")] == ["c"]
+    assert [d["id"] for d in index.by_s3_prefix(ckan, "s3://bucket")] == ["c", "d"]
+    assert index.by_s3_prefix(ckan, "s3://bucket/clim") == []
+
+
+def test_writes_through_the_cache_update_the_index():
+    ckan = make_ckan([make_dataset("a", urls=["http://x/old.csv"])])
+    resource_index.refresh(ckan)
+
+    dataset_cache.remember(ckan, make_dataset("a", urls=["http://x/new.csv"]))
+
+    assert resource_index.by_url(ckan, "http://x/old.csv") == []
+    assert [d["id"] for d in resource_index.by_url(ckan, "http://x/new.csv")] == ["a"]
+
+
+def test_forgotten_datasets_are_dropped_then_re_read():
+    ckan = make_ckan(
+        [make_dataset("a", urls=["http://x/old.csv"]), make_dataset("b", urls=["u"])]
+    )
+    resource_index.refresh(ckan)
+
+    def package_show(id):
+        if id == "name-a":
+            return make_dataset("a", urls=["http://x/new.csv"])
+        raise NotFound("Dataset not found")
+
+    ckan.action.package_show.side_effect = package_show
+
+    dataset_cache.forget(ckan, "name-a")
+    dataset_cache.forget(ckan, "b")
+
+    assert resource_index.by_url(ckan, "http://x/old.csv") == []
+    assert resource_index.has_stale(ckan)
+    assert resource_index.resolve(ckan) == 2
+    assert [d["id"] for d in resource_index.by_url(ckan, "http://x/new.csv")] == ["a"]
+    assert resource_index.by_url(ckan, "u") == []
+    assert not resource_index.has_stale(ckan)
+
+
+def test_unreadable_datasets_are_not_retried_forever():
+    ckan = make_ckan([make_dataset("private"), make_dataset("flaky")])
+    resource_index.refresh(ckan)
+
+    def package_show(id):
+        if id == "private":
+            raise NotAuthorized("Access denied")
+        raise CKANAPIError("Bad Gateway")
+
+    ckan.action.package_show.side_effect = package_show
+    dataset_cache.forget(ckan, "private")
+    dataset_cache.forget(ckan, "flaky")
+
+    assert resource_index.resolve(ckan) == 2
+    for _ in range(MAX_RESOLVE_ATTEMPTS - 1):
+        assert resource_index.resolve(ckan) == 1
+    assert not resource_index.has_stale(ckan)
+    assert ckan.action.package_show.call_count == MAX_RESOLVE_ATTEMPTS + 1
+
+
+def test_writes_during_a_refresh_are_replayed():
+    index = DatasetResourceIndex()
+    ckan = make_ckan([])
+
+    def package_search(start, rows, **kwargs):
+        # A dataset is registered while the scan is running
+        index.dataset_changed(ckan, make_dataset("new", urls=["http://x/n.csv"]))
+        return {"count": 0, "results": []}
+
+    ckan.action.package_search.side_effect = package_search
+    index.refresh(ckan)
+
+    assert [d["id"] for d in index.by_url(ckan, "http://x/n.csv")] == ["new"]
+
+
+def test_lookup_endpoints():
+    ckan = make_ckan(
+        [
+            make_dataset("a", urls=["http://x/data.csv"]),
+            make_dataset("b", kafka=("kafka.test", "9092", "sensors")),
+            make_dataset("c", s3=["s3://bucket/climate/t.nc"]),
+        ],
+        address=ckan_settings.ckan_global_url,
+    )
+
+    response = client.get("/lookup/url", params={"url": "http://x/data.csv"})
+    assert response.status_code == 503
+
+    resource_index.refresh(ckan)
+
+    response = client.get("/lookup/url", params={"url": "http://x/data.csv"})
+    assert response.status_code == 200
+    assert [d["id"] for d in response.json()] == ["a"]
+
+    response = client.get(
+        "/lookup/kafka",
+        params={"host": "kafka.test", "port": 9092, "topic": "sensors"},
+    )
+    assert [d["id"] for d in response.json()] == ["b"]
+
+    response = client.get("/lookup/s3", params={"prefix": "s3://bucket"})
+    assert [d["id"] for d in response.json()] == ["c"]
+
+    response = client.get(
+        "/lookup/url", params={"url": "http://x/data.csv", "server": "pre_ckan"}
+    )
+    assert response.status_code == 400
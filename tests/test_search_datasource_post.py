@@ -53,6 +53,7 @@ def test_search_datasource_valid_request():
             filter_list=None,
             timestamp=None,
             server="global",
+            extras_filters=None,
         )
 
 
@@ -79,4 +80,5 @@ def test_search_datasource_exception():
             filter_list=None,
             timestamp=None,
             server="global",
+            extras_filters=None,
         )
@@ -0,0 +1,118 @@
+# tests/test_server_timing.py
+
+import json
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from fastapi.testclient import TestClient
+
+from api.config.ckan_settings import ckan_settings
+from api.main import app
+from api.services.telemetry_services.server_timing import format_server_timing
+from api.services.telemetry_services.upstream_calls import InstrumentedRemoteCKAN
+
+client = TestClient(app)
+
+
+def make_dataset(dataset_id, resource_format, notes):
+    return {
+        "id": dataset_id,
+        "name": f"name-{dataset_id}",
+        "title": f"Title {dataset_id}",
+        "notes": notes,
+        "resources": [
+            {
+                "id": f"{dataset_id}-r",
+                "name": "r",
+                "url": "http://example.com",
+                "format": resource_format,
+            }
+        ],
+    }
+
+
+def ckan_returning(*pages):
+    ckan = InstrumentedRemoteCKAN("http://ckan.test", server="global")
+    ckan.session = MagicMock()
+    ckan.session.post.side_effect = [
+        MagicMock(
+            status_code=200,
+            text=json.dumps({"success": True, "result": {"count": 3, "results": page}}),
+        )
+        for page in pages
+    ]
+    return ckan
+
+
+def parse_server_timing(header):
+    phases = {}
+    for entry in header.split(", "):
+        name, duration = entry.split(";dur=")
+        phases[name] = float(duration)
+    return phases
+
+
+def test_format_server_timing():
+    assert (
+        format_server_timing({"auth": 0.0012, "upstream": 0.25}, 0.3)
+        == "auth;dur=1.2, upstream;dur=250.0, total;dur=300.0"
+    )
+
+
+def test_every_response_has_a_total():
+    response = client.get("/status/upstreams")
+
+    assert "total" in parse_server_timing(response.headers["server-timing"])
+
+
+def test_search_reports_phases_and_explain():
+    catalog = [
+        make_dataset("a", "CSV", "temperature sensor"),
+        make_dataset("b", "JSON", "temperature sensor"),
+        make_dataset("c", "CSV", "humidity sensor"),
+    ]
+    ckan = ckan_returning(catalog, [])
+
+    with patch.object(
+        type(ckan_settings), "ckan_global", new_callable=PropertyMock
+    ) as ckan_global:
+        ckan_global.return_value = ckan
+        response = client.post(
+            "/search",
+            params={"explain": "true"},
+            json={
+                "search_term": "temperature",
+                "resource_format": "csv",
+                "server": "global",
+            },
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [dataset["id"] for dataset in body["results"]] == ["a"]
+    assert body["results"][0]["notes"] == "temperature sensor"
+
+    explain = body["explain"]
+    assert explain["source"] == "ckan"
+    assert explain["q"] == "temperature"
+    assert explain["fq"] == []
+    assert explain["pages_fetched"] == 2
+    assert explain["bytes_fetched"] > 0
+    assert explain["datasets_fetched"] == 3
+    assert explain["dropped_by_resource_filters"] == 1
+    assert explain["dropped_by_keywords"] == 1
+    assert explain["returned"] == 1
+
+    phases = parse_server_timing(response.headers["server-timing"])
+    assert {"upstream", "filter", "serialize", "total"} <= set(phases)
+
+
+def test_search_without_explain_returns_a_list():
+    ckan = ckan_returning([make_dataset("a", "CSV", "x")], [])
+
+    with patch.object(
+        type(ckan_settings), "ckan_global", new_callable=PropertyMock
+    ) as ckan_global:
+        ckan_global.return_value = ckan
+        response = client.post("/search", json={"server": "global"})
+
+    assert [dataset["id"] for dataset in response.json()] == ["a"]
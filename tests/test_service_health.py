@@ -0,0 +1,209 @@
+# tests/test_service_health.py
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.datasource_services.search_datasource import (
+    build_datasource_response,
+)
+from api.services.service_services import discover_services, service_health
+from api.services.service_services.health_poller import ServiceHealthPoller
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_health():
+    service_health.clear()
+    yield
+    service_health.clear()
+
+
+def make_service(service_id, health_check_url=None):
+    extras = []
+    if health_check_url:
+        extras.append({"key": "health_check_url", "value": health_check_url})
+    return {
+        "id": service_id,
+        "name": f"name-{service_id}",
+        "title": f"Service {service_id}",
+        "organization": {"name": "services"},
+        "resources": [
+            {
+                "id": f"{service_id}-r",
+                "name": "endpoint",
+                "url": f"http://{service_id}.test",
+                "format": "service",
+            }
+        ],
+        "extras": extras,
+    }
+
+
+def cached(service_id, status, latency_ms, server="global"):
+    return {
+        "id": service_id,
+        "name": f"name-{service_id}",
+        "title": f"Service {service_id}",
+        "server": server,
+        "service_url": None,
+        "health_check_url": None,
+        "status": status,
+        "http_status": 200 if status == "up" else None,
+        "latency_ms": latency_ms,
+        "checked_at": time.time(),
+        "error": None,
+    }
+
+
+def test_discover_services_pages_the_services_organization():
+    ckan = MagicMock()
+    ckan.action.package_search.side_effect = [
+        {"count": 2, "results": [make_service("a", "http://a.test/health")]},
+        {"count": 2, "results": [make_service("b")]},
+    ]
+
+    services = discover_services(ckan, "local")
+
+    assert ckan.action.package_search.call_args_list[0].kwargs["fq"] == (
+        "organization:services"
+    )
+    assert services[0]["health_check_url"] == "http://a.test/health"
+    assert services[0]["service_url"] == "http://a.test"
+    assert services[0]["server"] == "local"
+    assert services[1]["health_check_url"] is None
+
+
+@pytest.mark.asyncio
+async def test_poll_probes_concurrently_with_a_bound():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if request.headers["host"] == "down.test":
+            return httpx.Response(503)
+        if request.headers["host"] == "dead.test":
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(200)
+
+    poller = ServiceHealthPoller(timeout=1, concurrency=2)
+    poller._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    poller._resolve = AsyncMock(return_value=["93.184.216.34"])
+    services = [
+        {"id": "up1", "health_check_url": "http://up.test/1"},
+        {"id": "up2", "health_check_url": "http://up.test/2"},
+        {"id": "down", "health_check_url": "http://down.test/"},
+        {"id": "dead", "health_check_url": "http://dead.test/"},
+        {"id": "none", "health_check_url": None},
+    ]
+
+    results = await poller.poll(services)
+    await poller.aclose()
+
+    assert peak == 2
+    assert results["up1"]["status"] == "up"
+    assert results["down"]["status"] == "down"
+    assert results["down"]["http_status"] == 503
+    assert results["dead"]["error"] == "connection refused"
+    assert results["none"]["status"] == "unknown"
+    assert results["none"]["latency_ms"] is None
+
+
+@pytest.mark.asyncio
+async def test_poll_refuses_non_public_targets():
+    handler = MagicMock(return_value=httpx.Response(200))
+    poller = ServiceHealthPoller(timeout=1, concurrency=2, private_servers=["local"])
+    poller._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    addresses = {
+        "metadata.test": ["169.254.169.254"],
+        "internal.test": ["10.0.0.5"],
+        "mapped.test": ["::ffff:127.0.0.1"],
+        "public.test": ["93.184.216.34"],
+    }
+    # Literal addresses resolve to themselves
+    poller._resolve = AsyncMock(
+        side_effect=lambda host, port: addresses.get(host, [host])
+    )
+    services = [
+        {"id": "file", "server": "global", "health_check_url": "file:///etc/passwd"},
+        {"id": "meta", "server": "global", "health_check_url": "http://metadata.test"},
+        {"id": "lan", "server": "global", "health_check_url": "http://internal.test"},
+        {"id": "mapped", "server": "global", "health_check_url": "http://mapped.test"},
+        {"id": "loop", "server": "global", "health_check_url": "http://127.0.0.1/"},
+        {"id": "public", "server": "global", "health_check_url": "http://public.test"},
+        {"id": "own", "server": "local", "health_check_url": "http://internal.test"},
+    ]
+
+    results = await poller.poll(services)
+    await poller.aclose()
+
+    for refused in ("file", "meta", "lan", "mapped", "loop"):
+        assert results[refused]["status"] == "refused"
+        assert results[refused]["http_status"] is None
+    assert results["public"]["status"] == "up"
+    assert results["own"]["status"] == "up"
+    probed = {
+        (call.args[0].url.host, call.args[0].headers["host"])
+        for call in handler.call_args_list
+    }
+    # Public services are reached at the address that was checked
+    assert probed == {
+        ("93.184.216.34", "public.test"),
+        ("internal.test", "internal.test"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_https_probe_keeps_the_host_name_for_tls():
+    poller = ServiceHealthPoller(timeout=1, concurrency=1)
+    poller._resolve = AsyncMock(return_value=["93.184.216.34"])
+
+    request, refusal = await poller._request(
+        {"server": "global", "health_check_url": "https://svc.test:8443/health"}
+    )
+    await poller.aclose()
+
+    assert refusal is None
+    assert str(request.url) == "https://93.184.216.34:8443/health"
+    assert request.headers["host"] == "svc.test:8443"
+    assert request.extensions["sni_hostname"] == "svc.test"
+
+
+def test_search_results_carry_the_cached_health():
+    service_health._results = {"a": cached("a", "up", 12.5)}
+
+    service = build_datasource_response(make_service("a"))
+    other = build_datasource_response(
+        {**make_service("a"), "organization": {"name": "other"}}
+    )
+
+    assert service.health.status == "up"
+    assert service.health.latency_ms == 12.5
+    assert other.health is None
+    assert "health" not in other.model_dump(by_alias=True)
+
+
+def test_healthy_view_lists_live_services_by_latency():
+    service_health._results = {
+        "slow": cached("slow", "up", 300.0),
+        "down": cached("down", "down", 5.0),
+        "fast": cached("fast", "up", 20.0, server="local"),
+    }
+
+    response = client.get("/services/healthy")
+    local = client.get("/services/healthy", params={"server": "local"})
+
+    assert response.status_code == 200
+    assert [s["id"] for s in response.json()] == ["fast", "slow"]
+    assert [s["id"] for s in local.json()] == ["fast"]
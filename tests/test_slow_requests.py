@@ -0,0 +1,167 @@
+# tests/test_slow_requests.py
+
+import json
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.config.ckan_settings import ckan_settings
+from api.config.keycloak_settings import keycloak_settings
+from api.config.profiler_settings import profiler_settings
+from api.main import app
+from api.services.telemetry_services import SlowRequestLog, slow_requests
+from api.services.telemetry_services.slow_requests import sanitize
+from api.services.telemetry_services.upstream_calls import InstrumentedRemoteCKAN
+
+client = TestClient(app)
+
+HEADERS = {"Authorization": f"Bearer {keycloak_settings.test_username}"}
+
+
+@pytest.fixture
+def record_every_request():
+    threshold = slow_requests.threshold
+    slow_requests.threshold = 0
+    slow_requests.clear()
+    yield
+    slow_requests.threshold = threshold
+    slow_requests.clear()
+
+
+def test_sanitize_redacts_sensitive_keys_at_any_depth():
+    params = {
+        "search_term": "x" * 1500,
+        "password": "hunter2",
+        "extras": {"api_key": "abc", "region": "north"},
+        "items": [{"access_token": "t"}],
+    }
+
+    sanitized = sanitize(params)
+
+    assert sanitized["search_term"] == "x" * 1000 + "..."
+    assert sanitized["password"] == "***"
+    assert sanitized["extras"] == {"api_key": "***", "region": "north"}
+    assert sanitized["items"] == [{"access_token": "***"}]
+    assert params["password"] == "hunter2"
+
+
+def test_slow_request_log_filters_most_recent_first():
+    log = SlowRequestLog(threshold=1, size=2)
+    for index, route in enumerate(("/a", "/search", "/search")):
+        log.record(
+            {
+                "method": "POST",
+                "route": route,
+                "user_id": "1234",
+                "duration_ms": 1000 + index,
+            }
+        )
+
+    assert [r["duration_ms"] for r in log.recent()] == [1002, 1001]
+    assert [r["duration_ms"] for r in log.recent(min_duration_ms=1002)] == [1002]
+    assert log.recent(route="/a") == []
+    assert len(log.recent(limit=1)) == 1
+
+
+def test_slow_search_is_recorded_with_body_and_upstream_calls(record_every_request):
+    ckan = InstrumentedRemoteCKAN("http://ckan.test", server="global")
+    ckan.session = MagicMock()
+    ckan.session.post.side_effect = [
+        MagicMock(
+            status_code=200,
+            text=json.dumps({"success": True, "result": {"count": 0, "results": []}}),
+        )
+    ]
+
+    with patch.object(
+        type(ckan_settings), "ckan_global", new_callable=PropertyMock
+    ) as ckan_global:
+        ckan_global.return_value = ckan
+        response = client.post(
+            "/search?explain=false",
+            json={"search_term": "temperature", "server": "global"},
+        )
+
+    assert response.status_code == 200
+    [entry] = slow_requests.recent(route="/search")
+    assert entry["method"] == "POST"
+    assert entry["status"] == 200
+    assert entry["query"] == {"explain": "false"}
+    assert entry["body"] == {"search_term": "temperature", "server": "global"}
+    assert entry["body_truncated"] is False
+    assert entry["response_bytes"] == len(response.content)
+    assert entry["user_id"] is None
+    [call] = entry["upstream"]
+    assert (call["service"], call["server"], call["action"]) == (
+        "ckan",
+        "global",
+        "package_search",
+    )
+    assert call["calls"] == 1
+    assert call["response_bytes"] > 0
+    assert "upstream" in entry["phases_ms"]
+
+
+def test_form_passwords_are_redacted(record_every_request):
+    with patch(
+        "api.routes.token_routes.post.get_user_token", return_value="access-token"
+    ):
+        client.post("/token", data={"username": "u", "password": "p"})
+
+    [entry] = slow_requests.recent(route="/token")
+    assert entry["body"] == {"username": "u", "password": "***"}
+
+
+def test_fast_requests_are_not_recorded():
+    slow_requests.clear()
+
+    client.get("/status/upstreams")
+
+    assert slow_requests.recent() == []
+
+
+def test_slow_requests_endpoint_requires_a_user_and_shows_it(record_every_request):
+    assert client.get("/status/slow-requests").status_code == 401
+
+    client.get("/status/slow-requests", headers=HEADERS)
+    response = client.get(
+        "/status/slow-requests",
+        params={"route": "/status/slow-requests", "user_id": "1234"},
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["threshold_seconds"] == 0
+    [entry] = body["requests"]
+    assert entry["user_id"] == "1234"
+    assert "authorization" not in json.dumps(entry).lower()
+
+
+def test_only_admins_see_other_users_slow_requests():
+    slow_requests.clear()
+    for user_id in ("1234", "5678"):
+        slow_requests.record(
+            {
+                "method": "POST",
+                "route": "/search",
+                "user_id": user_id,
+                "duration_ms": 1000,
+            }
+        )
+
+    def user_ids(params=None):
+        response = client.get("/status/slow-requests", params=params, headers=HEADERS)
+        assert response.status_code == 200
+        return [entry["user_id"] for entry in response.json()["requests"]]
+
+    assert user_ids() == ["1234"]
+    assert user_ids({"user_id": "5678"}) == ["1234"]
+
+    with patch.object(
+        profiler_settings, "profiler_admin_users", [keycloak_settings.test_username]
+    ):
+        assert user_ids() == ["5678", "1234"]
+        assert user_ids({"user_id": "5678"}) == ["5678"]
+    slow_requests.clear()
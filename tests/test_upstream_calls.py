@@ -0,0 +1,103 @@
+# tests/test_upstream_calls.py
+
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ckanapi import NotFound
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.telemetry_services import metrics_registry, slow_calls
+from api.services.telemetry_services.upstream_calls import (
+    InstrumentedRemoteCKAN,
+    SlowCallLog,
+    upstream_call,
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_telemetry():
+    metrics_registry.clear()
+    slow_calls.clear()
+    yield
+    metrics_registry.clear()
+    slow_calls.clear()
+
+
+def test_slow_call_log_keeps_the_slowest_calls():
+    log = SlowCallLog(size=2, window=60)
+    for duration in (5, 50, 1, 20):
+        log.add({"action": f"a{duration}", "duration_ms": duration})
+
+    assert [c["duration_ms"] for c in log.slowest()] == [50, 20]
+
+
+def test_slow_call_log_drops_expired_calls():
+    log = SlowCallLog(size=2, window=10)
+    with patch("time.monotonic", return_value=100.0):
+        log.add({"action": "old", "duration_ms": 500})
+    with patch("time.monotonic", return_value=200.0):
+        log.add({"action": "new", "duration_ms": 1})
+        assert [c["action"] for c in log.slowest()] == ["new"]
+
+
+def test_ckan_actions_are_recorded_with_server_size_and_outcome():
+    ckan = InstrumentedRemoteCKAN("http://ckan.test", server="global")
+    ckan.session = MagicMock()
+    ckan.session.post.return_value = MagicMock(
+        status_code=200, text='{"success": true, "result": {"count": 0}}'
+    )
+
+    ckan.action.package_search(q="*:*")
+
+    ckan.session.post.return_value = MagicMock(
+        status_code=404,
+        text='{"success": false, "error": {"__type": "Not Found Error"}}',
+    )
+    with pytest.raises(NotFound):
+        ckan.action.package_show(id="missing")
+
+    calls = {c["action"]: c for c in slow_calls.slowest()}
+    assert calls["package_search"]["server"] == "global"
+    assert calls["package_search"]["outcome"] == "ok"
+    assert calls["package_search"]["size_bytes"] == 41
+    assert calls["package_show"]["outcome"] == "NotFound"
+
+    text = metrics_registry.render()
+    assert (
+        'pop_upstream_call_duration_seconds_count{service="ckan",server="global",'
+        'action="package_show",outcome="NotFound"} 1' in text
+    )
+    assert 'pop_upstream_response_bytes_bucket{service="ckan"' in text
+
+
+def test_upstreams_endpoint():
+    response = MagicMock(status_code=401, content=b"denied")
+    with upstream_call("keycloak", "keycloak", "user_token") as call:
+        call.response(response)
+
+    body = client.get("/status/upstreams").json()
+
+    assert body["slowest"][0]["outcome"] == "http_401"
+    assert body["slowest"][0]["size_bytes"] == 6
+    assert body["summary"][0]["action"] == "user_token"
+    assert body["summary"][0]["count"] == 1
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "api.config.ckan_settings",
+        "api.services.telemetry_services",
+        "api.services.telemetry_services.upstream_calls",
+    ],
+)
+def test_modules_import_on_their_own(module):
+    result = subprocess.run(
+        [sys.executable, "-c", f"import {module}"], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
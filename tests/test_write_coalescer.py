@@ -0,0 +1,187 @@
+# tests/test_write_coalescer.py
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.services.dataset_services.dataset_cache import dataset_cache
+from api.services.dataset_services.general_dataset import merge_dataset_changes
+from api.services.dataset_services.write_coalescer import (
+    WriteCoalescer,
+    coalesce_patch_general_dataset,
+    coalesce_update_general_dataset,
+    write_coalescer,
+)
+
+
+@pytest.fixture(autouse=True)
+def short_window():
+    window = write_coalescer.window
+    write_coalescer.window = 0.05
+    dataset_cache.clear()
+    yield
+    write_coalescer.window = window
+    dataset_cache.clear()
+
+
+def make_ckan():
+    ckan = MagicMock()
+    ckan.action.package_show.return_value = {
+        "id": "ds-1",
+        "name": "stream",
+        "title": "Stream",
+        "extras": [{"key": "a", "value": "1"}],
+        "resources": [{"id": "r1", "url": "http://a", "name": "A"}],
+    }
+    ckan.action.package_patch.return_value = {"id": "ds-1"}
+    ckan.action.package_update.return_value = {"id": "ds-1"}
+    return ckan
+
+
+def test_merge_dataset_changes():
+    changes = [
+        {"title": "one", "extras": {"a": "1"}, "resources": [{"url": "x"}]},
+        {"title": None, "extras": {"b": "2"}, "resources": [{"url": "y"}]},
+        {"notes": "n", "extras": {"a": "3"}},
+    ]
+
+    patched = merge_dataset_changes(changes, append_resources=True)
+    assert patched == {
+        "title": "one",
+        "notes": "n",
+        "extras": {"a": "3", "b": "2"},
+        "resources": [{"url": "x"}, {"url": "y"}],
+    }
+    replaced = merge_dataset_changes(changes, append_resources=False)
+    assert replaced["resources"] == [{"url": "y"}]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_patches_share_one_write():
+    ckan = make_ckan()
+
+    results = await asyncio.gather(
+        coalesce_patch_general_dataset("ds-1", ckan, extras={"b": "2"}),
+        coalesce_patch_general_dataset(
+            "ds-1", ckan, resources=[{"url": "http://b", "name": "B"}]
+        ),
+        coalesce_patch_general_dataset("ds-1", ckan, title="Renamed"),
+    )
+
+    assert results == ["ds-1", "ds-1", "ds-1"]
+    # The lookup of the dataset id for the key also serves the write
+    ckan.action.package_show.assert_called_once()
+    ckan.action.package_patch.assert_called_once_with(
+        id="ds-1",
+        title="Renamed",
+        extras=[{"key": "a", "value": "1"}, {"key": "b", "value": "2"}],
+    )
+    ckan.action.resource_create.assert_called_once_with(
+        package_id="ds-1", url="http://b", name="B"
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_keep_last_resources():
+    ckan = make_ckan()
+
+    await asyncio.gather(
+        coalesce_update_general_dataset(
+            "ds-1", ckan, resources=[{"url": "http://x", "name": "X"}]
+        ),
+        coalesce_update_general_dataset(
+            "ds-1", ckan, resources=[{"url": "http://y", "name": "Y"}]
+        ),
+    )
+
+    ckan.action.package_update.assert_called_once()
+    sent = ckan.action.package_update.call_args[1]
+    assert sent["resources"] == [{"url": "http://y", "name": "Y"}]
+
+
+@pytest.mark.asyncio
+async def test_batch_error_reaches_every_caller():
+    ckan = make_ckan()
+    ckan.action.package_patch.side_effect = Exception("CKAN down")
+
+    results = await asyncio.gather(
+        coalesce_patch_general_dataset("ds-1", ckan, title="a"),
+        coalesce_patch_general_dataset("ds-1", ckan, title="b"),
+        return_exceptions=True,
+    )
+
+    assert all("CKAN down" in str(result) for result in results)
+    ckan.action.package_patch.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_invalid_request_fails_alone():
+    ckan = make_ckan()
+
+    results = await asyncio.gather(
+        coalesce_patch_general_dataset("ds-1", ckan, extras={"name": "bad"}),
+        coalesce_patch_general_dataset("ds-1", ckan, title="ok"),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], KeyError)
+    assert results[1] == "ds-1"
+
+
+@pytest.mark.asyncio
+async def test_batches_for_the_same_key_run_in_order():
+    coalescer = WriteCoalescer(window=0.01, max_batch=2)
+    applied = []
+
+    def apply(_, batch):
+        applied.append([change["n"] for change in batch])
+        return len(applied)
+
+    results = await asyncio.gather(
+        *(coalescer.submit("key", None, {"n": n}, apply) for n in range(5))
+    )
+
+    assert applied == [[0, 1], [2, 3], [4]]
+    assert results == [1, 1, 2, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_patch_and_update_of_one_dataset_do_not_overlap():
+    ckan = make_ckan()
+    running = []
+    overlaps = []
+
+    def write(**kwargs):
+        running.append(True)
+        if len(running) > 1:
+            overlaps.append(kwargs)
+        time.sleep(0.05)
+        running.pop()
+        return {"id": "ds-1"}
+
+    ckan.action.package_patch.side_effect = write
+    ckan.action.package_update.side_effect = write
+
+    await asyncio.gather(
+        coalesce_patch_general_dataset("stream", ckan, title="By name"),
+        coalesce_update_general_dataset("ds-1", ckan, title="By id"),
+    )
+
+    assert ckan.action.package_patch.call_count == 1
+    assert ckan.action.package_update.call_count == 1
+    assert overlaps == []
+
+
+@pytest.mark.asyncio
+async def test_dataset_key_resolves_names_once():
+    ckan = make_ckan()
+    coalescer = WriteCoalescer(window=0.01, max_batch=2)
+
+    keys = await asyncio.gather(
+        coalescer.dataset_key(ckan, "stream"), coalescer.dataset_key(ckan, "stream")
+    )
+
+    assert keys[0] == keys[1] == (str(ckan.address), "ds-1")
+    ckan.action.package_show.assert_called_once_with(id="stream")